@@ -0,0 +1,92 @@
+"""Benchmark building streamed chat completion chunks.
+
+Measures the CPU time per chunk of validated ``ChatCompletionResponse``
+models against ``FastChunk`` objects, and the memory held by the chunks of
+one live stream that keeps everything it received.
+
+Usage:
+    python benchmarks/bench_chunks.py [--chunks 100000] [--stream-length 2000]
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Callable, List
+
+from mercury_client.models.chat import ChatCompletionResponse
+from mercury_client.models.stream import FastChunk
+from mercury_client.utils.sse import ServerSentEvent
+from mercury_client.utils.streaming import parse_chunk
+
+
+def build_events(chunks: int) -> List[ServerSentEvent]:
+    """Build the events of a stream of ``chunks`` content deltas."""
+    events = []
+    for i in range(chunks):
+        chunk = {
+            "id": "chatcmpl-123",
+            "object": "chat.completion.chunk",
+            "created": 1677649420,
+            "model": "mercury-coder-small",
+            "choices": [
+                {"index": 0, "delta": {"content": f"tok{i} "}, "finish_reason": None}
+            ],
+        }
+        events.append(ServerSentEvent(json.dumps(chunk).encode()))
+    return events
+
+
+def validated(event: ServerSentEvent) -> object:
+    return parse_chunk(event)
+
+
+def fast(event: ServerSentEvent) -> object:
+    return parse_chunk(event, fast=True)
+
+
+def cpu(
+    name: str, build: Callable[[ServerSentEvent], object], events: List[ServerSentEvent]
+) -> None:
+    started = time.perf_counter()
+    for event in events:
+        build(event)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<24} {elapsed / len(events) * 1e6:8.2f} us/chunk")
+
+
+def memory(
+    name: str, build: Callable[[ServerSentEvent], object], events: List[ServerSentEvent]
+) -> None:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    stream = [build(event) for event in events]
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(
+        f"{name:<24} {held / 1024:8.1f} KiB per {len(stream)}-chunk stream "
+        f"({held / len(stream):.0f} B/chunk)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--stream-length", type=int, default=2000)
+    args = parser.parse_args()
+
+    events = build_events(args.chunks)
+    print("CPU")
+    cpu("ChatCompletionResponse", validated, events)
+    cpu("FastChunk", fast, events)
+    print("Memory")
+    memory("ChatCompletionResponse", validated, events[: args.stream_length])
+    memory("FastChunk", fast, events[: args.stream_length])
+    assert isinstance(fast(events[0]), FastChunk)
+    assert isinstance(validated(events[0]), ChatCompletionResponse)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark building the requests of a long multi-turn conversation.
+
+Measures the total CPU time of building and encoding the request body of
+every turn of a conversation, comparing the path of ``chat_completion``
+(validating and dumping the whole history each turn) with ``Conversation``
+(validating and encoding each message once), and the memory held by forks
+of a long conversation.
+
+Usage:
+    python benchmarks/bench_conversation.py [--turns 200] [--forks 100]
+"""
+
+import argparse
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from mercury_client.models.chat import ChatCompletionRequest, Message
+from mercury_client.utils.codec import JSONCodec, default_codec
+from mercury_client.utils.conversation import Conversation
+
+
+def message(role: str, turn: int) -> dict:
+    return {"role": role, "content": f"Turn {turn} of the conversation. " * 10}
+
+
+def unprepared(turns: int, codec: JSONCodec) -> float:
+    history = []
+    started = time.perf_counter()
+    for turn in range(turns):
+        history.append(message("user", turn))
+        request = ChatCompletionRequest(messages=[Message(**m) for m in history])
+        codec.dumps(request.model_dump(exclude_none=True))
+        history.append(message("assistant", turn))
+    return time.perf_counter() - started
+
+
+def conversation(turns: int, codec: JSONCodec) -> float:
+    chat = Conversation(SimpleNamespace(json_codec=codec))
+    started = time.perf_counter()
+    for turn in range(turns):
+        chat.append(message("user", turn))
+        chat._render(None, stream=False)
+        chat.append(message("assistant", turn))
+    return time.perf_counter() - started
+
+
+def forks(turns: int, count: int, codec: JSONCodec) -> None:
+    chat = Conversation(SimpleNamespace(json_codec=codec))
+    for turn in range(turns):
+        chat.append(message("user", turn))
+        chat.append(message("assistant", turn))
+    tracemalloc.start()
+    branches = [chat.fork() for _ in range(count)]
+    for i, branch in enumerate(branches):
+        branch.append(message("user", i))
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"{count} forks of a {len(chat)}-message conversation, one new message "
+        f"each: {held / 1024:.1f} KiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--forks", type=int, default=100)
+    args = parser.parse_args()
+
+    codec = default_codec()
+    before = unprepared(args.turns, codec)
+    after = conversation(args.turns, codec)
+    print(f"{args.turns} turns, codec {codec.name}")
+    print(f"{'ChatCompletionRequest':<24} {before * 1e3:8.1f} ms")
+    print(f"{'Conversation':<24} {after * 1e3:8.1f} ms ({before / after:.1f}x)")
+    forks(args.turns, args.forks, codec)
+
+
+if __name__ == "__main__":
+    main()
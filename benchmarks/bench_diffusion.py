@@ -0,0 +1,95 @@
+"""Benchmark diffing the frames of a diffusing stream.
+
+Simulates refinement frames of a multi-kilobyte code output, where each
+frame rewrites a few tokens at random places, and compares ``FrameDiffer``
+with a plain line diff of the whole text. Also reports how many characters
+a renderer has to update compared with redrawing every frame.
+
+Usage:
+    python benchmarks/bench_diffusion.py [--size 8192] [--frames 2000] [--changes 3]
+"""
+
+import argparse
+import difflib
+import random
+import time
+from typing import Callable, List
+
+from mercury_client.utils.diffusion import FrameDiffer, apply_edits
+
+WORDS = ["def", "return", "self", "value", "items", "for", "in", "if", "None", "x"]
+
+
+def build_frames(size: int, frames: int, changes: int, seed: int = 0) -> List[str]:
+    """Build ``frames`` successive refinements of a ``size``-character text."""
+    rng = random.Random(seed)
+    lines = []
+    length = 0
+    while length < size:
+        line = "    " + " ".join(rng.choice(WORDS) for _ in range(6)) + "\n"
+        lines.append(line)
+        length += len(line)
+    text = "".join(lines)
+    result = [text]
+    for _ in range(frames - 1):
+        for _ in range(changes):
+            start = rng.randrange(len(text) - 8)
+            text = text[:start] + rng.choice(WORDS) + text[start + rng.randint(1, 6) :]
+        result.append(text)
+    return result
+
+
+def frame_differ(frames: List[str]) -> int:
+    differ = FrameDiffer()
+    changed = 0
+    for frame in frames:
+        for edit in differ.update(frame):
+            changed += len(edit.text) + edit.end - edit.start
+    return changed
+
+
+def line_diff(frames: List[str]) -> int:
+    previous: List[str] = []
+    changed = 0
+    for frame in frames:
+        lines = frame.splitlines(keepends=True)
+        matcher = difflib.SequenceMatcher(None, previous, lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag != "equal":
+                changed += sum(map(len, previous[i1:i2])) + sum(map(len, lines[j1:j2]))
+        previous = lines
+    return changed
+
+
+def run(name: str, diff: Callable[[List[str]], int], frames: List[str]) -> None:
+    started = time.perf_counter()
+    changed = diff(frames)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<16} {elapsed / len(frames) * 1e6:9.1f} us/frame "
+        f"{len(frames) / elapsed:>10,.0f} frames/s "
+        f"{changed / len(frames):>9,.0f} chars updated/frame"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=8192)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--changes", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = build_frames(args.size, args.frames, args.changes)
+    differ = FrameDiffer()
+    rendered = ""
+    for frame in frames[:50]:
+        rendered = apply_edits(rendered, differ.update(frame))
+        assert rendered == frame
+
+    print(f"full redraw      {sum(map(len, frames)) / len(frames):>52,.0f} chars/frame")
+    run("FrameDiffer", frame_differ, frames)
+    run("line diff", line_diff, frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark package import and client construction at startup.
+
+Runs each stage in a fresh interpreter, as a command-line tool or a
+serverless cold start would, and reports the cumulative import time reported
+by ``python -X importtime`` together with the wall time of the statement.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Tuple
+
+STAGES = [
+    ("import mercury_client", "import mercury_client"),
+    ("import MercuryClient", "from mercury_client import MercuryClient"),
+    (
+        "construct MercuryClient",
+        "from mercury_client import MercuryClient; MercuryClient(api_key='x')",
+    ),
+]
+
+
+def run(statement: str) -> Tuple[float, float]:
+    """Return the wall time and package import time of ``statement``."""
+    code = (
+        "import time; _started = time.perf_counter(); "
+        f"{statement}; print(time.perf_counter() - _started)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Nested imports are indented, so this sums the top-level imports of
+        # the package, each including everything it imported in turn.
+        if name.startswith(" mercury_client") and cumulative.strip().isdigit():
+            imported += int(cumulative)
+    return float(result.stdout), imported / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'':<26} {'wall':>8}    {'import':>8}    (median)")
+    for name, statement in STAGES:
+        walls, imports = zip(*(run(statement) for _ in range(args.repeat)))
+        wall = statistics.median(walls) * 1e3
+        imported = statistics.median(imports) * 1e3
+        print(f"{name:<26} {wall:8.1f} ms {imported:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
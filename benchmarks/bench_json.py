@@ -0,0 +1,114 @@
+"""Benchmark JSON handling of large chat completions.
+
+Measures the CPU time per request of encoding a long prompt and parsing a
+response near the 32k-token output limit, comparing the standard library
+path (``json.dumps`` and ``ChatCompletionResponse(**json.loads(...))``)
+with encoding by the JSON codecs and ``model_validate_json`` on the raw
+bytes.
+
+Usage:
+    python benchmarks/bench_json.py [--tokens 32000] [--iterations 200]
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict
+
+from mercury_client.models.chat import ChatCompletionResponse
+from mercury_client.utils.codec import PYDANTIC_CODEC, default_codec
+
+# Rough characters per token of English prose and code
+CHARS_PER_TOKEN = 4
+
+
+def build_text(tokens: int) -> str:
+    words = []
+    size = 0
+    i = 0
+    while size < tokens * CHARS_PER_TOKEN:
+        word = f'word{i} "quoted"\n' if i % 16 == 0 else f"tok{i} "
+        words.append(word)
+        size += len(word)
+        i += 1
+    return "".join(words)
+
+
+def build_payload(tokens: int) -> Dict[str, Any]:
+    return {
+        "model": "mercury-coder-small",
+        "messages": [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": build_text(tokens)},
+        ],
+        "max_tokens": 32000,
+        "temperature": 0.7,
+    }
+
+
+def build_response(tokens: int) -> bytes:
+    return json.dumps(
+        {
+            "id": "chatcmpl-123",
+            "object": "chat.completion",
+            "created": 1677649420,
+            "model": "mercury-coder-small",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": build_text(tokens)},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": 20,
+                "completion_tokens": tokens,
+                "total_tokens": tokens + 20,
+            },
+        }
+    ).encode()
+
+
+def timed(name: str, func: Callable[[], object], iterations: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = (time.perf_counter() - started) / iterations
+    print(f"{name:<40} {elapsed * 1e6:10.1f} us")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=32_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    payload = build_payload(args.tokens)
+    body = build_response(args.tokens)
+    codec = default_codec()
+    n = args.iterations
+    print(f"Request body {len(json.dumps(payload)) / 1024:.0f} KiB")
+    before = timed("json.dumps", lambda: json.dumps(payload).encode(), n)
+    timed("pydantic codec dumps", lambda: PYDANTIC_CODEC.dumps(payload), n)
+    after = timed(f"{codec.name} codec dumps", lambda: codec.dumps(payload), n)
+    print(f"Response body {len(body) / 1024:.0f} KiB")
+    before += timed(
+        "ChatCompletionResponse(**json.loads())",
+        lambda: ChatCompletionResponse(**json.loads(body)),
+        n,
+    )
+    after += timed(
+        "model_validate_json()",
+        lambda: ChatCompletionResponse.model_validate_json(body),
+        n,
+    )
+    print(
+        f"Per request: {before * 1e6:.0f} us -> {after * 1e6:.0f} us "
+        f"({before / after:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark event loop blocking by large chat completions.
+
+Sends requests answered with a large completion carrying tool calls through
+a mock transport while a ticker coroutine measures how late the loop wakes
+it, with responses parsed on the loop and in a worker thread. The time each
+request held the loop, as reported to ``LoopConfig.on_loop_block``, is shown
+alongside.
+
+Usage:
+    python benchmarks/bench_loop.py [--tool-calls 1000] [--requests 50]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+import httpx
+
+from mercury_client import AsyncMercuryClient, LoopConfig
+
+if TYPE_CHECKING:
+    from mercury_client.utils.loop import LoopBlockReport
+
+TICK = 0.0005
+
+
+def build_response(tool_calls: int) -> bytes:
+    calls = [
+        {
+            "id": f"call_{i}",
+            "type": "function",
+            "function": {
+                "name": "write_file",
+                "arguments": json.dumps({"path": f"src/{i}.py", "body": "x" * 400}),
+            },
+        }
+        for i in range(tool_calls)
+    ]
+    return json.dumps(
+        {
+            "id": "chatcmpl-123",
+            "object": "chat.completion",
+            "created": 1677649420,
+            "model": "mercury-coder-small",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": "word " * 32000,
+                        "tool_calls": calls,
+                    },
+                    "finish_reason": "tool_calls",
+                }
+            ],
+        }
+    ).encode()
+
+
+async def ticker(lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def run(body: bytes, requests: int, threshold: Optional[int]) -> None:
+    reports: List[LoopBlockReport] = []
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    lags: List[float] = []
+    stop = asyncio.Event()
+    async with AsyncMercuryClient(
+        api_key="bench",
+        transport=transport,
+        loop_config=LoopConfig(
+            offload_threshold=threshold, on_loop_block=reports.append
+        ),
+    ) as client:
+        messages = [{"role": "user", "content": "Hi"}]
+        await client.chat_completion(messages)
+        reports.clear()
+        task = asyncio.ensure_future(ticker(lags, stop))
+        for _ in range(requests):
+            await client.chat_completion(messages)
+            await asyncio.sleep(0.002)
+        stop.set()
+        await task
+    lags.sort()
+    held = statistics.median(r.held for r in reports)
+    longest = statistics.median(r.longest for r in reports)
+    name = "parsed on loop" if threshold is None else "parsed in thread"
+    print(
+        f"{name:<18} held {held * 1e3:6.2f} ms (longest step {longest * 1e3:6.2f})"
+        f"  ticker lag p50 {lags[len(lags) // 2] * 1e3:5.2f} ms"
+        f"  p99 {lags[int(len(lags) * 0.99)] * 1e3:6.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tool-calls", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    body = build_response(args.tool_calls)
+    print(f"Response body {len(body) / 1024:.0f} KiB")
+    asyncio.run(run(body, args.requests, None))
+    asyncio.run(run(body, args.requests, 0))
+
+
+if __name__ == "__main__":
+    main()
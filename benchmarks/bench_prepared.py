@@ -0,0 +1,88 @@
+"""Benchmark building chat requests from a prepared template.
+
+Measures the CPU time and memory allocated per call of building and encoding
+a request whose system prompt, few-shot examples, tools and parameters are
+fixed, comparing the path of ``chat_completion`` (validating every message
+into a ``ChatCompletionRequest`` and dumping it) with
+``PreparedChatRequest.render``.
+
+Usage:
+    python benchmarks/bench_prepared.py [--examples 8] [--iterations 20000]
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from mercury_client.models.chat import ChatCompletionRequest, Message
+from mercury_client.utils.codec import default_codec
+from mercury_client.utils.prepared import PreparedChatRequest
+
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": f"tool_{i}",
+            "description": "Look something up.",
+            "parameters": {
+                "type": "object",
+                "properties": {"query": {"type": "string"}},
+                "required": ["query"],
+            },
+        },
+    }
+    for i in range(4)
+]
+
+
+def few_shot(examples: int) -> List[Dict[str, Any]]:
+    messages = []
+    for i in range(examples):
+        messages.append({"role": "user", "content": f"Example question {i}? " * 8})
+        messages.append({"role": "assistant", "content": f"Example answer {i}. " * 8})
+    return messages
+
+
+def measure(name: str, call: Callable[[], object], iterations: int) -> None:
+    call()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    elapsed = (time.perf_counter() - started) / iterations
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{name:<24} {elapsed * 1e6:8.1f} us/call {peak / 1024:8.1f} KiB peak")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--examples", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    codec = default_codec()
+    system = {"role": "system", "content": "You are a helpful assistant. " * 20}
+    fixed = [system] + few_shot(args.examples)
+    user = [{"role": "user", "content": "What is the capital of France?"}]
+    params = {"max_tokens": 512, "tools": TOOLS, "tool_choice": "auto"}
+    template = PreparedChatRequest(fixed, **params)
+
+    def unprepared() -> bytes:
+        request = ChatCompletionRequest(
+            messages=[Message(**m) for m in fixed + user], **params
+        )
+        return codec.dumps(request.model_dump(exclude_none=True))
+
+    def prepared() -> bytes:
+        return template.render(user, codec)[1]
+
+    print(f"{len(fixed)} fixed messages, {len(TOOLS)} tools, codec {codec.name}")
+    measure("ChatCompletionRequest", unprepared, args.iterations)
+    measure("PreparedChatRequest", prepared, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark decoding of a chat completion event stream.
+
+Compares the line-based decoding used before ``SSEDecoder`` (``iter_lines``,
+``json.loads`` and model construction per line) with ``SSEDecoder`` and
+``parse_chunk`` on the same synthetic stream, split into network-sized
+chunks.
+
+Usage:
+    python benchmarks/bench_sse.py [--chunks 100000] [--read-size 4096]
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, Iterator, List
+
+import httpx
+
+from mercury_client.models.chat import ChatCompletionResponse
+from mercury_client.utils.sse import SSEDecoder
+from mercury_client.utils.streaming import parse_chunk
+
+
+def build_stream(chunks: int) -> bytes:
+    """Build an event stream of ``chunks`` content deltas."""
+    events = []
+    for i in range(chunks):
+        chunk = {
+            "id": "chatcmpl-123",
+            "object": "chat.completion.chunk",
+            "created": 1677649420,
+            "model": "mercury-coder-small",
+            "choices": [
+                {"index": 0, "delta": {"content": f"tok{i} "}, "finish_reason": None}
+            ],
+        }
+        events.append(f"data: {json.dumps(chunk)}\n\n")
+    events.append("data: [DONE]\n\n")
+    return "".join(events).encode()
+
+
+def split(body: bytes, size: int) -> List[bytes]:
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+def line_based(reads: List[bytes]) -> Iterator[ChatCompletionResponse]:
+    """The previous implementation."""
+    response = httpx.Response(200, content=iter(reads))
+    for line in response.iter_lines():
+        if line.startswith("data: "):
+            data = line[6:]
+            if data == "[DONE]":
+                break
+            try:
+                yield ChatCompletionResponse(**json.loads(data))
+            except json.JSONDecodeError:
+                continue
+
+
+def decoder_based(reads: List[bytes]) -> Iterator[ChatCompletionResponse]:
+    """The current implementation."""
+    response = httpx.Response(200, content=iter(reads))
+    for event in SSEDecoder().iter_events(response.iter_bytes()):
+        chunk = parse_chunk(event)
+        if chunk is None:
+            break
+        yield chunk
+
+
+def events_only(reads: List[bytes]) -> Iterator[bytes]:
+    """Event framing alone, without building models."""
+    decoder = SSEDecoder()
+    for read in reads:
+        for event in decoder.feed(read):
+            yield event.data
+
+
+def lines_only(reads: List[bytes]) -> Iterator[str]:
+    """Line framing of the previous implementation, without models."""
+    response = httpx.Response(200, content=iter(reads))
+    for line in response.iter_lines():
+        if line.startswith("data: "):
+            yield line[6:]
+
+
+def run(name: str, fn: Callable[[List[bytes]], Iterator], reads: List[bytes]) -> None:
+    started = time.perf_counter()
+    count = sum(1 for _ in fn(reads))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<24} {count:>8} chunks {elapsed:8.3f}s "
+        f"{count / elapsed:>12,.0f} chunks/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--read-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    reads = split(build_stream(args.chunks), args.read_size)
+    run("iter_lines (framing)", lines_only, reads)
+    run("SSEDecoder (framing)", events_only, reads)
+    run("iter_lines + json.loads", line_based, reads)
+    run("SSEDecoder + parse_chunk", decoder_based, reads)
+
+
+if __name__ == "__main__":
+    main()
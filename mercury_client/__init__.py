@@ -2,26 +2,97 @@
 
 A production-ready Python client library for the Mercury diffusion-LLM API,
 providing both synchronous and asynchronous interfaces with full type safety.
+
+The clients, models and utilities are imported on first access, so that
+``import mercury_client`` stays cheap for command-line tools and cold starts.
 """
 
-from mercury_client.client import MercuryClient
-from mercury_client.async_client import AsyncMercuryClient
-from mercury_client.models import (
-    ChatCompletionRequest,
-    ChatCompletionResponse,
-    FIMCompletionRequest,
-    FIMCompletionResponse,
-    Message,
-    Tool,
-    ToolCall,
-)
-from mercury_client.exceptions import (
-    MercuryAPIError,
-    AuthenticationError,
-    RateLimitError,
-    ServerError,
-    EngineOverloadedError,
-)
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from mercury_client.async_client import AsyncMercuryClient
+    from mercury_client.client import MercuryClient
+    from mercury_client.exceptions import (
+        AuthenticationError,
+        CircuitOpenError,
+        EngineOverloadedError,
+        MercuryAPIError,
+        RateLimitError,
+        ServerError,
+        StreamDecodeError,
+        StreamInterruptedError,
+    )
+    from mercury_client.models import (
+        ChatCompletionRequest,
+        ChatCompletionResponse,
+        FIMCompletionRequest,
+        FIMCompletionResponse,
+        Message,
+        Tool,
+        ToolCall,
+    )
+    from mercury_client.utils import (
+        AdaptiveConcurrencyLimiter,
+        AsyncConversation,
+        BalancerConfig,
+        BatchResult,
+        CircuitBreaker,
+        CircuitState,
+        Conversation,
+        HedgingPolicy,
+        LoopBlockReport,
+        LoopConfig,
+        PoolConfig,
+        PoolStats,
+        PreparedChatRequest,
+        RateLimiter,
+        ResponseCache,
+        RetryBudget,
+        RetryConfig,
+        SQLiteCache,
+        StreamConfig,
+    )
+
+# Public name -> module defining it, imported on first access
+_LAZY = {
+    "MercuryClient": "mercury_client.client",
+    "AsyncMercuryClient": "mercury_client.async_client",
+    "ChatCompletionRequest": "mercury_client.models",
+    "ChatCompletionResponse": "mercury_client.models",
+    "FIMCompletionRequest": "mercury_client.models",
+    "FIMCompletionResponse": "mercury_client.models",
+    "Message": "mercury_client.models",
+    "Tool": "mercury_client.models",
+    "ToolCall": "mercury_client.models",
+    "MercuryAPIError": "mercury_client.exceptions",
+    "AuthenticationError": "mercury_client.exceptions",
+    "RateLimitError": "mercury_client.exceptions",
+    "ServerError": "mercury_client.exceptions",
+    "EngineOverloadedError": "mercury_client.exceptions",
+    "CircuitOpenError": "mercury_client.exceptions",
+    "StreamInterruptedError": "mercury_client.exceptions",
+    "StreamDecodeError": "mercury_client.exceptions",
+    "AdaptiveConcurrencyLimiter": "mercury_client.utils",
+    "AsyncConversation": "mercury_client.utils",
+    "BalancerConfig": "mercury_client.utils",
+    "BatchResult": "mercury_client.utils",
+    "CircuitBreaker": "mercury_client.utils",
+    "CircuitState": "mercury_client.utils",
+    "Conversation": "mercury_client.utils",
+    "HedgingPolicy": "mercury_client.utils",
+    "LoopBlockReport": "mercury_client.utils",
+    "LoopConfig": "mercury_client.utils",
+    "PoolConfig": "mercury_client.utils",
+    "PoolStats": "mercury_client.utils",
+    "PreparedChatRequest": "mercury_client.utils",
+    "RateLimiter": "mercury_client.utils",
+    "ResponseCache": "mercury_client.utils",
+    "RetryBudget": "mercury_client.utils",
+    "RetryConfig": "mercury_client.utils",
+    "SQLiteCache": "mercury_client.utils",
+    "StreamConfig": "mercury_client.utils",
+}
 
 __version__ = "0.1.0"
 __author__ = "Hamza Amjad"
@@ -45,4 +116,40 @@ __all__ = [
     "RateLimitError",
     "ServerError",
     "EngineOverloadedError",
-]
\ No newline at end of file
+    "CircuitOpenError",
+    "StreamInterruptedError",
+    "StreamDecodeError",
+    # Configuration
+    "RetryConfig",
+    "RetryBudget",
+    "PoolConfig",
+    "PoolStats",
+    "ResponseCache",
+    "SQLiteCache",
+    "BatchResult",
+    "RateLimiter",
+    "AdaptiveConcurrencyLimiter",
+    "CircuitBreaker",
+    "CircuitState",
+    "StreamConfig",
+    "HedgingPolicy",
+    "BalancerConfig",
+    "PreparedChatRequest",
+    "Conversation",
+    "AsyncConversation",
+    "LoopConfig",
+    "LoopBlockReport",
+]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
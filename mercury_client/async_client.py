@@ -1,12 +1,34 @@
 """Asynchronous client for Mercury API."""
 
+import asyncio
+import contextlib
 import os
-from typing import Optional, Dict, Any, AsyncIterator, Union
-from urllib.parse import urljoin
+import time
+import weakref
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import httpx
-from dotenv import load_dotenv
 
+from mercury_client.exceptions import (
+    AuthenticationError,
+    EngineOverloadedError,
+    MercuryAPIError,
+    RateLimitError,
+    ServerError,
+)
 from mercury_client.models.chat import (
     ChatCompletionRequest,
     ChatCompletionResponse,
@@ -16,17 +38,43 @@ from mercury_client.models.fim import (
     FIMCompletionRequest,
     FIMCompletionResponse,
 )
-from mercury_client.exceptions import (
-    MercuryAPIError,
-    AuthenticationError,
-    RateLimitError,
-    ServerError,
-    EngineOverloadedError,
+from mercury_client.utils.accumulator import StreamAccumulator
+from mercury_client.utils.balancer import BalancerConfig, EndpointStats, LoadBalancer
+from mercury_client.utils.batch import BatchResult, build_payload, run_batch_async
+from mercury_client.utils.cache import CacheBackend, cache_key, replay_stream
+from mercury_client.utils.circuit_breaker import CircuitBreaker
+from mercury_client.utils.codec import JSONCodec, default_codec
+from mercury_client.utils.concurrency import AdaptiveConcurrencyLimiter
+from mercury_client.utils.conversation import AsyncConversation
+from mercury_client.utils.hedging import HedgingPolicy
+from mercury_client.utils.keys import request_key
+from mercury_client.utils.loop import (
+    LoopBlockReport,
+    LoopConfig,
+    LoopTimer,
+    timed_stream,
+)
+from mercury_client.utils.pool import (
+    AsyncBorrowedTransport,
+    LazyClients,
+    PoolConfig,
+    PoolMonitor,
+    PoolStats,
 )
-from mercury_client.utils.retry import RetryConfig, calculate_delay
+from mercury_client.utils.prepared import PreparedChatRequest
+from mercury_client.utils.rate_limit import RateLimiter, estimate_tokens
+from mercury_client.utils.retry import (
+    RetryBudget,
+    RetryConfig,
+    retry_delay,
+    start_deadline,
+)
+from mercury_client.utils.singleflight import AsyncSingleFlight
+from mercury_client.utils.sse import SSEDecoder
+from mercury_client.utils.streaming import StreamConfig, StreamProgress, parse_chunk
+from mercury_client.utils.text_stream import AsyncTextStream
 
-# Load environment variables
-load_dotenv()
+ResponseT = TypeVar("ResponseT", ChatCompletionResponse, FIMCompletionResponse)
 
 
 class AsyncMercuryClient:
@@ -35,79 +83,198 @@ class AsyncMercuryClient:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        base_url: str = "https://api.inceptionlabs.ai/v1",
+        base_url: Union[str, Sequence[str]] = "https://api.inceptionlabs.ai/v1",
         timeout: float = 30.0,
         retry_config: Optional[RetryConfig] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        pool_config: Optional[PoolConfig] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        single_flight: bool = False,
+        cache: Optional[CacheBackend] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        stream_config: Optional[StreamConfig] = None,
+        balancer_config: Optional[BalancerConfig] = None,
+        json_codec: Optional[JSONCodec] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        loop_config: Optional[LoopConfig] = None,
+        load_env: Union[bool, str] = False,
     ) -> None:
         """Initialize async Mercury client.
-        
+
         Args:
             api_key: API key for authentication. If not provided, will look for
                 MERCURY_API_KEY or INCEPTION_API_KEY environment variables.
-            base_url: Base URL for the API
+            base_url: Base URL for the API, or a list of equivalent endpoints
+                to balance requests across
             timeout: Request timeout in seconds
             retry_config: Configuration for retry behavior
-        
+            retry_budget: Cap on retries relative to first attempts across
+                every call on this client; may be shared between clients
+            pool_config: Connection pool limits, keep-alive and HTTP/2 settings
+            transport: Shared transport to send requests through. The client
+                does not close an injected transport, and its own pool limits
+                apply instead of ``pool_config``.
+            single_flight: Coalesce identical concurrent requests into a single
+                HTTP call whose result (or stream) is shared by every caller
+            cache: Response cache for completions. Cached chat completions
+                are also replayed as streams by ``chat_completion_stream``.
+            rate_limiter: Limiter that paces requests before they are sent;
+                may be shared between clients
+            circuit_breaker: Breaker that fails requests fast with
+                ``CircuitOpenError`` while the API is failing; may be shared
+                between clients
+            concurrency_limiter: Adaptive limit on in-flight requests that
+                shrinks on rate-limit and overload errors; may be shared
+                between clients
+            stream_config: Stall detection and recovery of interrupted
+                streams
+            balancer_config: Routing policy and health checks used when
+                ``base_url`` lists several endpoints
+            json_codec: JSON codec for request bodies, orjson or msgspec when
+                installed by default
+            hedging: Send a duplicate of chat and FIM completions that are
+                slower than usual for their model and use the first answer
+            loop_config: Parsing of large responses in an executor and
+                reporting of the time requests hold the event loop
+            load_env: Load environment variables from a ``.env`` file
+                before reading the API key: True searches the working
+                directory and its parents, or pass the file's path
+
         Raises:
             ValueError: If no API key is provided or found in environment
         """
-        self.api_key = api_key or os.getenv("MERCURY_API_KEY") or os.getenv("INCEPTION_API_KEY")
+        if load_env:
+            from dotenv import find_dotenv, load_dotenv
+
+            load_dotenv(find_dotenv(usecwd=True) if load_env is True else load_env)
+        self.api_key = (
+            api_key or os.getenv("MERCURY_API_KEY") or os.getenv("INCEPTION_API_KEY")
+        )
         if not self.api_key:
             raise ValueError(
                 "API key must be provided or set as MERCURY_API_KEY environment variable"
             )
-        
-        self.base_url = base_url.rstrip("/")
+
+        urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        if not urls:
+            raise ValueError("At least one base URL must be provided")
+        self.base_urls = [url.rstrip("/") for url in urls]
+        self.base_url = self.base_urls[0]
         self.timeout = timeout
         self.retry_config = retry_config or RetryConfig()
-        
-        # Configure httpx client
-        self._client = httpx.AsyncClient(
-            base_url=self.base_url,
+        self.retry_budget = retry_budget
+        self.pool_config = pool_config or PoolConfig()
+        self._cache = cache
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.stream_config = stream_config or StreamConfig()
+        self.json_codec = json_codec or default_codec()
+        self.hedging = hedging
+        self.concurrency_limiter = concurrency_limiter
+        self.loop_config = loop_config or LoopConfig()
+        self._single_flight = AsyncSingleFlight() if single_flight else None
+        if transport is not None:
+            transport = AsyncBorrowedTransport(transport)
+        max_connections = self.pool_config.max_connections
+        self._pool_monitor = PoolMonitor(
+            None
+            if transport is not None or max_connections is None
+            else max_connections * len(self.base_urls)
+        )
+
+        # One httpx client, and so one connection pool, per endpoint, each
+        # created on first use
+        self._clients = LazyClients(lambda url: self._create_client(url, transport))
+        self._balancer = (
+            LoadBalancer(self.base_urls, balancer_config)
+            if len(self.base_urls) > 1
+            else None
+        )
+        self._health_task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """HTTP client of the first endpoint."""
+        return self._clients[self.base_url]
+
+    def _create_client(
+        self, base_url: str, transport: Optional[httpx.AsyncBaseTransport]
+    ) -> httpx.AsyncClient:
+        """Create the httpx client for one endpoint."""
+        return httpx.AsyncClient(
+            base_url=base_url,
             headers={
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
             },
-            timeout=httpx.Timeout(self.timeout),
+            timeout=self.pool_config.to_timeout(self.timeout),
+            limits=self.pool_config.to_limits(),
+            http2=self.pool_config.http2,
+            transport=transport,
         )
 
-    async def __aenter__(self):
+    async def __aenter__(self) -> "AsyncMercuryClient":
         """Async context manager entry."""
         return self
 
-    async def __aexit__(self, *args):
+    async def __aexit__(self, *args: Any) -> None:
         """Async context manager exit."""
         await self.close()
 
     async def close(self) -> None:
-        """Close the HTTP client."""
-        await self._client.aclose()
+        """Close the HTTP clients and stop health checks."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._health_task
+            self._health_task = None
+        for client in self._clients.values():
+            await client.aclose()
+
+    def pool_stats(self) -> PoolStats:
+        """Return connection pool occupancy and wait-time statistics.
+
+        Returns:
+            Snapshot of the pool statistics
+        """
+        return self._pool_monitor.stats()
+
+    def endpoint_stats(self) -> List[EndpointStats]:
+        """Return the routing state of each endpoint.
+
+        Returns:
+            One snapshot per endpoint, empty for a single-endpoint client
+        """
+        if self._balancer is None:
+            return []
+        return self._balancer.stats()
 
     def _handle_response_errors(self, response: httpx.Response) -> None:
         """Handle API response errors.
-        
+
         Args:
             response: HTTP response
-            
+
         Raises:
             MercuryAPIError: If response indicates an error
         """
         if response.status_code >= 200 and response.status_code < 300:
             return
-        
+
         try:
             error_data = response.json()
             message = error_data.get("error", {}).get("message", response.text)
         except Exception:
             message = response.text or f"HTTP {response.status_code}"
-        
+
         if response.status_code == 401:
             raise AuthenticationError(message)
         elif response.status_code == 429:
             retry_after = response.headers.get("Retry-After")
             raise RateLimitError(
-                message,
-                retry_after=int(retry_after) if retry_after else None
+                message, retry_after=int(retry_after) if retry_after else None
             )
         elif response.status_code == 500:
             raise ServerError(message)
@@ -117,63 +284,278 @@ class AsyncMercuryClient:
             raise MercuryAPIError(
                 message=message,
                 status_code=response.status_code,
-                response_data=error_data if 'error_data' in locals() else None
+                response_data=error_data if "error_data" in locals() else None,
             )
 
     async def _request_with_retry(
         self,
         method: str,
         url: str,
-        **kwargs
+        tokens: int = 0,
+        hedge_model: Optional[str] = None,
+        **kwargs: Any,
     ) -> httpx.Response:
         """Make HTTP request with retry logic.
-        
+
+        When a hedging policy is set, each attempt is hedged on its own, so
+        the latencies it learns from exclude backoff sleeps. Attempts after a
+        rate limit or overload error are never hedged.
+
         Args:
             method: HTTP method
             url: URL path
+            tokens: Estimated tokens reserved from the rate limiter per attempt
+            hedge_model: Model whose latencies decide when to hedge an
+                attempt, or None to never hedge
             **kwargs: Additional arguments for httpx request
-            
+
         Returns:
             HTTP response
-            
+
         Raises:
             MercuryAPIError: If request fails after retries
         """
         last_exception = None
-        
+        deadline = start_deadline(self.retry_config)
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+
         for attempt in range(self.retry_config.max_retries + 1):
+            if deadline is not None:
+                # Bound each attempt by the time left for the whole call.
+                kwargs["timeout"] = self.pool_config.to_timeout(
+                    self.timeout, cap=deadline - time.monotonic()
+                )
             try:
-                response = await self._client.request(method, url, **kwargs)
-                self._handle_response_errors(response)
-                return response
+                if self.circuit_breaker is None:
+                    return await self._hedged_attempt(
+                        method, url, tokens, hedge_model, **kwargs
+                    )
+                with self.circuit_breaker.guard():
+                    return await self._hedged_attempt(
+                        method, url, tokens, hedge_model, **kwargs
+                    )
             except tuple(self.retry_config.retry_on) as e:
                 last_exception = e
-                if attempt < self.retry_config.max_retries:
-                    retry_after = getattr(e, 'retry_after', None)
-                    delay = calculate_delay(attempt, self.retry_config, retry_after)
-                    import asyncio
+                if isinstance(e, (RateLimitError, EngineOverloadedError)):
+                    # Duplicates would only add load to a struggling server.
+                    hedge_model = None
+                delay = retry_delay(attempt, self.retry_config, e, deadline)
+                if delay is not None and (
+                    self.retry_budget is None or self.retry_budget.try_spend()
+                ):
                     await asyncio.sleep(delay)
                     continue
                 raise
-            except Exception as e:
+            except Exception:
                 raise
 
-        if last_exception:
-            raise last_exception
+        assert last_exception is not None
+        raise last_exception
+
+    async def _hedged_attempt(
+        self,
+        method: str,
+        url: str,
+        tokens: int,
+        hedge_model: Optional[str],
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a single attempt, hedged when a model is given."""
+        if self.hedging is None or hedge_model is None:
+            return await self._attempt(method, url, tokens, **kwargs)
+        return await self.hedging.run(
+            hedge_model, lambda: self._attempt(method, url, tokens, **kwargs)
+        )
+
+    async def _attempt(
+        self, method: str, url: str, tokens: int, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a single request attempt and raise on error responses."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(tokens)
+        if self.concurrency_limiter is None:
+            return await self._send(method, url, **kwargs)
+        async with self.concurrency_limiter.slot():
+            return await self._send(method, url, **kwargs)
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send one HTTP request to the endpoint chosen by the balancer."""
+        if self._balancer is None:
+            return await self._request(self._client, method, url, **kwargs)
+        self._start_health_checks()
+        with self._balancer.route() as endpoint:
+            return await self._request(
+                self._clients[endpoint.url], method, url, **kwargs
+            )
+
+    async def _request(
+        self, client: httpx.AsyncClient, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """Send one HTTP request through ``client``'s pool."""
+        tracked = self._pool_monitor.track()
+        try:
+            response = await client.request(
+                method, url, extensions={"trace": tracked.atrace}, **kwargs
+            )
+        finally:
+            tracked.close()
+        self._handle_response_errors(response)
+        return response
+
+    def _start_health_checks(self) -> None:
+        """Start probing ejected endpoints in the background, once."""
+        if self._health_task is None:
+            assert self._balancer is not None
+            # The task only holds a weak reference, so that a client which is
+            # never closed can still be collected, ending the task.
+            self._health_task = asyncio.ensure_future(
+                self._health_check_loop(weakref.ref(self), self._balancer)
+            )
+
+    @staticmethod
+    async def _health_check_loop(
+        client_ref: "weakref.ReferenceType[AsyncMercuryClient]",
+        balancer: LoadBalancer,
+    ) -> None:
+        """Periodically probe ejected endpoints and restore healthy ones."""
+        while True:
+            await asyncio.sleep(balancer.config.health_check_interval)
+            client = client_ref()
+            if client is None:
+                return
+            for endpoint in balancer.ejected():
+                balancer.probe_result(endpoint, await client._probe(endpoint.url))
+            del client
+
+    async def _probe(self, url: str) -> bool:
+        """Check whether the endpoint at ``url`` answers."""
+        assert self._balancer is not None
+        try:
+            response = await self._clients[url].get(
+                self._balancer.config.health_check_path
+            )
+        except httpx.HTTPError:
+            return False
+        return response.status_code < 500
+
+    async def _cache_get(self, key: str) -> Optional[bytes]:
+        """Look up a cached response, off the event loop for blocking backends."""
+        assert self._cache is not None
+        if self._cache.blocking:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._cache.get, key)
+        return self._cache.get(key)
+
+    async def _cache_set(self, key: str, value: bytes) -> None:
+        """Store a response, off the event loop for blocking backends."""
+        assert self._cache is not None
+        if self._cache.blocking:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._cache.set, key, value)
+        else:
+            self._cache.set(key, value)
+
+    async def _post(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        response_model: Type[ResponseT],
+        body: Optional[bytes] = None,
+    ) -> ResponseT:
+        """Send a completion request and parse the response.
+
+        Responses are served from and stored in the response cache when one
+        is configured, identical concurrent requests are coalesced when
+        single-flight is enabled, and slow requests are hedged when a
+        hedging policy is set. Large responses are parsed in the executor of
+        ``loop_config``, which is also told how long the request held the
+        event loop.
+
+        Args:
+            url: URL path
+            payload: JSON request body
+            response_model: Model to parse the response into
+            body: Encoded ``payload``, if already available
+
+        Returns:
+            Parsed response
+        """
+        listener = self.loop_config.on_loop_block
+        if listener is None:
+            return await self._post_request(url, payload, response_model, body)
+        report = LoopBlockReport(url)
+        timer = LoopTimer(
+            self._post_request(url, payload, response_model, body, report)
+        )
+        try:
+            return await timer
+        finally:
+            report.add(timer)
+            listener(report)
+
+    async def _post_request(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        response_model: Type[ResponseT],
+        body: Optional[bytes] = None,
+        report: Optional[LoopBlockReport] = None,
+    ) -> ResponseT:
+        """Serve a completion request from the cache or the API."""
+        key = cache_key(url, payload) if self._cache is not None else None
+        if key is not None:
+            cached = await self._cache_get(key)
+            if cached is not None:
+                return await self._parse(response_model, cached, report)
+
+        if body is None:
+            body = self.json_codec.dumps(payload)
+        tokens = estimate_tokens(payload) if self.rate_limiter is not None else 0
+
+        async def send() -> ResponseT:
+            response = await self._request_with_retry(
+                "POST", url, tokens, hedge_model=payload.get("model", ""), content=body
+            )
+            result = await self._parse(response_model, response.content, report)
+            if key is not None:
+                await self._cache_set(key, response.content)
+            return result
+
+        if self._single_flight is None:
+            return await send()
+        return await self._single_flight.do(request_key(url, payload), send)
+
+    async def _parse(
+        self,
+        response_model: Type[ResponseT],
+        content: bytes,
+        report: Optional[LoopBlockReport] = None,
+    ) -> ResponseT:
+        """Validate a response body, in the executor if it is large."""
+        offload = self.loop_config.should_offload(len(content))
+        if report is not None:
+            report.response_bytes = len(content)
+            report.offloaded = offload
+        if not offload:
+            return response_model.model_validate_json(content)
+        return await asyncio.get_running_loop().run_in_executor(
+            self.loop_config.executor, response_model.model_validate_json, content
+        )
 
     async def chat_completion(
         self,
         messages: list[Union[Dict[str, Any], Message]],
         model: str = "mercury-coder-small",
-        **kwargs
+        **kwargs: Any,
     ) -> ChatCompletionResponse:
         """Create a chat completion.
-        
+
         Args:
             messages: List of messages in the conversation
             model: Model to use for completion
             **kwargs: Additional parameters for the request
-            
+
         Returns:
             Chat completion response
         """
@@ -184,36 +566,33 @@ class AsyncMercuryClient:
                 message_objs.append(Message(**msg))
             else:
                 message_objs.append(msg)
-        
-        request = ChatCompletionRequest(
-            model=model,
-            messages=message_objs,
-            **kwargs
-        )
-        
-        response = await self._request_with_retry(
-            "POST",
+
+        request = ChatCompletionRequest(model=model, messages=message_objs, **kwargs)
+
+        return await self._post(
             "/chat/completions",
-            json=request.model_dump(exclude_none=True)
+            request.model_dump(exclude_none=True),
+            ChatCompletionResponse,
         )
-        
-        return ChatCompletionResponse(**response.json())
 
     async def chat_completion_stream(
         self,
         messages: list[Union[Dict[str, Any], Message]],
         model: str = "mercury-coder-small",
-        **kwargs
+        **kwargs: Any,
     ) -> AsyncIterator[ChatCompletionResponse]:
         """Create a streaming chat completion.
-        
+
         Args:
             messages: List of messages in the conversation
             model: Model to use for completion
             **kwargs: Additional parameters for the request
-            
+
         Yields:
-            Chat completion response chunks
+            Chat completion response chunks, or ``FastChunk`` objects with
+            the same attributes if ``stream_config.fast_chunks`` is set. A
+            cached completion is replayed as a short stream without contacting
+            the API, and a completed stream is stored in the cache.
         """
         # Convert dict messages to Message objects
         message_objs = []
@@ -222,63 +601,386 @@ class AsyncMercuryClient:
                 message_objs.append(Message(**msg))
             else:
                 message_objs.append(msg)
-        
+
         request = ChatCompletionRequest(
-            model=model,
-            messages=message_objs,
-            stream=True,
-            **kwargs
+            model=model, messages=message_objs, stream=True, **kwargs
         )
-        
-        async with self._client.stream(
-            "POST",
-            "/chat/completions",
-            json=request.model_dump(exclude_none=True)
-        ) as response:
-            self._handle_response_errors(response)
-            
-            async for line in response.aiter_lines():
-                if line.startswith("data: "):
-                    data = line[6:]
-                    if data == "[DONE]":
+        async for chunk in self._chat_stream(request.model_dump(exclude_none=True)):
+            yield chunk
+
+    async def chat_completion_prepared(
+        self,
+        template: PreparedChatRequest,
+        messages: Sequence[Union[Dict[str, Any], Message]],
+    ) -> ChatCompletionResponse:
+        """Create a chat completion from a prepared request.
+
+        Only ``messages`` are validated and encoded; the model, parameters
+        and fixed messages of ``template`` were prepared once.
+
+        Args:
+            template: Prepared model, parameters and leading messages
+            messages: Messages appended to those of the template
+
+        Returns:
+            Chat completion response
+        """
+        payload, body = template.render(messages, self.json_codec)
+        return await self._post(
+            "/chat/completions", payload, ChatCompletionResponse, body
+        )
+
+    async def chat_completion_stream_prepared(
+        self,
+        template: PreparedChatRequest,
+        messages: Sequence[Union[Dict[str, Any], Message]],
+    ) -> AsyncIterator[ChatCompletionResponse]:
+        """Create a streaming chat completion from a prepared request.
+
+        Args:
+            template: Prepared model, parameters and leading messages
+            messages: Messages appended to those of the template
+
+        Yields:
+            Chat completion response chunks, as ``chat_completion_stream``
+        """
+        payload, body = template.render(messages, self.json_codec, stream=True)
+        async for chunk in self._chat_stream(payload, body):
+            yield chunk
+
+    def conversation(
+        self,
+        messages: Iterable[Union[Dict[str, Any], Message]] = (),
+        model: str = "mercury-coder-small",
+        system: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncConversation:
+        """Start a multi-turn conversation.
+
+        Each message is validated and encoded once, when it is added, and
+        replies are added to the history automatically.
+
+        Args:
+            messages: Initial history
+            model: Model to use for completion
+            system: System prompt of every request
+            **kwargs: Additional parameters for every request
+
+        Returns:
+            Conversation sending its requests through this client
+        """
+        return AsyncConversation(
+            self, PreparedChatRequest(model=model, system=system, **kwargs), messages
+        )
+
+    def _chat_stream(
+        self, payload: Dict[str, Any], body: Optional[bytes] = None
+    ) -> AsyncIterator[ChatCompletionResponse]:
+        """Stream a chat request, timing it if loop blocking is reported."""
+        chunks = self._cached_chat_stream(payload, body)
+        listener = self.loop_config.on_loop_block
+        if listener is None:
+            return chunks
+        return timed_stream(
+            chunks, LoopBlockReport("/chat/completions", stream=True), listener
+        )
+
+    async def _cached_chat_stream(
+        self, payload: Dict[str, Any], body: Optional[bytes] = None
+    ) -> AsyncIterator[ChatCompletionResponse]:
+        """Stream a chat request through the cache and single-flight."""
+        key = (
+            cache_key("/chat/completions", payload) if self._cache is not None else None
+        )
+        if key is not None:
+            cached = await self._cache_get(key)
+            if cached is not None:
+                for chunk in replay_stream(
+                    await self._parse(ChatCompletionResponse, cached),
+                    include_usage=bool(
+                        (payload.get("stream_options") or {}).get("include_usage")
+                    ),
+                ):
+                    yield chunk
+                return
+
+        if self._single_flight is None:
+            chunks = self._stream_chat(payload, body)
+        else:
+            chunks = self._single_flight.stream(
+                request_key("/chat/completions", payload),
+                lambda: self._stream_chat(payload, body),
+            )
+        if key is None:
+            async for chunk in chunks:
+                yield chunk
+            return
+
+        # Store the assembled completion so that the request is cached
+        # whether it was streamed or not. Streams without usage are not
+        # stored, as a cached response must match the one from the API.
+        accumulator = StreamAccumulator(diffusing=bool(payload.get("diffusing")))
+        async for chunk in accumulator.awrap(chunks):
+            yield chunk
+        if accumulator.complete and accumulator.usage is not None:
+            await self._cache_set(
+                key, accumulator.response().model_dump_json(exclude_none=True).encode()
+            )
+
+    def chat_completion_stream_text(
+        self,
+        messages: list[Union[Dict[str, Any], Message]],
+        model: str = "mercury-coder-small",
+        coalesce_ms: Optional[float] = None,
+        max_chars: Optional[int] = None,
+        **kwargs: Any,
+    ) -> AsyncTextStream:
+        """Create a streaming chat completion yielding only its text.
+
+        Usage is requested from the API unless ``stream_options`` is given,
+        and is available with the finish reason once the stream ends::
+
+            stream = client.chat_completion_stream_text(messages, coalesce_ms=50)
+            async for text in stream:
+                print(text, end="")
+            print(stream.finish_reason, stream.usage)
+
+        Args:
+            messages: List of messages in the conversation
+            model: Model to use for completion
+            coalesce_ms: Merge deltas for up to this many milliseconds
+            max_chars: Merge deltas until this many characters are buffered
+            **kwargs: Additional parameters for the request
+
+        Returns:
+            Async iterator over the content deltas of the first choice
+        """
+        kwargs.setdefault("stream_options", {"include_usage": True})
+        return AsyncTextStream(
+            self.chat_completion_stream(messages, model, **kwargs),
+            coalesce_ms=coalesce_ms,
+            max_chars=max_chars,
+        )
+
+    async def _stream_chat(
+        self, payload: Dict[str, Any], body: Optional[bytes] = None
+    ) -> AsyncIterator[ChatCompletionResponse]:
+        """Send a streaming chat request and yield the decoded chunks.
+
+        Attempts that fail before yielding anything are retried according to
+        ``retry_config``. Once chunks were yielded, an interrupted stream is
+        restarted with the yielded text skipped if ``stream_config.resume``
+        is set, and ``StreamInterruptedError`` is raised otherwise.
+
+        Args:
+            payload: JSON request body
+            body: Encoded ``payload``, if already available
+
+        Yields:
+            Chat completion response chunks
+        """
+        if body is None:
+            body = self.json_codec.dumps(payload)
+        tokens = estimate_tokens(payload) if self.rate_limiter is not None else 0
+        progress = StreamProgress()
+        deadline = start_deadline(self.retry_config)
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+
+        for attempt in range(self.retry_config.max_retries + 1):
+            timeout = None
+            if deadline is not None:
+                # Bound each attempt by the time left for the whole call.
+                cap = deadline - time.monotonic()
+                timeout = self.stream_config.to_timeout(
+                    self.pool_config.to_timeout(self.timeout, cap=cap), cap=cap
+                )
+            try:
+                async for chunk in self._stream_once(body, tokens, timeout):
+                    unseen = progress.advance(chunk)
+                    if unseen is not None:
+                        yield unseen
+                return
+            except tuple(self.retry_config.retry_on) as e:
+                delay = (
+                    retry_delay(attempt, self.retry_config, e, deadline)
+                    if progress.can_retry(self.stream_config, payload)
+                    else None
+                )
+                if delay is None or not (
+                    self.retry_budget is None or self.retry_budget.try_spend()
+                ):
+                    if progress.started:
+                        raise progress.interrupted(e) from e
+                    raise
+                progress.restart()
+                await asyncio.sleep(delay)
+
+    async def _stream_once(
+        self, body: bytes, tokens: int, timeout: Optional[httpx.Timeout]
+    ) -> AsyncIterator[ChatCompletionResponse]:
+        """Make one streaming attempt through the circuit breaker."""
+        if self.circuit_breaker is None:
+            async for chunk in self._stream_attempt(body, tokens, timeout):
+                yield chunk
+        else:
+            with self.circuit_breaker.guard():
+                async for chunk in self._stream_attempt(body, tokens, timeout):
+                    yield chunk
+
+    async def _stream_attempt(
+        self, body: bytes, tokens: int, timeout: Optional[httpx.Timeout]
+    ) -> AsyncIterator[ChatCompletionResponse]:
+        """Wait for rate and concurrency limits, then open the stream."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(tokens)
+        if self.concurrency_limiter is None:
+            async for chunk in self._stream_response(body, timeout):
+                yield chunk
+        else:
+            async with self.concurrency_limiter.slot() as slot:
+                async for chunk in self._stream_response(body, timeout):
+                    slot.responded()
+                    yield chunk
+
+    async def _stream_response(
+        self, body: bytes, timeout: Optional[httpx.Timeout]
+    ) -> AsyncIterator[ChatCompletionResponse]:
+        """Open the chat stream on the endpoint chosen by the balancer."""
+        if self._balancer is None:
+            async for chunk in self._read_stream(self._client, body, timeout):
+                yield chunk
+            return
+        self._start_health_checks()
+        route = self._balancer.route()
+        with route as endpoint:
+            client = self._clients[endpoint.url]
+            async for chunk in self._read_stream(client, body, timeout):
+                route.responded()
+                yield chunk
+
+    async def _read_stream(
+        self,
+        client: httpx.AsyncClient,
+        body: bytes,
+        timeout: Optional[httpx.Timeout],
+    ) -> AsyncIterator[ChatCompletionResponse]:
+        """Open the chat stream and decode its server-sent events."""
+        if timeout is None:
+            timeout = self.stream_config.to_timeout(client.timeout)
+        tracked = self._pool_monitor.track()
+        try:
+            async with client.stream(
+                "POST",
+                "/chat/completions",
+                content=body,
+                timeout=timeout,
+                extensions={"trace": tracked.atrace},
+            ) as response:
+                if not response.is_success:
+                    await response.aread()
+                self._handle_response_errors(response)
+
+                decoder = SSEDecoder()
+                async for event in decoder.aiter_events(response.aiter_bytes()):
+                    chunk = parse_chunk(
+                        event, self.stream_config.fast_chunks, self.json_codec.loads
+                    )
+                    if chunk is None:
                         break
-                    
-                    import json
-                    try:
-                        chunk = json.loads(data)
-                        yield ChatCompletionResponse(**chunk)
-                    except json.JSONDecodeError:
-                        continue
+                    # Fast chunks stand in for the model they mirror
+                    yield cast("ChatCompletionResponse", chunk)
+        finally:
+            tracked.close()
 
     async def fim_completion(
         self,
         prompt: str,
         suffix: str = "",
         model: str = "mercury-coder-small",
-        **kwargs
+        **kwargs: Any,
     ) -> FIMCompletionResponse:
         """Create a Fill-in-the-Middle completion.
-        
+
         Args:
             prompt: The prefix text before the cursor
             suffix: The suffix text after the cursor
             model: Model to use for completion
             **kwargs: Additional parameters for the request
-            
+
         Returns:
             FIM completion response
         """
         request = FIMCompletionRequest(
-            model=model,
-            prompt=prompt,
-            suffix=suffix,
-            **kwargs
+            model=model, prompt=prompt, suffix=suffix, **kwargs
         )
-        
-        response = await self._request_with_retry(
-            "POST",
+
+        return await self._post(
             "/fim/completions",
-            json=request.model_dump(exclude_none=True)
+            request.model_dump(exclude_none=True),
+            FIMCompletionResponse,
+        )
+
+    def chat_completion_batch(
+        self,
+        requests: Union[
+            Iterable[Union[Dict[str, Any], ChatCompletionRequest]],
+            AsyncIterable[Union[Dict[str, Any], ChatCompletionRequest]],
+        ],
+        concurrency: int = 8,
+        ordered: bool = True,
+    ) -> AsyncIterator[BatchResult[ChatCompletionResponse]]:
+        """Run many chat completions with bounded concurrency.
+
+        Requests are read lazily, and upcoming requests are validated and
+        serialized while earlier ones are in flight. A failing request is
+        reported in its result rather than aborting the batch.
+
+        Args:
+            requests: Iterable or async iterable of ``ChatCompletionRequest``
+                objects or dicts of ``chat_completion`` parameters
+            concurrency: Maximum number of requests in flight
+            ordered: Yield results in input order instead of as they complete
+
+        Returns:
+            Async iterator of batch results, one per request
+        """
+        return run_batch_async(
+            requests,
+            lambda payload: self._post(
+                "/chat/completions", payload, ChatCompletionResponse
+            ),
+            concurrency=concurrency,
+            ordered=ordered,
+            prepare=lambda request: build_payload(request, ChatCompletionRequest),
+        )
+
+    def fim_completion_batch(
+        self,
+        requests: Union[
+            Iterable[Union[Dict[str, Any], FIMCompletionRequest]],
+            AsyncIterable[Union[Dict[str, Any], FIMCompletionRequest]],
+        ],
+        concurrency: int = 8,
+        ordered: bool = True,
+    ) -> AsyncIterator[BatchResult[FIMCompletionResponse]]:
+        """Run many Fill-in-the-Middle completions with bounded concurrency.
+
+        Args:
+            requests: Iterable or async iterable of ``FIMCompletionRequest``
+                objects or dicts of ``fim_completion`` parameters
+            concurrency: Maximum number of requests in flight
+            ordered: Yield results in input order instead of as they complete
+
+        Returns:
+            Async iterator of batch results, one per request
+        """
+        return run_batch_async(
+            requests,
+            lambda payload: self._post(
+                "/fim/completions", payload, FIMCompletionResponse
+            ),
+            concurrency=concurrency,
+            ordered=ordered,
+            prepare=lambda request: build_payload(request, FIMCompletionRequest),
         )
-        
-        return FIMCompletionResponse(**response.json())
\ No newline at end of file
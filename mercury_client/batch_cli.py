@@ -0,0 +1,393 @@
+"""``mercury-batch``: stream a JSONL file of requests through the Mercury API.
+
+Each input line is a JSON object holding the parameters of a chat completion
+(``messages``) or a FIM completion (``prompt``), plus an optional ``id`` and
+``endpoint`` (``"chat"`` or ``"fim"``). Lines in the OpenAI batch format
+(``custom_id``, ``url``, ``body``) are accepted as well.
+
+Results are appended to the output JSONL file as they complete. Progress is
+recorded in a compact checkpoint (a low watermark plus the few completed lines
+above it), so an interrupted run resumes without re-sending finished lines.
+Results are written before the checkpoint is, so a crash may repeat, but never
+lose, a result.
+
+Lines that failed on the API side, such as by rate limiting, server errors or
+timeouts, count as finished too, so the watermark keeps advancing, and are
+queued in a side file next to the checkpoint (``CHECKPOINT.retry``) holding
+their line numbers and byte offsets in the input. The next run sends them
+again before resuming the input, and appends another record for each of them
+to the output; the last record for a line is its result. Invalid lines and
+client errors other than 429 fail the same way every time, so they are not
+queued.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from mercury_client.async_client import AsyncMercuryClient
+from mercury_client.exceptions import MercuryAPIError
+from mercury_client.models.chat import ChatCompletionResponse
+from mercury_client.models.fim import FIMCompletionResponse
+from mercury_client.utils.batch import BatchResult, run_batch_async
+
+
+class _Line:
+    """One input line travelling through the batch."""
+
+    __slots__ = ("number", "offset", "text", "id", "requeued")
+
+    def __init__(
+        self, number: int, offset: int, text: str, requeued: bool = False
+    ) -> None:
+        self.number = number
+        self.offset = offset
+        self.text: Optional[str] = text
+        self.id: Any = None
+        # Sent again from the retry queue of the previous run
+        self.requeued = requeued
+
+
+class Checkpoint:
+    """Set of completed input lines stored as a watermark plus a sparse set.
+
+    Completed lines that should be sent again are queued in an append-only
+    side file, ``PATH.retry``, one ``{"line", "offset"}`` entry each. A run
+    re-sends the entries from ``retry_offset`` to the end of the file as it
+    found it, and moves ``retry_offset`` past them once all have finished.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        watermark: int = 0,
+        done: Optional[Set[int]] = None,
+        retry_offset: int = 0,
+    ) -> None:
+        self.path = path
+        self.watermark = watermark
+        self.done: Set[int] = set(done or ())
+        self.retry_path = f"{path}.retry"
+        try:
+            self._retry_end = os.path.getsize(self.retry_path)
+        except FileNotFoundError:
+            self._retry_end = 0
+        # A crash between emptying the queue and saving leaves a stale offset
+        self.retry_offset = min(retry_offset, self._retry_end)
+        self._requeued: List[Tuple[int, int]] = []
+        self._retries_read = False
+        self._retries_left = 0
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint":
+        """Load a checkpoint, or start a new one if ``path`` does not exist."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(path)
+        return cls(
+            path,
+            data.get("watermark", 0),
+            set(data.get("done", ())),
+            data.get("retry_offset", 0),
+        )
+
+    def __contains__(self, line: int) -> bool:
+        return line < self.watermark or line in self.done
+
+    def mark(self, line: int) -> None:
+        """Record ``line`` as completed."""
+        if line in self:
+            return
+        self.done.add(line)
+        while self.watermark in self.done:
+            self.done.remove(self.watermark)
+            self.watermark += 1
+
+    def requeue(self, line: int, offset: int) -> None:
+        """Record ``line``, found at byte ``offset``, as completed but to retry."""
+        self.mark(line)
+        self._requeued.append((line, offset))
+
+    def retries(self) -> Iterator[Tuple[int, int]]:
+        """Yield the line number and offset of each line queued for a retry."""
+        if self.retry_offset < self._retry_end:
+            with open(self.retry_path, "rb") as f:
+                f.seek(self.retry_offset)
+                while f.tell() < self._retry_end:
+                    entry = json.loads(f.readline())
+                    self._retries_left += 1
+                    yield entry["line"], entry["offset"]
+        self._retries_read = True
+        self._retries_finished()
+
+    def retried(self) -> None:
+        """Record that a line yielded by :meth:`retries` has finished."""
+        self._retries_left -= 1
+        self._retries_finished()
+
+    def _retries_finished(self) -> None:
+        if self._retries_read and not self._retries_left:
+            self.retry_offset = self._retry_end
+
+    def save(self) -> None:
+        """Atomically write the checkpoint to disk, after the retry queue."""
+        if self._requeued:
+            with open(self.retry_path, "ab") as f:
+                for line, offset in self._requeued:
+                    f.write(b'{"line": %d, "offset": %d}\n' % (line, offset))
+                f.flush()
+                os.fsync(f.fileno())
+            self._requeued = []
+        elif self.retry_offset and self.retry_offset == self._retry_size():
+            # Every queued line was sent again; start the queue afresh.
+            os.remove(self.retry_path)
+            self.retry_offset = self._retry_end = 0
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "watermark": self.watermark,
+                    "done": sorted(self.done),
+                    "retry_offset": self.retry_offset,
+                },
+                f,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def _retry_size(self) -> int:
+        try:
+            return os.path.getsize(self.retry_path)
+        except FileNotFoundError:
+            return 0
+
+
+def parse_line(
+    text: str,
+    default_model: Optional[str] = None,
+) -> Tuple[Any, str, Dict[str, Any]]:
+    """Parse one input line into its id, endpoint and request parameters.
+
+    Args:
+        text: JSON text of the line
+        default_model: Model used when the line does not name one
+
+    Returns:
+        Tuple of (id, endpoint, parameters), where endpoint is "chat" or "fim"
+
+    Raises:
+        ValueError: If the line is not a valid request
+    """
+    record = json.loads(text)
+    if not isinstance(record, dict):
+        raise ValueError("Each line must be a JSON object")
+    if "body" in record:
+        params = dict(record["body"])
+        line_id = record.get("custom_id")
+        url = record.get("url", "")
+        endpoint = "fim" if "fim" in url else "chat" if url else ""
+    else:
+        params = dict(record)
+        line_id = params.pop("id", None)
+        endpoint = params.pop("endpoint", "")
+    if not endpoint:
+        endpoint = "fim" if "prompt" in params and "messages" not in params else "chat"
+    if endpoint not in ("chat", "fim"):
+        raise ValueError(f"Unknown endpoint {endpoint!r}")
+    if default_model and "model" not in params:
+        params["model"] = default_model
+    return line_id, endpoint, params
+
+
+def _read_lines(path: str, checkpoint: Checkpoint) -> Iterator[_Line]:
+    with open(path, "rb") as f:
+        for number, offset in checkpoint.retries():
+            f.seek(offset)
+            yield _Line(number, offset, f.readline().decode("utf-8"), requeued=True)
+        f.seek(0)
+        offset = 0
+        for number, data in enumerate(f):
+            start, offset = offset, offset + len(data)
+            if number in checkpoint:
+                continue
+            text = data.decode("utf-8")
+            if not text.strip():
+                checkpoint.mark(number)
+                continue
+            yield _Line(number, start, text)
+
+
+def _prepare(line: _Line, default_model: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+    text, line.text = line.text or "", None
+    line.id, endpoint, params = parse_line(text, default_model)
+    return endpoint, params
+
+
+def _should_retry(result: BatchResult[Any]) -> bool:
+    """Whether a line is sent again when the command is re-run."""
+    error = result.error
+    # Invalid lines fail parsing or request validation again on every run
+    if error is None or isinstance(error, ValueError):
+        return False
+    if isinstance(error, MercuryAPIError) and error.status_code is not None:
+        # So do requests the API rejected, except for rate limiting
+        return not 400 <= error.status_code < 500 or error.status_code == 429
+    return True
+
+
+def _error_record(error: BaseException) -> Dict[str, Any]:
+    record: Dict[str, Any] = {"type": type(error).__name__, "message": str(error)}
+    if isinstance(error, MercuryAPIError) and error.status_code:
+        record["status_code"] = error.status_code
+    return record
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Process the input file and return summary statistics."""
+    checkpoint = Checkpoint.load(args.checkpoint)
+    stats: Dict[str, Any] = {
+        "completed": 0,
+        "failed": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+    }
+    started = time.perf_counter()
+
+    async with AsyncMercuryClient(
+        api_key=args.api_key,
+        base_url=args.base_url,
+        timeout=args.timeout,
+        load_env=True,
+    ) as client:
+
+        async def send(
+            prepared: Tuple[str, Dict[str, Any]],
+        ) -> Union[ChatCompletionResponse, FIMCompletionResponse]:
+            endpoint, params = prepared
+            if endpoint == "fim":
+                return await client.fim_completion(**params)
+            return await client.chat_completion(**params)
+
+        results = run_batch_async(
+            _read_lines(args.input, checkpoint),
+            send,
+            concurrency=args.concurrency,
+            ordered=False,
+            prepare=lambda line: _prepare(line, args.model),
+        )
+        since_save = 0
+        with open(args.output, "a", encoding="utf-8") as out:
+            try:
+                async for result in results:
+                    line = result.request
+                    out.write(_output_line(result, stats))
+                    if _should_retry(result):
+                        checkpoint.requeue(line.number, line.offset)
+                    else:
+                        checkpoint.mark(line.number)
+                    if line.requeued:
+                        checkpoint.retried()
+                    since_save += 1
+                    if since_save >= args.checkpoint_every:
+                        out.flush()
+                        os.fsync(out.fileno())
+                        checkpoint.save()
+                        since_save = 0
+            finally:
+                out.flush()
+                os.fsync(out.fileno())
+                checkpoint.save()
+
+    stats["elapsed"] = time.perf_counter() - started
+    return stats
+
+
+def _output_line(result: BatchResult[Any], stats: Dict[str, Any]) -> str:
+    line = result.request
+    record: Dict[str, Any] = {"line": line.number, "id": line.id}
+    if result.ok:
+        response = result.response
+        assert response is not None
+        record["response"] = response.model_dump(exclude_none=True)
+        if response.usage is not None:
+            stats["prompt_tokens"] += response.usage.prompt_tokens
+            stats["completion_tokens"] += response.usage.completion_tokens
+        stats["completed"] += 1
+    else:
+        assert result.error is not None
+        record["error"] = _error_record(result.error)
+        stats["failed"] += 1
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="mercury-batch",
+        description="Run a JSONL file of chat/FIM requests through the Mercury API.",
+    )
+    parser.add_argument("input", help="Input JSONL file of requests")
+    parser.add_argument("-o", "--output", required=True, help="Output JSONL file")
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file (default: OUTPUT.checkpoint)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=16,
+        help="Maximum number of requests in flight (default: 16)",
+    )
+    parser.add_argument("--model", help="Model for lines that do not set one")
+    parser.add_argument(
+        "--api-key", help="API key (default: MERCURY_API_KEY, also read from .env)"
+    )
+    parser.add_argument(
+        "--base-url", default="https://api.inceptionlabs.ai/v1", help="API base URL"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Request timeout in seconds"
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=100,
+        help="Save the checkpoint after this many results (default: 100)",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the ``mercury-batch`` command."""
+    args = build_parser().parse_args(argv)
+    if args.checkpoint is None:
+        args.checkpoint = f"{args.output}.checkpoint"
+
+    try:
+        stats = asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("Interrupted; progress saved to checkpoint", file=sys.stderr)
+        return 130
+
+    total = stats["completed"] + stats["failed"]
+    elapsed = stats["elapsed"]
+    print(
+        f"Processed {total} requests ({stats['failed']} failed) in {elapsed:.1f}s "
+        f"({total / elapsed if elapsed else 0.0:.1f} req/s); "
+        f"tokens: {stats['prompt_tokens']} prompt, "
+        f"{stats['completion_tokens']} completion",
+        file=sys.stderr,
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,34 @@
 """Synchronous client for Mercury API."""
 
 import os
-from typing import Optional, Dict, Any, Iterator, Union
-from urllib.parse import urljoin
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import httpx
-from dotenv import load_dotenv
 
+from mercury_client.exceptions import (
+    AuthenticationError,
+    EngineOverloadedError,
+    MercuryAPIError,
+    RateLimitError,
+    ServerError,
+)
 from mercury_client.models.chat import (
     ChatCompletionRequest,
     ChatCompletionResponse,
@@ -16,17 +38,37 @@ from mercury_client.models.fim import (
     FIMCompletionRequest,
     FIMCompletionResponse,
 )
-from mercury_client.exceptions import (
-    MercuryAPIError,
-    AuthenticationError,
-    RateLimitError,
-    ServerError,
-    EngineOverloadedError,
+from mercury_client.utils.accumulator import StreamAccumulator
+from mercury_client.utils.balancer import BalancerConfig, EndpointStats, LoadBalancer
+from mercury_client.utils.batch import BatchResult, build_payload, run_batch_sync
+from mercury_client.utils.cache import CacheBackend, cache_key, replay_stream
+from mercury_client.utils.circuit_breaker import CircuitBreaker
+from mercury_client.utils.codec import JSONCodec, default_codec
+from mercury_client.utils.conversation import Conversation
+from mercury_client.utils.keys import request_key
+from mercury_client.utils.pool import (
+    BorrowedTransport,
+    LazyClients,
+    PoolConfig,
+    PoolMonitor,
+    PoolStats,
+)
+from mercury_client.utils.prepared import PreparedChatRequest
+from mercury_client.utils.rate_limit import RateLimiter, estimate_tokens
+from mercury_client.utils.retry import (
+    RetryBudget,
+    RetryConfig,
+    retry_delay,
+    start_deadline,
 )
-from mercury_client.utils.retry import RetryConfig, calculate_delay
+from mercury_client.utils.singleflight import SingleFlight
+from mercury_client.utils.sse import SSEDecoder
+from mercury_client.utils.streaming import StreamConfig, StreamProgress, parse_chunk
+from mercury_client.utils.text_stream import TextStream
 
-# Load environment variables
-load_dotenv()
+ResponseT = TypeVar("ResponseT", ChatCompletionResponse, FIMCompletionResponse)
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 class MercuryClient:
@@ -35,79 +77,195 @@ class MercuryClient:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        base_url: str = "https://api.inceptionlabs.ai/v1",
+        base_url: Union[str, Sequence[str]] = "https://api.inceptionlabs.ai/v1",
         timeout: float = 30.0,
         retry_config: Optional[RetryConfig] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        pool_config: Optional[PoolConfig] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        single_flight: bool = False,
+        cache: Optional[CacheBackend] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        stream_config: Optional[StreamConfig] = None,
+        balancer_config: Optional[BalancerConfig] = None,
+        json_codec: Optional[JSONCodec] = None,
+        max_workers: int = 8,
+        load_env: Union[bool, str] = False,
     ) -> None:
         """Initialize Mercury client.
-        
+
         Args:
             api_key: API key for authentication. If not provided, will look for
                 MERCURY_API_KEY or INCEPTION_API_KEY environment variables.
-            base_url: Base URL for the API
+            base_url: Base URL for the API, or a list of equivalent endpoints
+                to balance requests across
             timeout: Request timeout in seconds
             retry_config: Configuration for retry behavior
-        
+            retry_budget: Cap on retries relative to first attempts across
+                every call on this client; may be shared between clients
+            pool_config: Connection pool limits, keep-alive and HTTP/2 settings
+            transport: Shared transport to send requests through. The client
+                does not close an injected transport, and its own pool limits
+                apply instead of ``pool_config``.
+            single_flight: Coalesce identical concurrent requests into a single
+                HTTP call whose result (or stream) is shared by every caller
+            cache: Response cache for completions. Cached chat completions
+                are also replayed as streams by ``chat_completion_stream``.
+            rate_limiter: Limiter that paces requests before they are sent;
+                may be shared between clients
+            circuit_breaker: Breaker that fails requests fast with
+                ``CircuitOpenError`` while the API is failing; may be shared
+                between clients
+            stream_config: Stall detection and recovery of interrupted
+                streams
+            balancer_config: Routing policy and health checks used when
+                ``base_url`` lists several endpoints
+            json_codec: JSON codec for request bodies, orjson or msgspec when
+                installed by default
+            max_workers: Size of the thread pool used by the batch methods
+            load_env: Load environment variables from a ``.env`` file
+                before reading the API key: True searches the working
+                directory and its parents, or pass the file's path
+
         Raises:
             ValueError: If no API key is provided or found in environment
         """
-        self.api_key = api_key or os.getenv("MERCURY_API_KEY") or os.getenv("INCEPTION_API_KEY")
+        if load_env:
+            from dotenv import find_dotenv, load_dotenv
+
+            load_dotenv(find_dotenv(usecwd=True) if load_env is True else load_env)
+        self.api_key = (
+            api_key or os.getenv("MERCURY_API_KEY") or os.getenv("INCEPTION_API_KEY")
+        )
         if not self.api_key:
             raise ValueError(
                 "API key must be provided or set as MERCURY_API_KEY environment variable"
             )
-        
-        self.base_url = base_url.rstrip("/")
+
+        urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        if not urls:
+            raise ValueError("At least one base URL must be provided")
+        self.base_urls = [url.rstrip("/") for url in urls]
+        self.base_url = self.base_urls[0]
         self.timeout = timeout
         self.retry_config = retry_config or RetryConfig()
-        
-        # Configure httpx client
-        self._client = httpx.Client(
-            base_url=self.base_url,
+        self.retry_budget = retry_budget
+        self.pool_config = pool_config or PoolConfig()
+        self._cache = cache
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.stream_config = stream_config or StreamConfig()
+        self.json_codec = json_codec or default_codec()
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._single_flight = SingleFlight() if single_flight else None
+        if transport is not None:
+            transport = BorrowedTransport(transport)
+        max_connections = self.pool_config.max_connections
+        self._pool_monitor = PoolMonitor(
+            None
+            if transport is not None or max_connections is None
+            else max_connections * len(self.base_urls)
+        )
+
+        # One httpx client, and so one connection pool, per endpoint, each
+        # created on first use
+        self._clients = LazyClients(lambda url: self._create_client(url, transport))
+        self._balancer = (
+            LoadBalancer(self.base_urls, balancer_config)
+            if len(self.base_urls) > 1
+            else None
+        )
+        self._closed = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+        self._health_lock = threading.Lock()
+
+    @property
+    def _client(self) -> httpx.Client:
+        """HTTP client of the first endpoint."""
+        return self._clients[self.base_url]
+
+    def _create_client(
+        self, base_url: str, transport: Optional[httpx.BaseTransport]
+    ) -> httpx.Client:
+        """Create the httpx client for one endpoint."""
+        return httpx.Client(
+            base_url=base_url,
             headers={
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
             },
-            timeout=httpx.Timeout(self.timeout),
+            timeout=self.pool_config.to_timeout(self.timeout),
+            limits=self.pool_config.to_limits(),
+            http2=self.pool_config.http2,
+            transport=transport,
         )
 
-    def __enter__(self):
+    def __enter__(self) -> "MercuryClient":
         """Context manager entry."""
         return self
 
-    def __exit__(self, *args):
+    def __exit__(self, *args: Any) -> None:
         """Context manager exit."""
         self.close()
 
     def close(self) -> None:
-        """Close the HTTP client."""
-        self._client.close()
+        """Close the HTTP clients, the batch thread pool and health checks."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._health_lock:
+            self._closed.set()
+            thread, self._health_thread = self._health_thread, None
+        if thread is not None:
+            thread.join()
+        for client in self._clients.values():
+            client.close()
+
+    def pool_stats(self) -> PoolStats:
+        """Return connection pool occupancy and wait-time statistics.
+
+        Returns:
+            Snapshot of the pool statistics
+        """
+        return self._pool_monitor.stats()
+
+    def endpoint_stats(self) -> List[EndpointStats]:
+        """Return the routing state of each endpoint.
+
+        Returns:
+            One snapshot per endpoint, empty for a single-endpoint client
+        """
+        if self._balancer is None:
+            return []
+        return self._balancer.stats()
 
     def _handle_response_errors(self, response: httpx.Response) -> None:
         """Handle API response errors.
-        
+
         Args:
             response: HTTP response
-            
+
         Raises:
             MercuryAPIError: If response indicates an error
         """
         if response.status_code >= 200 and response.status_code < 300:
             return
-        
+
         try:
             error_data = response.json()
             message = error_data.get("error", {}).get("message", response.text)
         except Exception:
             message = response.text or f"HTTP {response.status_code}"
-        
+
         if response.status_code == 401:
             raise AuthenticationError(message)
         elif response.status_code == 429:
             retry_after = response.headers.get("Retry-After")
             raise RateLimitError(
-                message,
-                retry_after=int(retry_after) if retry_after else None
+                message, retry_after=int(retry_after) if retry_after else None
             )
         elif response.status_code == 500:
             raise ServerError(message)
@@ -117,63 +275,185 @@ class MercuryClient:
             raise MercuryAPIError(
                 message=message,
                 status_code=response.status_code,
-                response_data=error_data if 'error_data' in locals() else None
+                response_data=error_data if "error_data" in locals() else None,
             )
 
     def _request_with_retry(
         self,
         method: str,
         url: str,
-        **kwargs
+        tokens: int = 0,
+        **kwargs: Any,
     ) -> httpx.Response:
         """Make HTTP request with retry logic.
-        
+
         Args:
             method: HTTP method
             url: URL path
+            tokens: Estimated tokens reserved from the rate limiter per attempt
             **kwargs: Additional arguments for httpx request
-            
+
         Returns:
             HTTP response
-            
+
         Raises:
             MercuryAPIError: If request fails after retries
         """
         last_exception = None
-        
+        deadline = start_deadline(self.retry_config)
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+
         for attempt in range(self.retry_config.max_retries + 1):
+            if deadline is not None:
+                # Bound each attempt by the time left for the whole call.
+                kwargs["timeout"] = self.pool_config.to_timeout(
+                    self.timeout, cap=deadline - time.monotonic()
+                )
             try:
-                response = self._client.request(method, url, **kwargs)
-                self._handle_response_errors(response)
-                return response
+                if self.circuit_breaker is None:
+                    return self._attempt(method, url, tokens, **kwargs)
+                with self.circuit_breaker.guard():
+                    return self._attempt(method, url, tokens, **kwargs)
             except tuple(self.retry_config.retry_on) as e:
                 last_exception = e
-                if attempt < self.retry_config.max_retries:
-                    retry_after = getattr(e, 'retry_after', None)
-                    delay = calculate_delay(attempt, self.retry_config, retry_after)
-                    import time
+                delay = retry_delay(attempt, self.retry_config, e, deadline)
+                if delay is not None and (
+                    self.retry_budget is None or self.retry_budget.try_spend()
+                ):
                     time.sleep(delay)
                     continue
                 raise
-            except Exception as e:
+            except Exception:
                 raise
 
-        if last_exception:
-            raise last_exception
+        assert last_exception is not None
+        raise last_exception
+
+    def _attempt(
+        self, method: str, url: str, tokens: int, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a single request attempt and raise on error responses."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(tokens)
+        if self._balancer is None:
+            return self._request(self._client, method, url, **kwargs)
+        self._start_health_checks()
+        with self._balancer.route() as endpoint:
+            return self._request(self._clients[endpoint.url], method, url, **kwargs)
+
+    def _request(
+        self, client: httpx.Client, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """Send one HTTP request through ``client``'s pool."""
+        tracked = self._pool_monitor.track()
+        try:
+            response = client.request(
+                method, url, extensions={"trace": tracked.trace}, **kwargs
+            )
+        finally:
+            tracked.close()
+        self._handle_response_errors(response)
+        return response
+
+    def _start_health_checks(self) -> None:
+        """Start probing ejected endpoints in the background, once."""
+        if self._health_thread is not None:
+            return
+        with self._health_lock:
+            if self._health_thread is not None or self._closed.is_set():
+                return
+            # The thread only holds a weak reference, so that a client which
+            # is never closed can still be collected, ending the thread.
+            self._health_thread = threading.Thread(
+                target=self._health_check_loop,
+                args=(weakref.ref(self), self._balancer, self._closed),
+                name="mercury-health-check",
+                daemon=True,
+            )
+            self._health_thread.start()
+
+    @staticmethod
+    def _health_check_loop(
+        client_ref: "weakref.ReferenceType[MercuryClient]",
+        balancer: LoadBalancer,
+        closed: threading.Event,
+    ) -> None:
+        """Periodically probe ejected endpoints and restore healthy ones."""
+        while not closed.wait(balancer.config.health_check_interval):
+            client = client_ref()
+            if client is None:
+                return
+            for endpoint in balancer.ejected():
+                balancer.probe_result(endpoint, client._probe(endpoint.url))
+            del client
+
+    def _probe(self, url: str) -> bool:
+        """Check whether the endpoint at ``url`` answers."""
+        assert self._balancer is not None
+        try:
+            response = self._clients[url].get(self._balancer.config.health_check_path)
+        except httpx.HTTPError:
+            return False
+        return response.status_code < 500
+
+    def _post(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        response_model: Type[ResponseT],
+        body: Optional[bytes] = None,
+    ) -> ResponseT:
+        """Send a completion request and parse the response.
+
+        Responses are served from and stored in the response cache when one
+        is configured, and identical concurrent requests are coalesced when
+        single-flight is enabled.
+
+        Args:
+            url: URL path
+            payload: JSON request body
+            response_model: Model to parse the response into
+            body: Encoded ``payload``, if already available
+
+        Returns:
+            Parsed response
+        """
+        cache = self._cache
+        if cache is not None:
+            key = cache_key(url, payload)
+            cached = cache.get(key)
+            if cached is not None:
+                return response_model.model_validate_json(cached)
+
+        if body is None:
+            body = self.json_codec.dumps(payload)
+        tokens = estimate_tokens(payload) if self.rate_limiter is not None else 0
+
+        def send() -> ResponseT:
+            response = self._request_with_retry("POST", url, tokens, content=body)
+            result = response_model.model_validate_json(response.content)
+            if cache is not None:
+                cache.set(key, response.content)
+            return result
+
+        if self._single_flight is None:
+            return send()
+        return self._single_flight.do(request_key(url, payload), send)
 
     def chat_completion(
         self,
         messages: list[Union[Dict[str, Any], Message]],
         model: str = "mercury-coder-small",
-        **kwargs
+        **kwargs: Any,
     ) -> ChatCompletionResponse:
         """Create a chat completion.
-        
+
         Args:
             messages: List of messages in the conversation
             model: Model to use for completion
             **kwargs: Additional parameters for the request
-            
+
         Returns:
             Chat completion response
         """
@@ -184,36 +464,33 @@ class MercuryClient:
                 message_objs.append(Message(**msg))
             else:
                 message_objs.append(msg)
-        
-        request = ChatCompletionRequest(
-            model=model,
-            messages=message_objs,
-            **kwargs
-        )
-        
-        response = self._request_with_retry(
-            "POST",
+
+        request = ChatCompletionRequest(model=model, messages=message_objs, **kwargs)
+
+        return self._post(
             "/chat/completions",
-            json=request.model_dump(exclude_none=True)
+            request.model_dump(exclude_none=True),
+            ChatCompletionResponse,
         )
-        
-        return ChatCompletionResponse(**response.json())
 
     def chat_completion_stream(
         self,
         messages: list[Union[Dict[str, Any], Message]],
         model: str = "mercury-coder-small",
-        **kwargs
+        **kwargs: Any,
     ) -> Iterator[ChatCompletionResponse]:
         """Create a streaming chat completion.
-        
+
         Args:
             messages: List of messages in the conversation
             model: Model to use for completion
             **kwargs: Additional parameters for the request
-            
+
         Yields:
-            Chat completion response chunks
+            Chat completion response chunks, or ``FastChunk`` objects with
+            the same attributes if ``stream_config.fast_chunks`` is set. A
+            cached completion is replayed as a short stream without contacting
+            the API, and a completed stream is stored in the cache.
         """
         # Convert dict messages to Message objects
         message_objs = []
@@ -222,63 +499,389 @@ class MercuryClient:
                 message_objs.append(Message(**msg))
             else:
                 message_objs.append(msg)
-        
+
         request = ChatCompletionRequest(
-            model=model,
-            messages=message_objs,
-            stream=True,
-            **kwargs
+            model=model, messages=message_objs, stream=True, **kwargs
         )
-        
-        with self._client.stream(
-            "POST",
-            "/chat/completions",
-            json=request.model_dump(exclude_none=True)
-        ) as response:
-            self._handle_response_errors(response)
-            
-            for line in response.iter_lines():
-                if line.startswith("data: "):
-                    data = line[6:]
-                    if data == "[DONE]":
+        yield from self._chat_stream(request.model_dump(exclude_none=True))
+
+    def chat_completion_prepared(
+        self,
+        template: PreparedChatRequest,
+        messages: Sequence[Union[Dict[str, Any], Message]],
+    ) -> ChatCompletionResponse:
+        """Create a chat completion from a prepared request.
+
+        Only ``messages`` are validated and encoded; the model, parameters
+        and fixed messages of ``template`` were prepared once.
+
+        Args:
+            template: Prepared model, parameters and leading messages
+            messages: Messages appended to those of the template
+
+        Returns:
+            Chat completion response
+        """
+        payload, body = template.render(messages, self.json_codec)
+        return self._post("/chat/completions", payload, ChatCompletionResponse, body)
+
+    def chat_completion_stream_prepared(
+        self,
+        template: PreparedChatRequest,
+        messages: Sequence[Union[Dict[str, Any], Message]],
+    ) -> Iterator[ChatCompletionResponse]:
+        """Create a streaming chat completion from a prepared request.
+
+        Args:
+            template: Prepared model, parameters and leading messages
+            messages: Messages appended to those of the template
+
+        Yields:
+            Chat completion response chunks, as ``chat_completion_stream``
+        """
+        payload, body = template.render(messages, self.json_codec, stream=True)
+        yield from self._chat_stream(payload, body)
+
+    def conversation(
+        self,
+        messages: Iterable[Union[Dict[str, Any], Message]] = (),
+        model: str = "mercury-coder-small",
+        system: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Conversation:
+        """Start a multi-turn conversation.
+
+        Each message is validated and encoded once, when it is added, and
+        replies are added to the history automatically.
+
+        Args:
+            messages: Initial history
+            model: Model to use for completion
+            system: System prompt of every request
+            **kwargs: Additional parameters for every request
+
+        Returns:
+            Conversation sending its requests through this client
+        """
+        return Conversation(
+            self, PreparedChatRequest(model=model, system=system, **kwargs), messages
+        )
+
+    def _chat_stream(
+        self, payload: Dict[str, Any], body: Optional[bytes] = None
+    ) -> Iterator[ChatCompletionResponse]:
+        """Stream a chat request through the cache and single-flight."""
+        cache = self._cache
+        if cache is not None:
+            key = cache_key("/chat/completions", payload)
+            cached = cache.get(key)
+            if cached is not None:
+                yield from replay_stream(
+                    ChatCompletionResponse.model_validate_json(cached),
+                    include_usage=bool(
+                        (payload.get("stream_options") or {}).get("include_usage")
+                    ),
+                )
+                return
+
+        if self._single_flight is None:
+            chunks = self._stream_chat(payload, body)
+        else:
+            chunks = self._single_flight.stream(
+                request_key("/chat/completions", payload),
+                lambda: self._stream_chat(payload, body),
+            )
+        if cache is None:
+            yield from chunks
+            return
+
+        # Store the assembled completion so that the request is cached
+        # whether it was streamed or not. Streams without usage are not
+        # stored, as a cached response must match the one from the API.
+        accumulator = StreamAccumulator(diffusing=bool(payload.get("diffusing")))
+        yield from accumulator.wrap(chunks)
+        if accumulator.complete and accumulator.usage is not None:
+            cache.set(
+                key, accumulator.response().model_dump_json(exclude_none=True).encode()
+            )
+
+    def chat_completion_stream_text(
+        self,
+        messages: list[Union[Dict[str, Any], Message]],
+        model: str = "mercury-coder-small",
+        coalesce_ms: Optional[float] = None,
+        max_chars: Optional[int] = None,
+        **kwargs: Any,
+    ) -> TextStream:
+        """Create a streaming chat completion yielding only its text.
+
+        Usage is requested from the API unless ``stream_options`` is given,
+        and is available with the finish reason once the stream ends::
+
+            stream = client.chat_completion_stream_text(messages, coalesce_ms=50)
+            for text in stream:
+                print(text, end="")
+            print(stream.finish_reason, stream.usage)
+
+        Args:
+            messages: List of messages in the conversation
+            model: Model to use for completion
+            coalesce_ms: Merge deltas for up to this many milliseconds
+            max_chars: Merge deltas until this many characters are buffered
+            **kwargs: Additional parameters for the request
+
+        Returns:
+            Iterator over the content deltas of the first choice
+        """
+        kwargs.setdefault("stream_options", {"include_usage": True})
+        return TextStream(
+            self.chat_completion_stream(messages, model, **kwargs),
+            coalesce_ms=coalesce_ms,
+            max_chars=max_chars,
+        )
+
+    def _stream_chat(
+        self, payload: Dict[str, Any], body: Optional[bytes] = None
+    ) -> Iterator[ChatCompletionResponse]:
+        """Send a streaming chat request and yield the decoded chunks.
+
+        Attempts that fail before yielding anything are retried according to
+        ``retry_config``. Once chunks were yielded, an interrupted stream is
+        restarted with the yielded text skipped if ``stream_config.resume``
+        is set, and ``StreamInterruptedError`` is raised otherwise.
+
+        Args:
+            payload: JSON request body
+            body: Encoded ``payload``, if already available
+
+        Yields:
+            Chat completion response chunks
+        """
+        if body is None:
+            body = self.json_codec.dumps(payload)
+        tokens = estimate_tokens(payload) if self.rate_limiter is not None else 0
+        progress = StreamProgress()
+        deadline = start_deadline(self.retry_config)
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+
+        for attempt in range(self.retry_config.max_retries + 1):
+            timeout = None
+            if deadline is not None:
+                # Bound each attempt by the time left for the whole call.
+                cap = deadline - time.monotonic()
+                timeout = self.stream_config.to_timeout(
+                    self.pool_config.to_timeout(self.timeout, cap=cap), cap=cap
+                )
+            try:
+                for chunk in self._stream_once(body, tokens, timeout):
+                    unseen = progress.advance(chunk)
+                    if unseen is not None:
+                        yield unseen
+                return
+            except tuple(self.retry_config.retry_on) as e:
+                delay = (
+                    retry_delay(attempt, self.retry_config, e, deadline)
+                    if progress.can_retry(self.stream_config, payload)
+                    else None
+                )
+                if delay is None or not (
+                    self.retry_budget is None or self.retry_budget.try_spend()
+                ):
+                    if progress.started:
+                        raise progress.interrupted(e) from e
+                    raise
+                progress.restart()
+                time.sleep(delay)
+
+    def _stream_once(
+        self, body: bytes, tokens: int, timeout: Optional[httpx.Timeout]
+    ) -> Iterator[ChatCompletionResponse]:
+        """Make one streaming attempt through the circuit breaker."""
+        if self.circuit_breaker is None:
+            yield from self._stream_response(body, tokens, timeout)
+        else:
+            with self.circuit_breaker.guard():
+                yield from self._stream_response(body, tokens, timeout)
+
+    def _stream_response(
+        self, body: bytes, tokens: int, timeout: Optional[httpx.Timeout]
+    ) -> Iterator[ChatCompletionResponse]:
+        """Open the chat stream on the endpoint chosen by the balancer."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(tokens)
+        if self._balancer is None:
+            yield from self._read_stream(self._client, body, timeout)
+            return
+        self._start_health_checks()
+        route = self._balancer.route()
+        with route as endpoint:
+            client = self._clients[endpoint.url]
+            for chunk in self._read_stream(client, body, timeout):
+                route.responded()
+                yield chunk
+
+    def _read_stream(
+        self,
+        client: httpx.Client,
+        body: bytes,
+        timeout: Optional[httpx.Timeout],
+    ) -> Iterator[ChatCompletionResponse]:
+        """Open the chat stream and decode its server-sent events."""
+        if timeout is None:
+            timeout = self.stream_config.to_timeout(client.timeout)
+        tracked = self._pool_monitor.track()
+        try:
+            with client.stream(
+                "POST",
+                "/chat/completions",
+                content=body,
+                timeout=timeout,
+                extensions={"trace": tracked.trace},
+            ) as response:
+                if not response.is_success:
+                    response.read()
+                self._handle_response_errors(response)
+
+                decoder = SSEDecoder()
+                for event in decoder.iter_events(response.iter_bytes()):
+                    chunk = parse_chunk(
+                        event, self.stream_config.fast_chunks, self.json_codec.loads
+                    )
+                    if chunk is None:
                         break
-                    
-                    import json
-                    try:
-                        chunk = json.loads(data)
-                        yield ChatCompletionResponse(**chunk)
-                    except json.JSONDecodeError:
-                        continue
+                    # Fast chunks stand in for the model they mirror
+                    yield cast("ChatCompletionResponse", chunk)
+        finally:
+            tracked.close()
 
     def fim_completion(
         self,
         prompt: str,
         suffix: str = "",
         model: str = "mercury-coder-small",
-        **kwargs
+        **kwargs: Any,
     ) -> FIMCompletionResponse:
         """Create a Fill-in-the-Middle completion.
-        
+
         Args:
             prompt: The prefix text before the cursor
             suffix: The suffix text after the cursor
             model: Model to use for completion
             **kwargs: Additional parameters for the request
-            
+
         Returns:
             FIM completion response
         """
         request = FIMCompletionRequest(
-            model=model,
-            prompt=prompt,
-            suffix=suffix,
-            **kwargs
+            model=model, prompt=prompt, suffix=suffix, **kwargs
         )
-        
-        response = self._request_with_retry(
-            "POST",
+
+        return self._post(
             "/fim/completions",
-            json=request.model_dump(exclude_none=True)
+            request.model_dump(exclude_none=True),
+            FIMCompletionResponse,
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the batch thread pool, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="mercury-batch",
+                )
+            return self._executor
+
+    def map(
+        self,
+        func: Callable[[T], R],
+        items: Iterable[T],
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult[R]]:
+        """Apply ``func`` to every item on the client's thread pool.
+
+        All calls share this client's connection pool. Retry backoff sleeps
+        only block the worker thread running that item.
+
+        Args:
+            func: Function to call with each item, typically wrapping one of
+                this client's methods
+            items: Items to process, consumed lazily
+            concurrency: Maximum number of items in flight, defaults to
+                ``max_workers``
+            ordered: Yield results in input order instead of as they complete
+
+        Returns:
+            Iterator of batch results, one per item
+        """
+        return run_batch_sync(
+            items,
+            func,
+            self._get_executor(),
+            concurrency=concurrency or self.max_workers,
+            ordered=ordered,
+        )
+
+    def chat_completion_batch(
+        self,
+        requests: Iterable[Union[Dict[str, Any], ChatCompletionRequest]],
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult[ChatCompletionResponse]]:
+        """Run many chat completions on the client's thread pool.
+
+        Upcoming requests are validated and serialized on the calling thread
+        while earlier ones are in flight. A failing request is reported in
+        its result rather than aborting the batch.
+
+        Args:
+            requests: ``ChatCompletionRequest`` objects or dicts of
+                ``chat_completion`` parameters
+            concurrency: Maximum number of requests in flight, defaults to
+                ``max_workers``
+            ordered: Yield results in input order instead of as they complete
+
+        Returns:
+            Iterator of batch results, one per request
+        """
+        return run_batch_sync(
+            requests,
+            lambda payload: self._post(
+                "/chat/completions", payload, ChatCompletionResponse
+            ),
+            self._get_executor(),
+            concurrency=concurrency or self.max_workers,
+            ordered=ordered,
+            prepare=lambda request: build_payload(request, ChatCompletionRequest),
+        )
+
+    def fim_completion_batch(
+        self,
+        requests: Iterable[Union[Dict[str, Any], FIMCompletionRequest]],
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult[FIMCompletionResponse]]:
+        """Run many Fill-in-the-Middle completions on the client's thread pool.
+
+        Args:
+            requests: ``FIMCompletionRequest`` objects or dicts of
+                ``fim_completion`` parameters
+            concurrency: Maximum number of requests in flight, defaults to
+                ``max_workers``
+            ordered: Yield results in input order instead of as they complete
+
+        Returns:
+            Iterator of batch results, one per request
+        """
+        return run_batch_sync(
+            requests,
+            lambda payload: self._post(
+                "/fim/completions", payload, FIMCompletionResponse
+            ),
+            self._get_executor(),
+            concurrency=concurrency or self.max_workers,
+            ordered=ordered,
+            prepare=lambda request: build_payload(request, FIMCompletionRequest),
         )
-        
-        return FIMCompletionResponse(**response.json())
\ No newline at end of file
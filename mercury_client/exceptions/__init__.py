@@ -1,11 +1,14 @@
 """Mercury API exceptions."""
 
 from mercury_client.exceptions.exceptions import (
-    MercuryAPIError,
     AuthenticationError,
+    CircuitOpenError,
+    EngineOverloadedError,
+    MercuryAPIError,
     RateLimitError,
     ServerError,
-    EngineOverloadedError,
+    StreamDecodeError,
+    StreamInterruptedError,
 )
 
 __all__ = [
@@ -14,4 +17,7 @@ __all__ = [
     "RateLimitError",
     "ServerError",
     "EngineOverloadedError",
-]
\ No newline at end of file
+    "CircuitOpenError",
+    "StreamInterruptedError",
+    "StreamDecodeError",
+]
@@ -1,6 +1,6 @@
 """Exception classes for Mercury API errors."""
 
-from typing import Optional, Dict, Any
+from typing import Any, Dict, Optional
 
 
 class MercuryAPIError(Exception):
@@ -13,7 +13,7 @@ class MercuryAPIError(Exception):
         response_data: Optional[Dict[str, Any]] = None,
     ) -> None:
         """Initialize Mercury API error.
-        
+
         Args:
             message: Error message
             status_code: HTTP status code
@@ -48,7 +48,7 @@ class RateLimitError(MercuryAPIError):
         retry_after: Optional[int] = None,
     ) -> None:
         """Initialize rate limit error.
-        
+
         Args:
             message: Error message
             retry_after: Seconds to wait before retrying
@@ -70,4 +70,62 @@ class EngineOverloadedError(MercuryAPIError):
 
     def __init__(self, message: str = "Engine overloaded") -> None:
         """Initialize engine overloaded error."""
-        super().__init__(message=message, status_code=503)
\ No newline at end of file
+        super().__init__(message=message, status_code=503)
+
+
+class CircuitOpenError(MercuryAPIError):
+    """Raised without sending a request while the circuit breaker is open."""
+
+    def __init__(
+        self,
+        message: str = "Circuit breaker is open",
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """Initialize circuit open error.
+
+        Args:
+            message: Error message
+            retry_after: Seconds until the breaker lets a probe request through
+        """
+        super().__init__(message=message)
+        self.retry_after = retry_after
+
+
+class StreamInterruptedError(MercuryAPIError):
+    """Raised when a stream fails after chunks were yielded to the caller."""
+
+    def __init__(
+        self,
+        message: str = "Stream interrupted",
+        partial_content: str = "",
+        chunks_received: int = 0,
+    ) -> None:
+        """Initialize stream interrupted error.
+
+        Args:
+            message: Error message
+            partial_content: Content of the first choice yielded before the
+                stream failed
+            chunks_received: Number of chunks yielded before the stream failed
+        """
+        super().__init__(message=message)
+        self.partial_content = partial_content
+        self.chunks_received = chunks_received
+
+
+class StreamDecodeError(MercuryAPIError):
+    """Raised when a streamed event cannot be decoded into a chunk."""
+
+    def __init__(
+        self,
+        message: str = "Malformed stream event",
+        data: bytes = b"",
+    ) -> None:
+        """Initialize stream decode error.
+
+        Args:
+            message: Error message
+            data: Raw data of the offending event
+        """
+        super().__init__(message=message)
+        self.data = data
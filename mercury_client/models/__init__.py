@@ -1,22 +1,32 @@
 """Mercury API models."""
 
 from mercury_client.models.chat import (
-    Message,
+    ChatCompletionRequest,
+    ChatCompletionResponse,
+    Choice,
+    Function,
     FunctionDefinition,
+    FunctionDelta,
+    Message,
+    StreamOptions,
     Tool,
-    Function,
     ToolCall,
-    StreamOptions,
-    ChatCompletionRequest,
+    ToolCallDelta,
     Usage,
-    Choice,
-    ChatCompletionResponse,
 )
 from mercury_client.models.fim import (
-    FIMCompletionRequest,
     FIMChoice,
+    FIMCompletionRequest,
     FIMCompletionResponse,
 )
+from mercury_client.models.stream import (
+    FastChoice,
+    FastChunk,
+    FastDelta,
+    FastFunction,
+    FastToolCall,
+    FastUsage,
+)
 
 __all__ = [
     # Chat models
@@ -25,13 +35,22 @@ __all__ = [
     "Tool",
     "Function",
     "ToolCall",
+    "FunctionDelta",
+    "ToolCallDelta",
     "StreamOptions",
     "ChatCompletionRequest",
     "Usage",
     "Choice",
     "ChatCompletionResponse",
+    # Streaming chunk objects
+    "FastChoice",
+    "FastChunk",
+    "FastDelta",
+    "FastFunction",
+    "FastToolCall",
+    "FastUsage",
     # FIM models
     "FIMCompletionRequest",
     "FIMChoice",
     "FIMCompletionResponse",
-]
\ No newline at end of file
+]
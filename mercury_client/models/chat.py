@@ -46,6 +46,28 @@ class ToolCall(BaseModel):
     function: Function
 
 
+class FunctionDelta(BaseModel):
+    """Fragment of a function call in a streamed delta."""
+
+    name: Optional[str] = None
+    arguments: Optional[str] = None
+
+
+class ToolCallDelta(BaseModel):
+    """Fragment of a tool call in a streamed delta.
+
+    Fragments sharing an ``index`` belong to the same tool call; only the
+    first one usually carries its ``id`` and function name.
+    """
+
+    index: int = 0
+    id: Optional[str] = None
+    type: Optional[Literal["function"]] = None
+    function: Optional[FunctionDelta] = None
+
+    model_config = ConfigDict(extra="allow")
+
+
 class StreamOptions(BaseModel):
     """Stream options model."""
     
@@ -83,7 +105,7 @@ class Delta(BaseModel):
     
     role: Optional[Literal["system", "user", "assistant", "tool"]] = None
     content: Optional[str] = None
-    tool_calls: Optional[List["ToolCall"]] = None
+    tool_calls: Optional[List[ToolCallDelta]] = None
     
     model_config = ConfigDict(extra="allow")
 
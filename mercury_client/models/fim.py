@@ -3,6 +3,8 @@
 from typing import Optional, List, Union, Literal, Any
 from pydantic import BaseModel, Field, ConfigDict
 
+from mercury_client.models.chat import Usage
+
 
 class FIMCompletionRequest(BaseModel):
     """FIM completion request model."""
@@ -37,13 +39,6 @@ class FIMCompletionResponse(BaseModel):
     created: int
     model: str
     choices: List[FIMChoice]
-    usage: Optional["Usage"] = None
+    usage: Optional[Usage] = None
     
     model_config = ConfigDict(extra="allow")
-
-
-# Import Usage from chat models to avoid duplication
-from mercury_client.models.chat import Usage
-
-# Update the forward reference
-FIMCompletionResponse.model_rebuild()
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""Lightweight chunk objects for streamed chat completions.
+
+With ``StreamConfig(fast_chunks=True)`` the clients build these instead of
+:class:`~mercury_client.models.chat.ChatCompletionResponse` for every chunk.
+They are plain ``__slots__`` objects constructed from the decoded JSON without
+validation, and expose the same attributes as the Pydantic models
+(``chunk.choices[0].delta.content``). Unknown fields are dropped. Call
+:meth:`FastChunk.validate` to obtain the validated model when needed.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union
+
+from mercury_client.models.chat import ChatCompletionResponse
+
+SlottedT = TypeVar("SlottedT", bound="_Slotted")
+
+
+class _Slotted:
+    """Attribute access, copying and dumping shared by the chunk objects."""
+
+    __slots__: Tuple[str, ...] = ()
+
+    def model_copy(
+        self: SlottedT, *, update: Optional[Dict[str, Any]] = None
+    ) -> SlottedT:
+        """Return a shallow copy with the fields in ``update`` replaced."""
+        copy = object.__new__(type(self))
+        for name in self.__slots__:
+            object.__setattr__(copy, name, getattr(self, name))
+        for name, value in (update or {}).items():
+            object.__setattr__(copy, name, value)
+        return copy
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Return the fields as a dictionary, recursively."""
+        return {name: _dump(getattr(self, name)) for name in self.__slots__}
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+def _dump(value: object) -> object:
+    if isinstance(value, _Slotted):
+        return value.model_dump()
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    return value
+
+
+class FastFunction(_Slotted):
+    """Function name and argument fragment of a streamed tool call."""
+
+    __slots__ = ("name", "arguments")
+
+    def __init__(self, name: Optional[str], arguments: Optional[str]) -> None:
+        self.name = name
+        self.arguments = arguments
+
+
+class FastToolCall(_Slotted):
+    """Tool call fragment of a streamed delta."""
+
+    __slots__ = ("index", "id", "type", "function")
+
+    def __init__(
+        self,
+        index: Optional[int],
+        id: Optional[str],
+        type: Optional[str],
+        function: Optional[FastFunction],
+    ) -> None:
+        self.index = index
+        self.id = id
+        self.type = type
+        self.function = function
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FastToolCall":
+        function = data.get("function")
+        return cls(
+            data.get("index"),
+            data.get("id"),
+            data.get("type"),
+            (
+                FastFunction(function.get("name"), function.get("arguments"))
+                if function is not None
+                else None
+            ),
+        )
+
+
+class FastDelta(_Slotted):
+    """Delta of a streamed choice."""
+
+    __slots__ = ("role", "content", "tool_calls")
+
+    def __init__(
+        self,
+        role: Optional[str] = None,
+        content: Optional[str] = None,
+        tool_calls: Optional[List[FastToolCall]] = None,
+    ) -> None:
+        self.role = role
+        self.content = content
+        self.tool_calls = tool_calls
+
+
+class FastChoice(_Slotted):
+    """Choice of a streamed chunk."""
+
+    __slots__ = ("index", "delta", "finish_reason", "logprobs")
+
+    def __init__(
+        self,
+        index: int,
+        delta: Optional[FastDelta],
+        finish_reason: Optional[str] = None,
+        logprobs: Optional[object] = None,
+    ) -> None:
+        self.index = index
+        self.delta = delta
+        self.finish_reason = finish_reason
+        self.logprobs = logprobs
+
+    @property
+    def message(self) -> None:
+        """Always None; streamed choices carry a delta."""
+        return None
+
+
+class FastUsage(_Slotted):
+    """Token usage reported at the end of a stream."""
+
+    __slots__ = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+    def __init__(
+        self,
+        prompt_tokens: Optional[int],
+        completion_tokens: Optional[int],
+        total_tokens: Optional[int],
+    ) -> None:
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.total_tokens = total_tokens
+
+
+class FastChunk(_Slotted):
+    """Unvalidated chunk of a streamed chat completion."""
+
+    __slots__ = (
+        "id",
+        "object",
+        "created",
+        "model",
+        "choices",
+        "usage",
+        "system_fingerprint",
+    )
+
+    def __init__(
+        self,
+        id: Optional[str],
+        object: str,
+        created: Optional[int],
+        model: Optional[str],
+        choices: List[FastChoice],
+        usage: Optional[FastUsage] = None,
+        system_fingerprint: Optional[str] = None,
+    ) -> None:
+        self.id = id
+        self.object = object
+        self.created = created
+        self.model = model
+        self.choices = choices
+        self.usage = usage
+        self.system_fingerprint = system_fingerprint
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FastChunk":
+        """Build a chunk from decoded JSON without validating it."""
+        choices = []
+        for choice in data.get("choices") or ():
+            delta = choice.get("delta")
+            if delta is not None:
+                tool_calls = delta.get("tool_calls")
+                delta = FastDelta(
+                    delta.get("role"),
+                    delta.get("content"),
+                    (
+                        [FastToolCall.from_dict(call) for call in tool_calls]
+                        if tool_calls is not None
+                        else None
+                    ),
+                )
+            choices.append(
+                FastChoice(
+                    choice.get("index", 0),
+                    delta,
+                    choice.get("finish_reason"),
+                    choice.get("logprobs"),
+                )
+            )
+        usage = data.get("usage")
+        return cls(
+            data.get("id"),
+            data.get("object", "chat.completion.chunk"),
+            data.get("created"),
+            data.get("model"),
+            choices,
+            (
+                FastUsage(
+                    usage.get("prompt_tokens"),
+                    usage.get("completion_tokens"),
+                    usage.get("total_tokens"),
+                )
+                if usage is not None
+                else None
+            ),
+            data.get("system_fingerprint"),
+        )
+
+    def validate(self) -> ChatCompletionResponse:
+        """Validate the chunk into a :class:`ChatCompletionResponse`."""
+        return ChatCompletionResponse.model_validate(self.model_dump())
+
+
+# Chunk of a chat completion stream, validated or not
+StreamChunk = Union[ChatCompletionResponse, FastChunk]
@@ -1,15 +1,228 @@
-"""Mercury client utilities."""
+"""Mercury client utilities.
 
-from mercury_client.utils.retry import (
-    RetryConfig,
-    calculate_delay,
-    retry_sync,
-    retry_async,
-)
+Names are imported from their modules on first access, so importing one
+utility does not import the others.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from mercury_client.utils.accumulator import StreamAccumulator
+    from mercury_client.utils.balancer import (
+        BalancerConfig,
+        EndpointStats,
+        LoadBalancer,
+    )
+    from mercury_client.utils.batch import (
+        BatchResult,
+        build_payload,
+        run_batch_async,
+        run_batch_sync,
+    )
+    from mercury_client.utils.cache import (
+        CacheBackend,
+        CacheStats,
+        ResponseCache,
+        cache_key,
+        replay_stream,
+    )
+    from mercury_client.utils.circuit_breaker import (
+        CircuitBreaker,
+        CircuitBreakerStats,
+        CircuitState,
+    )
+    from mercury_client.utils.codec import (
+        PYDANTIC_CODEC,
+        JSONCodec,
+        default_codec,
+    )
+    from mercury_client.utils.concurrency import (
+        AdaptiveConcurrencyLimiter,
+        ConcurrencyStats,
+    )
+    from mercury_client.utils.conversation import AsyncConversation, Conversation
+    from mercury_client.utils.diffusion import (
+        FrameDiffer,
+        FramePatch,
+        TextEdit,
+        apply_edits,
+    )
+    from mercury_client.utils.disk_cache import SQLiteCache
+    from mercury_client.utils.hedging import HedgingPolicy, HedgingStats
+    from mercury_client.utils.keys import canonical_json, request_key
+    from mercury_client.utils.loop import (
+        LoopBlockReport,
+        LoopConfig,
+        LoopTimer,
+        timed_stream,
+    )
+    from mercury_client.utils.pool import (
+        PoolConfig,
+        PoolMonitor,
+        PoolStats,
+    )
+    from mercury_client.utils.prepared import PreparedChatRequest
+    from mercury_client.utils.rate_limit import (
+        RateLimiter,
+        RateLimitStats,
+        estimate_tokens,
+    )
+    from mercury_client.utils.retry import (
+        RetryBudget,
+        RetryBudgetStats,
+        RetryConfig,
+        calculate_delay,
+        retry_async,
+        retry_delay,
+        retry_sync,
+        start_deadline,
+    )
+    from mercury_client.utils.singleflight import AsyncSingleFlight, SingleFlight
+    from mercury_client.utils.sse import ServerSentEvent, SSEDecoder
+    from mercury_client.utils.streaming import (
+        StreamConfig,
+        StreamProgress,
+        parse_chunk,
+    )
+    from mercury_client.utils.text_stream import AsyncTextStream, TextStream
+
+# Public name -> module defining it, imported on first access
+_LAZY = {
+    "StreamAccumulator": "mercury_client.utils.accumulator",
+    "BalancerConfig": "mercury_client.utils.balancer",
+    "EndpointStats": "mercury_client.utils.balancer",
+    "LoadBalancer": "mercury_client.utils.balancer",
+    "BatchResult": "mercury_client.utils.batch",
+    "build_payload": "mercury_client.utils.batch",
+    "run_batch_async": "mercury_client.utils.batch",
+    "run_batch_sync": "mercury_client.utils.batch",
+    "CacheBackend": "mercury_client.utils.cache",
+    "CacheStats": "mercury_client.utils.cache",
+    "ResponseCache": "mercury_client.utils.cache",
+    "cache_key": "mercury_client.utils.cache",
+    "replay_stream": "mercury_client.utils.cache",
+    "CircuitBreaker": "mercury_client.utils.circuit_breaker",
+    "CircuitBreakerStats": "mercury_client.utils.circuit_breaker",
+    "CircuitState": "mercury_client.utils.circuit_breaker",
+    "PYDANTIC_CODEC": "mercury_client.utils.codec",
+    "JSONCodec": "mercury_client.utils.codec",
+    "default_codec": "mercury_client.utils.codec",
+    "AdaptiveConcurrencyLimiter": "mercury_client.utils.concurrency",
+    "ConcurrencyStats": "mercury_client.utils.concurrency",
+    "AsyncConversation": "mercury_client.utils.conversation",
+    "Conversation": "mercury_client.utils.conversation",
+    "FrameDiffer": "mercury_client.utils.diffusion",
+    "FramePatch": "mercury_client.utils.diffusion",
+    "TextEdit": "mercury_client.utils.diffusion",
+    "apply_edits": "mercury_client.utils.diffusion",
+    "SQLiteCache": "mercury_client.utils.disk_cache",
+    "HedgingPolicy": "mercury_client.utils.hedging",
+    "HedgingStats": "mercury_client.utils.hedging",
+    "canonical_json": "mercury_client.utils.keys",
+    "request_key": "mercury_client.utils.keys",
+    "LoopBlockReport": "mercury_client.utils.loop",
+    "LoopConfig": "mercury_client.utils.loop",
+    "LoopTimer": "mercury_client.utils.loop",
+    "timed_stream": "mercury_client.utils.loop",
+    "PoolConfig": "mercury_client.utils.pool",
+    "PoolMonitor": "mercury_client.utils.pool",
+    "PoolStats": "mercury_client.utils.pool",
+    "PreparedChatRequest": "mercury_client.utils.prepared",
+    "RateLimiter": "mercury_client.utils.rate_limit",
+    "RateLimitStats": "mercury_client.utils.rate_limit",
+    "estimate_tokens": "mercury_client.utils.rate_limit",
+    "RetryBudget": "mercury_client.utils.retry",
+    "RetryBudgetStats": "mercury_client.utils.retry",
+    "RetryConfig": "mercury_client.utils.retry",
+    "calculate_delay": "mercury_client.utils.retry",
+    "retry_delay": "mercury_client.utils.retry",
+    "retry_sync": "mercury_client.utils.retry",
+    "retry_async": "mercury_client.utils.retry",
+    "start_deadline": "mercury_client.utils.retry",
+    "AsyncSingleFlight": "mercury_client.utils.singleflight",
+    "SingleFlight": "mercury_client.utils.singleflight",
+    "ServerSentEvent": "mercury_client.utils.sse",
+    "SSEDecoder": "mercury_client.utils.sse",
+    "StreamConfig": "mercury_client.utils.streaming",
+    "StreamProgress": "mercury_client.utils.streaming",
+    "parse_chunk": "mercury_client.utils.streaming",
+    "AsyncTextStream": "mercury_client.utils.text_stream",
+    "TextStream": "mercury_client.utils.text_stream",
+}
 
 __all__ = [
+    "StreamAccumulator",
+    "BalancerConfig",
+    "EndpointStats",
+    "LoadBalancer",
+    "BatchResult",
+    "build_payload",
+    "run_batch_async",
+    "run_batch_sync",
+    "CacheBackend",
+    "CacheStats",
+    "ResponseCache",
+    "cache_key",
+    "replay_stream",
+    "CircuitBreaker",
+    "CircuitBreakerStats",
+    "CircuitState",
+    "PYDANTIC_CODEC",
+    "JSONCodec",
+    "default_codec",
+    "AdaptiveConcurrencyLimiter",
+    "ConcurrencyStats",
+    "AsyncConversation",
+    "Conversation",
+    "FrameDiffer",
+    "FramePatch",
+    "TextEdit",
+    "apply_edits",
+    "SQLiteCache",
+    "HedgingPolicy",
+    "HedgingStats",
+    "canonical_json",
+    "request_key",
+    "LoopBlockReport",
+    "LoopConfig",
+    "LoopTimer",
+    "timed_stream",
+    "PoolConfig",
+    "PoolMonitor",
+    "PoolStats",
+    "PreparedChatRequest",
+    "RateLimiter",
+    "RateLimitStats",
+    "estimate_tokens",
+    "RetryBudget",
+    "RetryBudgetStats",
     "RetryConfig",
     "calculate_delay",
+    "retry_delay",
+    "start_deadline",
     "retry_sync",
     "retry_async",
-]
\ No newline at end of file
+    "SingleFlight",
+    "AsyncSingleFlight",
+    "ServerSentEvent",
+    "SSEDecoder",
+    "StreamConfig",
+    "StreamProgress",
+    "parse_chunk",
+    "AsyncTextStream",
+    "TextStream",
+]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
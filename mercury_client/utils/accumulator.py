@@ -0,0 +1,209 @@
+"""Assemble streamed chat completion chunks into a complete response.
+
+:class:`StreamAccumulator` collects the chunks of ``chat_completion_stream``
+as they are consumed and builds the equivalent non-streamed
+:class:`~mercury_client.models.chat.ChatCompletionResponse` at the end.
+Content is kept as a list of fragments joined once, so assembling a long
+output costs time linear in its length, and tool call fragments are merged
+by their index.
+"""
+
+from typing import (
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from mercury_client.models.chat import (
+    ChatCompletionResponse,
+    Choice,
+    Function,
+    Message,
+    ToolCall,
+    ToolCallDelta,
+    Usage,
+)
+from mercury_client.models.stream import FastToolCall, StreamChunk
+
+ChunkT = TypeVar("ChunkT", bound=StreamChunk)
+
+
+class _ToolCallParts:
+    """Fragments of one streamed tool call."""
+
+    __slots__ = ("id", "type", "name", "arguments")
+
+    def __init__(self) -> None:
+        self.id: Optional[str] = None
+        self.type: Optional[str] = None
+        self.name: List[str] = []
+        self.arguments: List[str] = []
+
+
+class _ChoiceParts:
+    """Fragments of one streamed choice."""
+
+    __slots__ = ("role", "content", "tool_calls", "finish_reason")
+
+    def __init__(self) -> None:
+        self.role: Optional[str] = None
+        self.content: List[str] = []
+        self.tool_calls: Dict[int, _ToolCallParts] = {}
+        self.finish_reason: Optional[str] = None
+
+
+class StreamAccumulator:
+    """Collect stream chunks and build the final chat completion.
+
+    Example::
+
+        accumulator = StreamAccumulator()
+        for chunk in accumulator.wrap(client.chat_completion_stream(messages)):
+            print(chunk.choices[0].delta.content or "", end="")
+        response = accumulator.response()
+    """
+
+    def __init__(self, diffusing: bool = False) -> None:
+        """Initialize stream accumulator.
+
+        Args:
+            diffusing: The stream was requested with ``diffusing=True``, so
+                each chunk carries the whole current text instead of a delta
+        """
+        self.diffusing = diffusing
+        self.id: Optional[str] = None
+        self.created: Optional[int] = None
+        self.model: Optional[str] = None
+        self.system_fingerprint: Optional[str] = None
+        self.usage: Optional[Usage] = None
+        self.chunks = 0
+        self._choices: Dict[int, _ChoiceParts] = {}
+
+    @property
+    def complete(self) -> bool:
+        """Whether every choice seen so far has a finish reason."""
+        return bool(self._choices) and all(
+            choice.finish_reason is not None for choice in self._choices.values()
+        )
+
+    def add(self, chunk: StreamChunk) -> None:
+        """Add one chunk of the stream.
+
+        Args:
+            chunk: ``ChatCompletionResponse`` or ``FastChunk``
+        """
+        if self.id is None:
+            self.id = chunk.id
+            self.created = chunk.created
+            self.model = chunk.model
+        if chunk.system_fingerprint is not None:
+            self.system_fingerprint = chunk.system_fingerprint
+        if chunk.usage is not None:
+            usage = chunk.usage
+            self.usage = (
+                usage if isinstance(usage, Usage) else Usage(**usage.model_dump())
+            )
+        self.chunks += 1
+        for choice in chunk.choices:
+            parts = self._choices.get(choice.index)
+            if parts is None:
+                parts = self._choices[choice.index] = _ChoiceParts()
+            if choice.finish_reason is not None:
+                parts.finish_reason = choice.finish_reason
+            delta = choice.delta
+            if delta is None:
+                continue
+            if delta.role is not None:
+                parts.role = delta.role
+            if delta.content is not None:
+                if self.diffusing:
+                    parts.content = [delta.content]
+                else:
+                    parts.content.append(delta.content)
+            if delta.tool_calls:
+                tool_calls = cast(
+                    "Sequence[Union[ToolCallDelta, FastToolCall]]", delta.tool_calls
+                )
+                for position, call in enumerate(tool_calls):
+                    self._add_tool_call(parts, call, position)
+
+    def wrap(self, chunks: Iterator[ChunkT]) -> Iterator[ChunkT]:
+        """Yield ``chunks`` unchanged while adding each of them."""
+        for chunk in chunks:
+            self.add(chunk)
+            yield chunk
+
+    async def awrap(self, chunks: AsyncIterator[ChunkT]) -> AsyncIterator[ChunkT]:
+        """Yield async ``chunks`` unchanged while adding each of them."""
+        async for chunk in chunks:
+            self.add(chunk)
+            yield chunk
+
+    def response(self) -> ChatCompletionResponse:
+        """Build the chat completion the chunks added so far amount to.
+
+        Raises:
+            ValueError: If no chunk was added
+        """
+        if self.id is None:
+            raise ValueError("No chunks were added")
+        # Fields copied from unvalidated fast chunks are checked by the models
+        # built below, so their types are not narrowed here.
+        choices = []
+        for index in sorted(self._choices):
+            parts = self._choices[index]
+            tool_calls = [
+                ToolCall(
+                    id=call.id or "",
+                    type="function",
+                    function=Function(
+                        name="".join(call.name), arguments="".join(call.arguments)
+                    ),
+                )
+                for _, call in sorted(parts.tool_calls.items())
+            ]
+            choices.append(
+                Choice(
+                    index=index,
+                    message=Message(
+                        role=parts.role or "assistant",  # type: ignore[arg-type]
+                        content="".join(parts.content),
+                        tool_calls=tool_calls or None,
+                    ),
+                    finish_reason=parts.finish_reason,
+                )
+            )
+        return ChatCompletionResponse(
+            id=self.id,
+            object="chat.completion",
+            created=self.created,  # type: ignore[arg-type]
+            model=self.model,  # type: ignore[arg-type]
+            choices=choices,
+            usage=self.usage,
+            system_fingerprint=self.system_fingerprint,
+        )
+
+    @staticmethod
+    def _add_tool_call(
+        parts: _ChoiceParts, call: Union[ToolCallDelta, FastToolCall], position: int
+    ) -> None:
+        index = call.index if call.index is not None else position
+        merged = parts.tool_calls.get(index)
+        if merged is None:
+            merged = parts.tool_calls[index] = _ToolCallParts()
+        if call.id and merged.id is None:
+            merged.id = call.id
+        if call.type and merged.type is None:
+            merged.type = call.type
+        function = call.function
+        if function is not None:
+            if function.name:
+                merged.name.append(function.name)
+            if function.arguments:
+                merged.arguments.append(function.arguments)
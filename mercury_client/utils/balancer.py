@@ -0,0 +1,239 @@
+"""Client-side load balancing across several API endpoints.
+
+A client created with a list of base URLs keeps one connection pool per
+endpoint and asks a :class:`LoadBalancer` where to send each attempt. The
+balancer routes to the healthy endpoint with the fewest outstanding requests,
+or with the lowest peak-EWMA latency weighted by its load. Endpoints that
+fail repeatedly with 5xx responses or connection errors are ejected until a
+background health probe succeeds.
+"""
+
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from types import TracebackType
+from typing import List, Literal, Optional, Sequence, Type
+
+import httpx
+
+from mercury_client.exceptions import EngineOverloadedError, ServerError
+
+# Errors that count against an endpoint's health.
+ENDPOINT_FAILURES = (ServerError, EngineOverloadedError, httpx.TransportError)
+
+
+@dataclass
+class BalancerConfig:
+    """Configuration for multi-endpoint load balancing."""
+
+    policy: Literal["least_outstanding", "ewma"] = "least_outstanding"
+    # Consecutive failures that eject an endpoint
+    failure_threshold: int = 3
+    # Seconds between health probes of ejected endpoints
+    health_check_interval: float = 5.0
+    # Path probed with GET; any response below 500 counts as healthy
+    health_check_path: str = "/models"
+    # Time constant of the latency EWMA in seconds
+    ewma_decay: float = 10.0
+
+
+@dataclass
+class EndpointStats:
+    """Snapshot of one endpoint's routing state."""
+
+    url: str
+    healthy: bool
+    outstanding: int
+    latency: float
+    requests: int
+    failures: int
+    ejections: int
+
+
+class Endpoint:
+    """Routing state of one endpoint."""
+
+    __slots__ = (
+        "url",
+        "outstanding",
+        "latency",
+        "updated",
+        "consecutive_failures",
+        "healthy",
+        "requests",
+        "failures",
+        "ejections",
+    )
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.outstanding = 0
+        self.latency = 0.0
+        self.updated: Optional[float] = None
+        self.consecutive_failures = 0
+        self.healthy = True
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+
+class LoadBalancer:
+    """Thread-safe endpoint selection shared by every attempt of a client."""
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        config: Optional[BalancerConfig] = None,
+    ) -> None:
+        """Initialize load balancer.
+
+        Args:
+            urls: Base URLs of the endpoints
+            config: Routing and health check configuration
+        """
+        if not urls:
+            raise ValueError("At least one endpoint is required")
+        self.config = config or BalancerConfig()
+        self.endpoints = [Endpoint(url) for url in urls]
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Endpoint:
+        """Choose an endpoint for a request and count it as outstanding.
+
+        Ejected endpoints are skipped unless every endpoint is ejected, in
+        which case the least loaded one is still tried.
+        """
+        with self._lock:
+            candidates = [e for e in self.endpoints if e.healthy] or self.endpoints
+            if self.config.policy == "ewma":
+                scores = [e.latency * (e.outstanding + 1) for e in candidates]
+            else:
+                scores = [float(e.outstanding) for e in candidates]
+            best = min(scores)
+            endpoint = random.choice(
+                [e for e, score in zip(candidates, scores) if score == best]
+            )
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(
+        self,
+        endpoint: Endpoint,
+        latency: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Record the outcome of a request routed by :meth:`acquire`.
+
+        Args:
+            endpoint: Endpoint the request was sent to
+            latency: Seconds the request took
+            error: Exception raised by the request, if any
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if isinstance(error, ENDPOINT_FAILURES):
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if (
+                    endpoint.healthy
+                    and endpoint.consecutive_failures >= self.config.failure_threshold
+                ):
+                    endpoint.healthy = False
+                    endpoint.ejections += 1
+            elif error is None or isinstance(error, Exception):
+                # The endpoint answered, even if with a client error.
+                endpoint.consecutive_failures = 0
+                self._observe(endpoint, latency)
+
+    def route(self) -> "_Route":
+        """Return a context manager routing one request.
+
+        Use as ``with balancer.route() as endpoint: ...``; the outcome is
+        recorded from the exception leaving the block, if any.
+        """
+        return _Route(self)
+
+    def ejected(self) -> List[Endpoint]:
+        """Return the endpoints waiting for a successful health probe."""
+        with self._lock:
+            return [e for e in self.endpoints if not e.healthy]
+
+    def probe_result(self, endpoint: Endpoint, healthy: bool) -> None:
+        """Record the result of a health probe of an ejected endpoint."""
+        if not healthy:
+            return
+        with self._lock:
+            endpoint.healthy = True
+            endpoint.consecutive_failures = 0
+            # Forget latencies from before the ejection, so that the EWMA
+            # policy sends the endpoint traffic to measure it again.
+            endpoint.latency = 0.0
+            endpoint.updated = None
+
+    def stats(self) -> List[EndpointStats]:
+        """Return a snapshot of every endpoint."""
+        with self._lock:
+            return [
+                EndpointStats(
+                    url=e.url,
+                    healthy=e.healthy,
+                    outstanding=e.outstanding,
+                    latency=e.latency,
+                    requests=e.requests,
+                    failures=e.failures,
+                    ejections=e.ejections,
+                )
+                for e in self.endpoints
+            ]
+
+    def _observe(self, endpoint: Endpoint, latency: float) -> None:
+        now = time.monotonic()
+        if endpoint.updated is None or latency > endpoint.latency:
+            # Peak EWMA: jump to slower samples immediately, decay slowly.
+            endpoint.latency = latency
+        else:
+            weight = math.exp(-(now - endpoint.updated) / self.config.ewma_decay)
+            endpoint.latency = endpoint.latency * weight + latency * (1 - weight)
+        endpoint.updated = now
+
+
+class _Route:
+    """Context manager returned by :meth:`LoadBalancer.route`."""
+
+    __slots__ = ("_balancer", "_endpoint", "_latency", "_started")
+
+    def __init__(self, balancer: LoadBalancer) -> None:
+        self._balancer = balancer
+        self._endpoint: Optional[Endpoint] = None
+        self._started = 0.0
+        self._latency: Optional[float] = None
+
+    def __enter__(self) -> Endpoint:
+        self._endpoint = self._balancer.acquire()
+        self._started = time.monotonic()
+        return self._endpoint
+
+    def responded(self) -> None:
+        """Take the latency sample now instead of when the block is left.
+
+        Streams call this on their first chunk, so that the EWMA tracks how
+        fast an endpoint starts answering rather than how long completions
+        are. Later calls are ignored.
+        """
+        if self._latency is None:
+            self._latency = time.monotonic() - self._started
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        assert self._endpoint is not None
+        latency = self._latency
+        if latency is None:
+            latency = time.monotonic() - self._started
+        self._balancer.release(self._endpoint, latency, exc)
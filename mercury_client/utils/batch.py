@@ -0,0 +1,266 @@
+"""Bounded-concurrency batch execution for Mercury API requests."""
+
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()
+
+
+@dataclass
+class BatchResult(Generic[R]):
+    """Outcome of one item of a batch.
+
+    Attributes:
+        index: Position of the item in the input
+        request: The input item as supplied by the caller
+        response: The response, if the item succeeded
+        error: The exception raised while validating or sending the item
+    """
+
+    index: int
+    request: Any
+    response: Optional[R] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item completed successfully."""
+        return self.error is None
+
+
+def build_payload(
+    request: Union[Dict[str, Any], BaseModel],
+    request_model: Type[BaseModel],
+) -> Dict[str, Any]:
+    """Validate a batch item and serialize it to a JSON request body.
+
+    Args:
+        request: Request model instance, or a dict of its fields
+        request_model: Request model class to validate dicts with
+
+    Returns:
+        JSON request body
+
+    Raises:
+        ValueError: If the item asks for a streaming response
+        pydantic.ValidationError: If the item is not a valid request
+    """
+    if not isinstance(request, request_model):
+        request = request_model(**cast("Dict[str, Any]", request))
+    if getattr(request, "stream", False):
+        raise ValueError("Streaming requests cannot be sent in a batch")
+    return request.model_dump(exclude_none=True)
+
+
+def run_batch_sync(
+    items: Iterable[T],
+    worker: Callable[[Any], R],
+    executor: Executor,
+    concurrency: int = 8,
+    ordered: bool = True,
+    prepare: Optional[Callable[[T], Any]] = None,
+) -> Iterator[BatchResult[R]]:
+    """Run ``worker`` over ``items`` on an executor with bounded concurrency.
+
+    Items are consumed lazily and prepared on the calling thread while earlier
+    items run on the executor. At most ``concurrency`` items are submitted at
+    any time, so memory use does not grow with the input size. Exceptions are
+    captured in the item's :class:`BatchResult` instead of aborting the batch.
+
+    Args:
+        items: Iterable of input items
+        worker: Function sending one prepared item
+        executor: Executor to run ``worker`` on
+        concurrency: Maximum number of submitted, unfinished items
+        ordered: Yield results in input order instead of completion order
+        prepare: Function turning an input item into the argument of
+            ``worker``; the item itself is passed when omitted
+
+    Yields:
+        One result per input item
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    def call(index: int, item: T, prepared: object) -> BatchResult[R]:
+        try:
+            return BatchResult(index, item, worker(prepared))
+        except Exception as e:
+            return BatchResult(index, item, error=e)
+
+    # Futures in submission order (ordered) or as an unordered set.
+    queue: deque[Future[BatchResult[R]]] = deque()
+    pending: set[Future[BatchResult[R]]] = set()
+
+    def collect() -> Iterator[BatchResult[R]]:
+        """Yield at least one finished result, blocking until one is ready."""
+        if ordered:
+            yield queue.popleft().result()
+            while queue and queue[0].done():
+                yield queue.popleft().result()
+        else:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                yield future.result()
+
+    def outstanding() -> int:
+        return len(queue) if ordered else len(pending)
+
+    try:
+        for index, item in enumerate(items):
+            try:
+                prepared = prepare(item) if prepare is not None else item
+            except Exception as e:
+                future: Future[BatchResult[R]] = Future()
+                future.set_result(BatchResult(index, item, error=e))
+            else:
+                future = executor.submit(call, index, item, prepared)
+            if ordered:
+                queue.append(future)
+            else:
+                pending.add(future)
+            if outstanding() >= concurrency:
+                yield from collect()
+        while outstanding():
+            yield from collect()
+    finally:
+        for future in list(queue) + list(pending):
+            future.cancel()
+
+
+async def _aiter(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncIterator[T]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def run_batch_async(
+    items: Union[Iterable[T], AsyncIterable[T]],
+    worker: Callable[[Any], Awaitable[R]],
+    concurrency: int = 8,
+    ordered: bool = True,
+    prepare: Optional[Callable[[T], Any]] = None,
+) -> AsyncIterator[BatchResult[R]]:
+    """Run ``worker`` over ``items`` with at most ``concurrency`` calls in flight.
+
+    Items are consumed lazily. A producer task runs ``prepare`` on upcoming
+    items (validation and serialization) while earlier items are in flight,
+    keeping a small read-ahead buffer. Exceptions raised by ``prepare`` or
+    ``worker`` are captured in the item's :class:`BatchResult` instead of
+    aborting the batch.
+
+    Args:
+        items: Iterable or async iterable of input items
+        worker: Coroutine function sending one prepared item
+        concurrency: Maximum number of concurrent ``worker`` calls
+        ordered: Yield results in input order instead of completion order
+        prepare: Function turning an input item into the argument of
+            ``worker``; the item itself is passed when omitted
+
+    Yields:
+        One result per input item
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    pending: asyncio.Queue[Any] = asyncio.Queue(maxsize=concurrency)
+    results: asyncio.Queue[Any] = asyncio.Queue(maxsize=concurrency)
+    # In ordered mode, bound how far completed results may run ahead of the
+    # oldest unfinished item so the reorder buffer stays small.
+    window = asyncio.Semaphore(4 * concurrency) if ordered else None
+
+    async def produce() -> None:
+        index = 0
+        async for item in _aiter(items):
+            if window is not None:
+                await window.acquire()
+            try:
+                prepared = prepare(item) if prepare is not None else item
+                error = None
+            except Exception as e:
+                prepared, error = None, e
+            await pending.put((index, item, prepared, error))
+            index += 1
+        for _ in range(concurrency):
+            await pending.put(_DONE)
+
+    async def work() -> None:
+        while True:
+            entry = await pending.get()
+            if entry is _DONE:
+                return
+            index, item, prepared, error = entry
+            response = None
+            if error is None:
+                try:
+                    response = await worker(prepared)
+                except Exception as e:
+                    error = e
+            await results.put(BatchResult(index, item, response, error))
+
+    tasks = [asyncio.ensure_future(produce())]
+    tasks.extend(asyncio.ensure_future(work()) for _ in range(concurrency))
+
+    async def run() -> None:
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await results.put(_DONE)
+            raise
+        await results.put(_DONE)
+
+    runner = asyncio.ensure_future(run())
+    buffered: Dict[int, BatchResult[R]] = {}
+    next_index = 0
+    try:
+        while True:
+            result = await results.get()
+            if result is _DONE:
+                break
+            if window is None:
+                yield result
+                continue
+            buffered[result.index] = result
+            while next_index in buffered:
+                window.release()
+                yield buffered.pop(next_index)
+                next_index += 1
+        # Surface failures of the input iterable itself.
+        await runner
+    finally:
+        if not runner.done():
+            for task in tasks:
+                task.cancel()
+            runner.cancel()
+            await asyncio.gather(runner, *tasks, return_exceptions=True)
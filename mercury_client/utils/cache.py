@@ -0,0 +1,257 @@
+"""Response caching for deterministic Mercury completions.
+
+Mercury only supports greedy decoding, so a completion is fully determined by
+its request. Responses are cached as the raw JSON bytes returned by the API,
+keyed on the canonicalized request with the streaming flags removed so that
+streamed and non-streamed calls share entries.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from mercury_client.models.chat import (
+    ChatCompletionResponse,
+    Choice,
+    Delta,
+    FunctionDelta,
+    ToolCallDelta,
+)
+from mercury_client.utils.keys import request_key
+
+# Request fields that change how a result is delivered but not what it is.
+_DELIVERY_FIELDS = ("stream", "stream_options")
+
+
+def cache_key(endpoint: str, payload: Dict[str, Any]) -> str:
+    """Compute the cache key of a request.
+
+    Args:
+        endpoint: API path the payload is sent to
+        payload: JSON-compatible request payload
+
+    Returns:
+        Key shared by the streamed and non-streamed form of the request
+    """
+    if any(field in payload for field in _DELIVERY_FIELDS):
+        payload = {k: v for k, v in payload.items() if k not in _DELIVERY_FIELDS}
+    return request_key(endpoint, payload)
+
+
+@dataclass
+class CacheStats:
+    """Snapshot of cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CacheBackend(ABC):
+    """Interface for response cache backends.
+
+    Backends whose operations perform I/O set ``blocking`` to True so that the
+    async client runs them in a worker thread instead of on the event loop.
+    """
+
+    blocking = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value for ``key``, or None on a miss."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``.
+
+        Args:
+            key: Cache key
+            value: Raw response body
+            ttl: Seconds until the entry expires, overriding the default
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove ``key`` from the cache if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+
+
+class ResponseCache(CacheBackend):
+    """Thread-safe in-memory LRU cache with TTL expiry.
+
+    Entries are evicted least-recently-used first whenever the cache holds
+    more than ``max_entries`` entries or more than ``max_bytes`` bytes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Initialize response cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached responses, or None for
+                no byte limit
+            ttl: Default seconds until an entry expires, or None to keep
+                entries until evicted
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (value, expires_at)
+        self._entries: OrderedDict[str, Tuple[bytes, Optional[float]]] = OrderedDict()
+        self._size = 0
+        self._stats = CacheStats()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at)
+            self._size += len(value)
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._size > self.max_bytes)
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                expirations=self._stats.expirations,
+                entries=len(self._entries),
+                size_bytes=self._size,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._size -= len(value)
+
+
+def replay_stream(
+    response: ChatCompletionResponse,
+    include_usage: bool = False,
+) -> List[ChatCompletionResponse]:
+    """Convert a complete chat response into the chunks of an equivalent stream.
+
+    Args:
+        response: Complete (non-streamed) chat completion
+        include_usage: Append a final usage-only chunk, as the API does when
+            ``stream_options.include_usage`` is set
+
+    Returns:
+        Stream chunks carrying each choice's full message as a single delta,
+        followed by a chunk with its finish reason
+    """
+
+    def chunk(choices: List[Choice], **extra: Any) -> ChatCompletionResponse:
+        return ChatCompletionResponse(
+            id=response.id,
+            object="chat.completion.chunk",
+            created=response.created,
+            model=response.model,
+            choices=choices,
+            system_fingerprint=response.system_fingerprint,
+            **extra,
+        )
+
+    chunks = []
+    for choice in response.choices:
+        message = choice.message
+        if message is not None:
+            delta = Delta(
+                role=message.role,
+                content=message.content,
+                tool_calls=(
+                    [
+                        ToolCallDelta(
+                            index=index,
+                            id=call.id,
+                            type=call.type,
+                            function=FunctionDelta(
+                                name=call.function.name,
+                                arguments=call.function.arguments,
+                            ),
+                        )
+                        for index, call in enumerate(message.tool_calls)
+                    ]
+                    if message.tool_calls is not None
+                    else None
+                ),
+            )
+            chunks.append(chunk([Choice(index=choice.index, delta=delta)]))
+        chunks.append(
+            chunk(
+                [
+                    Choice(
+                        index=choice.index,
+                        delta=Delta(),
+                        finish_reason=choice.finish_reason,
+                    )
+                ]
+            )
+        )
+    if include_usage and response.usage is not None:
+        chunks.append(chunk([], usage=response.usage))
+    return chunks
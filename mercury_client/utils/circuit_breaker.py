@@ -0,0 +1,284 @@
+"""Circuit breaker that fails fast while the Mercury API is unavailable.
+
+The breaker watches the outcome of requests over a sliding time window. When
+the share of server-side failures (5xx responses and transport errors)
+crosses a threshold it opens, and requests fail immediately with
+:class:`~mercury_client.exceptions.CircuitOpenError` instead of running the
+full retry cycle. After ``recovery_timeout`` it becomes half-open and admits
+a small but growing number of probe requests; enough successful probes close
+it again, while any failed probe reopens it.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from types import TracebackType
+from typing import Callable, Deque, List, Optional, Tuple, Type
+
+import httpx
+
+from mercury_client.exceptions import (
+    CircuitOpenError,
+    EngineOverloadedError,
+    ServerError,
+)
+
+StateListener = Callable[["CircuitState", "CircuitState"], None]
+
+
+class CircuitState(str, Enum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreakerStats:
+    """Snapshot of circuit breaker state."""
+
+    state: CircuitState
+    requests: int
+    failures: int
+    failure_rate: float
+    rejected: int
+    opened: int
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker shared by sync and async clients."""
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        minimum_requests: int = 10,
+        window: float = 30.0,
+        recovery_timeout: float = 30.0,
+        success_threshold: int = 5,
+        failure_on: Tuple[Type[BaseException], ...] = (
+            ServerError,
+            EngineOverloadedError,
+            httpx.TransportError,
+        ),
+        on_state_change: Optional[StateListener] = None,
+    ) -> None:
+        """Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Failure rate within the window that opens the
+                circuit
+            minimum_requests: Requests required within the window before the
+                failure rate is acted upon
+            window: Length of the sliding window in seconds
+            recovery_timeout: Seconds the circuit stays open before probing
+            success_threshold: Successful probes needed to close the circuit.
+                The number of concurrent probes starts at one and doubles
+                after every success.
+            failure_on: Exception types counted as failures; other errors
+                mean the API is reachable and count as successes
+            on_state_change: Callback invoked with ``(old, new)`` states
+        """
+        self.failure_threshold = failure_threshold
+        self.minimum_requests = minimum_requests
+        self.window = window
+        self.recovery_timeout = recovery_timeout
+        self.success_threshold = success_threshold
+        self.failure_on = failure_on
+        self._listeners: List[StateListener] = []
+        if on_state_change is not None:
+            self._listeners.append(on_state_change)
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        # (timestamp, failed) per completed request within the window
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._rejected = 0
+        self._opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once recovery is due."""
+        with self._lock:
+            changed = self._refresh(time.monotonic())
+            state = self._state
+        self._notify(changed)
+        return state
+
+    def add_listener(self, listener: StateListener) -> None:
+        """Register a callback invoked with ``(old, new)`` on state changes."""
+        self._listeners.append(listener)
+
+    def guard(self) -> "_Call":
+        """Admit one request, or raise if the circuit does not allow it.
+
+        Use as ``with breaker.guard(): ...`` around a single attempt; the
+        outcome is recorded from the exception leaving the block, if any.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with every
+                probe slot taken
+        """
+        with self._lock:
+            now = time.monotonic()
+            changed = self._refresh(now)
+            probe = False
+            if self._state is CircuitState.OPEN:
+                self._rejected += 1
+                retry_after = self._opened_at + self.recovery_timeout - now
+                error: Optional[CircuitOpenError] = CircuitOpenError(
+                    retry_after=max(retry_after, 0.0)
+                )
+            elif self._state is CircuitState.HALF_OPEN:
+                if self._probes >= 2**self._probe_successes:
+                    self._rejected += 1
+                    error = CircuitOpenError(
+                        "Circuit breaker is half-open; probe limit reached"
+                    )
+                else:
+                    self._probes += 1
+                    probe = True
+                    error = None
+            else:
+                error = None
+        self._notify(changed)
+        if error is not None:
+            raise error
+        return _Call(self, probe)
+
+    def record(self, failed: bool, probe: bool = False) -> None:
+        """Record the outcome of a request admitted by :meth:`guard`.
+
+        Args:
+            failed: Whether the request failed in a way that counts against
+                the API's health
+            probe: Whether the request was admitted as a half-open probe
+        """
+        with self._lock:
+            now = time.monotonic()
+            changed = None
+            if probe and self._state is CircuitState.HALF_OPEN:
+                self._probes -= 1
+                if failed:
+                    changed = self._open(now)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.success_threshold:
+                        changed = self._transition(CircuitState.CLOSED)
+                        self._outcomes.clear()
+                        self._failures = 0
+            elif self._state is CircuitState.CLOSED:
+                self._outcomes.append((now, failed))
+                self._failures += failed
+                self._prune(now)
+                total = len(self._outcomes)
+                if (
+                    total >= self.minimum_requests
+                    and self._failures / total >= self.failure_threshold
+                ):
+                    changed = self._open(now)
+        self._notify(changed)
+
+    def release(self, probe: bool) -> None:
+        """Give back a probe slot without recording an outcome."""
+        if not probe:
+            return
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._probes -= 1
+
+    def reset(self) -> None:
+        """Close the circuit and forget recorded outcomes."""
+        with self._lock:
+            changed = self._transition(CircuitState.CLOSED)
+            self._outcomes.clear()
+            self._failures = 0
+        self._notify(changed)
+
+    def stats(self) -> CircuitBreakerStats:
+        """Return a snapshot of the breaker state."""
+        with self._lock:
+            now = time.monotonic()
+            changed = self._refresh(now)
+            self._prune(now)
+            total = len(self._outcomes)
+            stats = CircuitBreakerStats(
+                state=self._state,
+                requests=total,
+                failures=self._failures,
+                failure_rate=self._failures / total if total else 0.0,
+                rejected=self._rejected,
+                opened=self._opened,
+            )
+        self._notify(changed)
+        return stats
+
+    # The helpers below run with the lock held and return the transition to
+    # report once it is released, so listeners may call back into the breaker.
+
+    def _refresh(self, now: float) -> Optional[Tuple[CircuitState, CircuitState]]:
+        if (
+            self._state is CircuitState.OPEN
+            and now - self._opened_at >= self.recovery_timeout
+        ):
+            self._probes = 0
+            self._probe_successes = 0
+            return self._transition(CircuitState.HALF_OPEN)
+        return None
+
+    def _open(self, now: float) -> Optional[Tuple[CircuitState, CircuitState]]:
+        self._opened_at = now
+        self._opened += 1
+        return self._transition(CircuitState.OPEN)
+
+    def _transition(
+        self, state: CircuitState
+    ) -> Optional[Tuple[CircuitState, CircuitState]]:
+        old, self._state = self._state, state
+        return (old, state) if old is not state else None
+
+    def _prune(self, now: float) -> None:
+        horizon = now - self.window
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            _, failed = self._outcomes.popleft()
+            self._failures -= failed
+
+    def _notify(self, changed: Optional[Tuple[CircuitState, CircuitState]]) -> None:
+        if changed is not None:
+            for listener in list(self._listeners):
+                listener(*changed)
+
+
+class _Call:
+    """Context manager returned by :meth:`CircuitBreaker.guard`."""
+
+    __slots__ = ("_breaker", "_probe")
+
+    def __init__(self, breaker: CircuitBreaker, probe: bool) -> None:
+        self._breaker = breaker
+        self._probe = probe
+
+    def __enter__(self) -> "_Call":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self._breaker.record(False, self._probe)
+        elif issubclass(exc_type, self._breaker.failure_on):
+            self._breaker.record(True, self._probe)
+        elif issubclass(exc_type, Exception):
+            # The API answered (e.g. 4xx), so it is up.
+            self._breaker.record(False, self._probe)
+        else:
+            # Cancellation or interpreter exit says nothing about the API.
+            self._breaker.release(self._probe)
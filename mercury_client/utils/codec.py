@@ -0,0 +1,76 @@
+"""JSON codecs used for request bodies and streamed chunks.
+
+Request payloads are encoded straight to bytes once per call instead of
+through httpx's ``json=`` argument, which runs the standard library encoder.
+The default codec is orjson or msgspec when installed (``pip install
+mercury-api-client[fast]``) and otherwise pydantic-core's Rust encoder, which
+is always available.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable
+
+import pydantic_core
+
+
+@dataclass(frozen=True)
+class JSONCodec:
+    """Pair of functions encoding to and decoding from JSON bytes.
+
+    Whatever the backend, ``loads`` raises :class:`ValueError` for malformed
+    JSON, so callers handle decode errors the same way for every codec.
+    Custom codecs must follow the same contract.
+    """
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+PYDANTIC_CODEC = JSONCodec("pydantic", pydantic_core.to_json, pydantic_core.from_json)
+
+
+def orjson_codec() -> JSONCodec:
+    """Return the orjson codec.
+
+    Raises:
+        ImportError: If orjson is not installed
+    """
+    import orjson
+
+    return JSONCodec("orjson", orjson.dumps, orjson.loads)
+
+
+def msgspec_codec() -> JSONCodec:
+    """Return the msgspec codec.
+
+    Raises:
+        ImportError: If msgspec is not installed
+    """
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+    if issubclass(msgspec.DecodeError, ValueError):
+        return JSONCodec("msgspec", encoder.encode, decoder.decode)
+
+    # Older msgspec releases raise errors outside the ValueError hierarchy
+    def loads(data: bytes) -> object:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return JSONCodec("msgspec", encoder.encode, loads)
+
+
+@lru_cache(maxsize=None)
+def default_codec() -> JSONCodec:
+    """Return the fastest installed codec."""
+    for factory in (orjson_codec, msgspec_codec):
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return PYDANTIC_CODEC
@@ -0,0 +1,218 @@
+"""Adaptive concurrency control for the async client.
+
+:class:`AdaptiveConcurrencyLimiter` bounds the number of in-flight requests
+with a limit that follows an additive-increase/multiplicative-decrease (AIMD)
+rule: the limit grows by about one per round trip while requests succeed and
+is cut by a constant factor when the API answers with ``RateLimitError`` or
+``EngineOverloadedError``. Clients sharing one limiter therefore back off
+together instead of each retrying on its own schedule.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Deque, Optional, Tuple, Type
+
+from mercury_client.exceptions import EngineOverloadedError, RateLimitError
+
+# Errors that signal the API is saturated and the limit should shrink.
+OVERLOAD_ERRORS: Tuple[Type[BaseException], ...] = (
+    RateLimitError,
+    EngineOverloadedError,
+)
+
+
+@dataclass
+class ConcurrencyStats:
+    """Snapshot of adaptive concurrency limiter state."""
+
+    limit: int
+    in_flight: int
+    waiting: int
+    peak_in_flight: int
+    successes: int
+    overloads: int
+    decreases: int
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limiter shared by coroutines on one event loop.
+
+    Waiters are admitted first-come, first-served. The limit only grows while
+    it is actually in use, so an idle client does not accumulate a limit it
+    has never proven safe, and it shrinks at most once per ``cooldown`` so a
+    burst of errors from the same overload counts as a single signal.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        cooldown: float = 1.0,
+        latency_target: Optional[float] = None,
+    ) -> None:
+        """Initialize adaptive concurrency limiter.
+
+        Args:
+            initial_limit: Starting number of concurrent requests
+            min_limit: Lower bound of the limit
+            max_limit: Upper bound of the limit
+            increase: Amount the limit grows per round trip of successes
+            backoff: Factor the limit is multiplied by on overload
+            cooldown: Minimum seconds between two decreases
+            latency_target: Treat successful requests slower than this many
+                seconds as an overload signal, or None to ignore latency.
+                Streams are measured to their first chunk.
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.latency_target = latency_target
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+        self._last_decrease = float("-inf")
+        self._stats = ConcurrencyStats(initial_limit, 0, 0, 0, 0, 0, 0)
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and take it."""
+        if self._in_flight < self.limit and not self._waiters:
+            self._take()
+            return
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just before cancellation.
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Return a slot taken by :meth:`acquire` without recording an outcome."""
+        self._in_flight -= 1
+        self._wake()
+
+    def on_success(self, latency: float) -> None:
+        """Record a successful request and grow the limit if it was in use.
+
+        Args:
+            latency: Seconds the request took
+        """
+        self._stats.successes += 1
+        if self.latency_target is not None and latency > self.latency_target:
+            self._decrease()
+        elif self._in_flight >= self.limit - 1:
+            # Growing by increase/limit per success adds ``increase`` per
+            # round trip of a fully used window.
+            self._limit = min(
+                float(self.max_limit), self._limit + self.increase / self._limit
+            )
+            self._wake()
+
+    def on_overload(self) -> None:
+        """Record an overload response and shrink the limit."""
+        self._stats.overloads += 1
+        self._decrease()
+
+    def slot(self) -> "_Slot":
+        """Return an async context manager holding one slot.
+
+        Leaving the block records the outcome: a clean exit counts as a
+        success, an overload error shrinks the limit and any other error only
+        frees the slot.
+        """
+        return _Slot(self)
+
+    def stats(self) -> ConcurrencyStats:
+        """Return a snapshot of the limiter state."""
+        return ConcurrencyStats(
+            limit=self.limit,
+            in_flight=self._in_flight,
+            waiting=len(self._waiters),
+            peak_in_flight=self._stats.peak_in_flight,
+            successes=self._stats.successes,
+            overloads=self._stats.overloads,
+            decreases=self._stats.decreases,
+        )
+
+    def _take(self) -> None:
+        self._in_flight += 1
+        if self._in_flight > self._stats.peak_in_flight:
+            self._stats.peak_in_flight = self._in_flight
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * self.backoff)
+        self._stats.decreases += 1
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take()
+                waiter.set_result(None)
+
+
+class _Slot:
+    """Async context manager returned by :meth:`AdaptiveConcurrencyLimiter.slot`."""
+
+    __slots__ = ("_latency", "_limiter", "_started")
+
+    def __init__(self, limiter: AdaptiveConcurrencyLimiter) -> None:
+        self._limiter = limiter
+        self._started = 0.0
+        self._latency: Optional[float] = None
+
+    async def __aenter__(self) -> "_Slot":
+        await self._limiter.acquire()
+        self._started = time.monotonic()
+        return self
+
+    def responded(self) -> None:
+        """Take the latency sample now instead of when the block is left.
+
+        Streams call this on their first chunk, so that ``latency_target``
+        is compared with the time to first chunk rather than the length of
+        the stream. Later calls are ignored.
+        """
+        if self._latency is None:
+            self._latency = time.monotonic() - self._started
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        limiter = self._limiter
+        if exc_type is None:
+            latency = self._latency
+            if latency is None:
+                latency = time.monotonic() - self._started
+            limiter.on_success(latency)
+        elif issubclass(exc_type, OVERLOAD_ERRORS):
+            limiter.on_overload()
+        limiter.release()
@@ -0,0 +1,242 @@
+"""Multi-turn conversations with incrementally encoded history.
+
+Sending a growing ``messages`` list to ``chat_completion`` revalidates and
+re-encodes the whole history on every turn. A :class:`Conversation` validates
+and encodes each message once, when it is added, and builds every request
+body by joining the cached fragments behind the encoded fixed parts of a
+:class:`~mercury_client.utils.prepared.PreparedChatRequest`. Replies are added
+to the history automatically.
+
+The history is a linked list of immutable turns, so :meth:`fork` is constant
+time and branches share every turn before the point where they diverge.
+"""
+
+import copy
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from mercury_client.models.chat import ChatCompletionResponse
+from mercury_client.utils.accumulator import StreamAccumulator
+from mercury_client.utils.prepared import (
+    MessageLike,
+    PreparedChatRequest,
+    dump_message,
+)
+
+if TYPE_CHECKING:
+    from mercury_client.async_client import AsyncMercuryClient
+    from mercury_client.client import MercuryClient
+
+ConversationT = TypeVar("ConversationT", bound="_ConversationState")
+
+
+class _Turn:
+    """Immutable message of a history, shared by the forks containing it."""
+
+    __slots__ = ("parent", "message", "fragment", "length")
+
+    def __init__(
+        self, parent: Optional["_Turn"], message: Dict[str, Any], fragment: bytes
+    ) -> None:
+        self.parent = parent
+        self.message = message
+        self.fragment = fragment
+        self.length: int = 1 if parent is None else parent.length + 1
+
+
+class _ConversationState:
+    """History handling shared by the sync and async conversations."""
+
+    def __init__(
+        self,
+        client: Union["MercuryClient", "AsyncMercuryClient"],
+        template: Optional[PreparedChatRequest] = None,
+        messages: Iterable[MessageLike] = (),
+    ) -> None:
+        """Initialize conversation.
+
+        Args:
+            client: Client sending the requests
+            template: Model, parameters and leading messages of every request
+            messages: Initial history
+        """
+        self._client = client
+        self._codec = client.json_codec
+        self.template = template or PreparedChatRequest()
+        self.last_response: Optional[ChatCompletionResponse] = None
+        self._head: Optional[_Turn] = None
+        for message in messages:
+            self.append(message)
+
+    def __len__(self) -> int:
+        return 0 if self._head is None else self._head.length
+
+    @property
+    def messages(self) -> List[Dict[str, Any]]:
+        """History after the template's messages, oldest first."""
+        return [turn.message for turn in self._turns(self._head)]
+
+    def append(self, message: Union[str, MessageLike]) -> None:
+        """Add a message to the history without sending it.
+
+        Args:
+            message: Message, or the content of a user message
+        """
+        self._head = self._push(self._head, message)
+
+    def fork(self: ConversationT) -> ConversationT:
+        """Branch the conversation.
+
+        The fork shares the current history with this conversation; messages
+        added to either afterwards are not seen by the other.
+        """
+        return copy.copy(self)
+
+    def _push(self, head: Optional[_Turn], message: Union[str, MessageLike]) -> _Turn:
+        if isinstance(message, str):
+            message = {"role": "user", "content": message}
+        dumped = dump_message(message)
+        return _Turn(head, dumped, self._codec.dumps(dumped))
+
+    @staticmethod
+    def _turns(head: Optional[_Turn]) -> List[_Turn]:
+        turns = []
+        while head is not None:
+            turns.append(head)
+            head = head.parent
+        turns.reverse()
+        return turns
+
+    def _render(
+        self, message: Optional[Union[str, MessageLike]], stream: bool
+    ) -> Tuple[Optional[_Turn], Dict[str, Any], bytes]:
+        """Build the next request; the history is updated once it succeeds."""
+        head = self._head if message is None else self._push(self._head, message)
+        turns = self._turns(head)
+        payload, body = self.template.splice(
+            [turn.message for turn in turns],
+            [turn.fragment for turn in turns],
+            self._codec,
+            stream,
+        )
+        return head, payload, body
+
+    def _commit(self, head: Optional[_Turn], response: ChatCompletionResponse) -> None:
+        for choice in response.choices:
+            if choice.index == 0 and choice.message is not None:
+                head = self._push(head, choice.message)
+        self._head = head
+        self.last_response = response
+
+
+class Conversation(_ConversationState):
+    """Multi-turn chat on a :class:`~mercury_client.MercuryClient`.
+
+    Example::
+
+        chat = client.conversation(system="You are a helpful assistant.")
+        print(chat.send("Write a haiku about diffusion.").choices[0].message)
+        for chunk in chat.stream("Now one about autoregression."):
+            print(chunk.choices[0].delta.content or "", end="")
+        alternative = chat.fork()
+
+    A turn that fails leaves the history unchanged. Conversations are not
+    thread-safe; fork one per thread instead.
+    """
+
+    _client: "MercuryClient"
+
+    def send(
+        self, message: Optional[Union[str, MessageLike]] = None
+    ) -> ChatCompletionResponse:
+        """Send the history, optionally adding a message, and add the reply.
+
+        Args:
+            message: Message, or the content of a user message, to add first
+
+        Returns:
+            Chat completion response
+        """
+        head, payload, body = self._render(message, stream=False)
+        response = self._client._post(
+            "/chat/completions", payload, ChatCompletionResponse, body
+        )
+        self._commit(head, response)
+        return response
+
+    def stream(
+        self, message: Optional[Union[str, MessageLike]] = None
+    ) -> Iterator[ChatCompletionResponse]:
+        """Stream the reply to the history, optionally adding a message first.
+
+        The assembled reply is added to the history, and available as
+        ``last_response``, once the stream completes.
+
+        Args:
+            message: Message, or the content of a user message, to add first
+
+        Yields:
+            Chat completion response chunks
+        """
+        head, payload, body = self._render(message, stream=True)
+        accumulator = StreamAccumulator(diffusing=bool(payload.get("diffusing")))
+        yield from accumulator.wrap(self._client._chat_stream(payload, body))
+        if accumulator.complete:
+            self._commit(head, accumulator.response())
+
+
+class AsyncConversation(_ConversationState):
+    """Multi-turn chat on an :class:`~mercury_client.AsyncMercuryClient`.
+
+    See :class:`Conversation`. Concurrent turns on one conversation race for
+    the history; fork one per task instead.
+    """
+
+    _client: "AsyncMercuryClient"
+
+    async def send(
+        self, message: Optional[Union[str, MessageLike]] = None
+    ) -> ChatCompletionResponse:
+        """Send the history, optionally adding a message, and add the reply.
+
+        Args:
+            message: Message, or the content of a user message, to add first
+
+        Returns:
+            Chat completion response
+        """
+        head, payload, body = self._render(message, stream=False)
+        response = await self._client._post(
+            "/chat/completions", payload, ChatCompletionResponse, body
+        )
+        self._commit(head, response)
+        return response
+
+    async def stream(
+        self, message: Optional[Union[str, MessageLike]] = None
+    ) -> AsyncIterator[ChatCompletionResponse]:
+        """Stream the reply to the history, optionally adding a message first.
+
+        Args:
+            message: Message, or the content of a user message, to add first
+
+        Yields:
+            Chat completion response chunks
+        """
+        head, payload, body = self._render(message, stream=True)
+        accumulator = StreamAccumulator(diffusing=bool(payload.get("diffusing")))
+        async for chunk in accumulator.awrap(self._client._chat_stream(payload, body)):
+            yield chunk
+        if accumulator.complete:
+            self._commit(head, accumulator.response())
@@ -0,0 +1,205 @@
+"""Incremental rendering of ``diffusing=True`` streams.
+
+A diffusing stream sends successive refinements of the whole output rather
+than appended deltas. :class:`FrameDiffer` turns each frame into the few
+:class:`TextEdit` operations that transform the previous frame into it, so
+that editors and terminals can update only what changed.
+
+Successive frames are mostly identical, so the differ first strips the
+common prefix and suffix, comparing slices in C rather than characters in
+Python. A changed region spanning several lines is compared line by line,
+pairwise when the line count is unchanged and with :mod:`difflib`
+otherwise, and every replaced block is trimmed again to its changed
+characters.
+"""
+
+import difflib
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
+
+if TYPE_CHECKING:
+    from mercury_client.models.stream import StreamChunk
+
+
+@dataclass
+class TextEdit:
+    """Replace ``text[start:end]`` with ``text``.
+
+    Edits of one frame are ordered, and the positions of each edit refer to
+    the text produced by applying the edits before it.
+    """
+
+    start: int
+    end: int
+    text: str
+
+
+@dataclass
+class FramePatch:
+    """Edits turning the previous frame of a diffusing stream into the next."""
+
+    index: int
+    edits: List[TextEdit]
+    text: str
+    finish_reason: Optional[str] = None
+
+
+def apply_edits(text: str, edits: Sequence[TextEdit]) -> str:
+    """Apply ``edits`` to ``text`` in order."""
+    for edit in edits:
+        text = text[: edit.start] + edit.text + text[edit.end :]
+    return text
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    if a[:n] == b[:n]:
+        return n
+    # Invariant: a[:lo] == b[:lo] and a[:hi] != b[:hi]; each step compares
+    # only the slice between them, so the total work is linear.
+    lo, hi = 0, n
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    la, lb = len(a), len(b)
+    if a[la - limit :] == b[lb - limit :]:
+        return limit
+    lo, hi = 0, limit
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if a[la - mid : la - lo] == b[lb - mid : lb - lo]:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def _trimmed(old: str, new: str, start: int) -> Optional[TextEdit]:
+    """Edit replacing ``old`` at ``start`` by ``new``, minus shared ends."""
+    if old == new:
+        return None
+    prefix = _common_prefix(old, new)
+    suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+    return TextEdit(
+        start + prefix, start + len(old) - suffix, new[prefix : len(new) - suffix]
+    )
+
+
+class FrameDiffer:
+    """Compute the edits between successive frames of a diffusing stream."""
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.frames = 0
+
+    def update(self, text: str) -> List[TextEdit]:
+        """Move to the next frame.
+
+        Args:
+            text: Full text of the new frame
+
+        Returns:
+            Edits transforming the previous frame into ``text``
+        """
+        old, self.text = self.text, text
+        self.frames += 1
+        if old == text:
+            return []
+        prefix = _common_prefix(old, text)
+        suffix = _common_suffix(old, text, min(len(old), len(text)) - prefix)
+        old_mid = old[prefix : len(old) - suffix]
+        new_mid = text[prefix : len(text) - suffix]
+        if "\n" not in old_mid or "\n" not in new_mid:
+            return [TextEdit(prefix, prefix + len(old_mid), new_mid)]
+        return self._diff_lines(old_mid, new_mid, prefix)
+
+    def wrap(self, chunks: Iterator[Any]) -> Iterator[FramePatch]:
+        """Turn the chunks of a diffusing stream into frame patches.
+
+        Args:
+            chunks: Chunks of ``chat_completion_stream(..., diffusing=True)``
+
+        Yields:
+            One patch per frame of the first choice
+        """
+        for chunk in chunks:
+            patch = self._patch(chunk)
+            if patch is not None:
+                yield patch
+
+    async def awrap(self, chunks: AsyncIterator[Any]) -> AsyncIterator[FramePatch]:
+        """Turn the chunks of an async diffusing stream into frame patches."""
+        async for chunk in chunks:
+            patch = self._patch(chunk)
+            if patch is not None:
+                yield patch
+
+    def _patch(self, chunk: "StreamChunk") -> Optional[FramePatch]:
+        for choice in chunk.choices:
+            if choice.index != 0:
+                continue
+            delta = choice.delta
+            text = delta.content if delta is not None else None
+            if text is None and choice.finish_reason is None:
+                return None
+            edits = self.update(text) if text is not None else []
+            return FramePatch(self.frames, edits, self.text, choice.finish_reason)
+        return None
+
+    @staticmethod
+    def _diff_lines(old: str, new: str, start: int) -> List[TextEdit]:
+        old_lines = old.splitlines(keepends=True)
+        new_lines = new.splitlines(keepends=True)
+        if len(old_lines) == len(new_lines):
+            return FrameDiffer._diff_aligned(old_lines, new_lines, start)
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        edits: List[TextEdit] = []
+        # Offsets in the old text and shift caused by the edits so far
+        position = start
+        shift = 0
+        old_index = 0
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            while old_index < i1:
+                position += len(old_lines[old_index])
+                old_index += 1
+            if tag == "equal":
+                continue
+            removed = "".join(old_lines[i1:i2])
+            edit = _trimmed(removed, "".join(new_lines[j1:j2]), position + shift)
+            if edit is not None:
+                edits.append(edit)
+                shift += len(edit.text) - (edit.end - edit.start)
+        return edits
+
+    @staticmethod
+    def _diff_aligned(
+        old_lines: List[str], new_lines: List[str], start: int
+    ) -> List[TextEdit]:
+        # Refinements usually rewrite tokens within lines, keeping the line
+        # count; comparing lines pairwise is then linear and avoids difflib.
+        edits: List[TextEdit] = []
+        position = start
+        for old_line, new_line in zip(old_lines, new_lines):
+            if old_line != new_line:
+                edit = _trimmed(old_line, new_line, position)
+                assert edit is not None
+                edits.append(edit)
+                position += len(new_line)
+            else:
+                position += len(old_line)
+        return edits
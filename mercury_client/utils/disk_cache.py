@@ -0,0 +1,311 @@
+"""Persistent SQLite-backed response cache shared across processes."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Union
+
+from mercury_client.utils.cache import CacheBackend, CacheStats
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    total_size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (id, total_size) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE meta SET total_size = total_size + new.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE meta SET total_size = total_size - old.size + new.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE meta SET total_size = total_size - old.size WHERE id = 0;
+END;
+"""
+
+_UPSERT = """
+INSERT INTO entries (key, value, size, created_at, accessed_at, expires_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    value = excluded.value,
+    size = excluded.size,
+    created_at = excluded.created_at,
+    accessed_at = excluded.accessed_at,
+    expires_at = excluded.expires_at
+"""
+
+
+class SQLiteCache(CacheBackend):
+    """Durable response cache stored in a SQLite database in WAL mode.
+
+    Any number of threads and processes may share one database file: each
+    thread uses its own connection, and writers are serialized by SQLite's
+    locking with a busy timeout. When the stored responses exceed
+    ``max_bytes`` the least recently used entries are deleted until the cache
+    is back under ``compact_ratio * max_bytes``.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        max_bytes: Optional[int] = 1024 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        compact_ratio: float = 0.9,
+        touch_interval: float = 60.0,
+        busy_timeout: float = 30.0,
+    ) -> None:
+        """Initialize SQLite cache, creating the database if needed.
+
+        Args:
+            path: Database file path
+            max_bytes: Maximum total size of cached responses, or None for
+                no limit
+            ttl: Default seconds until an entry expires, or None to keep
+                entries until evicted
+            compact_ratio: Fraction of ``max_bytes`` to shrink to when the
+                size limit is exceeded
+            touch_interval: Minimum seconds between access-time updates of an
+                entry, which bounds write traffic caused by reads
+            busy_timeout: Seconds to wait for another process's write lock
+        """
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.compact_ratio = compact_ratio
+        self.touch_interval = touch_interval
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+        conn = self._connection()
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, accessed_at, expires_at FROM entries WHERE key = ?",
+            (key,),
+        ).fetchone()
+        now = time.time()
+        if row is None:
+            with self._lock:
+                self._stats.misses += 1
+            return None
+        value, accessed_at, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            conn.execute(
+                "DELETE FROM entries WHERE key = ? AND expires_at <= ?", (key, now)
+            )
+            with self._lock:
+                self._stats.expirations += 1
+                self._stats.misses += 1
+            return None
+        if now - accessed_at >= self.touch_interval:
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        with self._lock:
+            self._stats.hits += 1
+        return bytes(value)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            return
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        conn = self._connection()
+        conn.execute(_UPSERT, (key, value, len(value), now, now, expires_at))
+        if self.max_bytes is not None and self._total_size(conn) > self.max_bytes:
+            self.compact()
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        conn = self._connection()
+        conn.execute("DELETE FROM entries")
+        conn.execute("PRAGMA incremental_vacuum")
+
+    def stats(self) -> CacheStats:
+        conn = self._connection()
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                expirations=self._stats.expirations,
+                entries=entries,
+                size_bytes=self._total_size(conn),
+            )
+
+    def compact(self) -> int:
+        """Drop expired entries and shrink the cache below its size limit.
+
+        Returns:
+            Number of entries evicted to satisfy the size limit
+        """
+        conn = self._connection()
+        evicted = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            )
+            if self.max_bytes is not None:
+                target = int(self.max_bytes * self.compact_ratio)
+                excess = self._total_size(conn) - target
+                if excess > 0:
+                    rows = conn.execute(
+                        "SELECT key, size FROM entries ORDER BY accessed_at"
+                    )
+                    victims = []
+                    for key, size in rows:
+                        if excess <= 0:
+                            break
+                        victims.append((key,))
+                        excess -= size
+                    rows.close()
+                    conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+                    evicted = len(victims)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("PRAGMA incremental_vacuum")
+        with self._lock:
+            self._stats.evictions += evicted
+        return evicted
+
+    def export_to(self, path: Union[str, "os.PathLike[str]"]) -> int:
+        """Write every live entry to a JSON Lines file.
+
+        Args:
+            path: Destination file path
+
+        Returns:
+            Number of exported entries
+        """
+        conn = self._connection()
+        count = 0
+        with open(path, "w", encoding="utf-8") as f:
+            rows = conn.execute(
+                "SELECT key, value, created_at, expires_at FROM entries "
+                "WHERE expires_at IS NULL OR expires_at > ?",
+                (time.time(),),
+            )
+            for key, value, created_at, expires_at in rows:
+                record = {
+                    "key": key,
+                    "value": bytes(value).decode("utf-8"),
+                    "created_at": created_at,
+                    "expires_at": expires_at,
+                }
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+                count += 1
+        return count
+
+    def import_from(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        overwrite: bool = False,
+    ) -> int:
+        """Load entries previously written by :meth:`export_to`.
+
+        Args:
+            path: Source file path
+            overwrite: Replace existing entries with the same key
+
+        Returns:
+            Number of imported entries
+        """
+        conn = self._connection()
+        now = time.time()
+        statement = (
+            _UPSERT
+            if overwrite
+            else (
+                "INSERT OR IGNORE INTO entries "
+                "(key, value, size, created_at, accessed_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)"
+            )
+        )
+        count = 0
+        with open(path, encoding="utf-8") as f:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    expires_at = record.get("expires_at")
+                    if expires_at is not None and expires_at <= now:
+                        continue
+                    value = record["value"].encode("utf-8")
+                    cursor = conn.execute(
+                        statement,
+                        (
+                            record["key"],
+                            value,
+                            len(value),
+                            record.get("created_at", now),
+                            now,
+                            expires_at,
+                        ),
+                    )
+                    count += cursor.rowcount
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        if self.max_bytes is not None and self._total_size(conn) > self.max_bytes:
+            self.compact()
+        return count
+
+    def close(self) -> None:
+        """Close every connection opened by this cache."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    @staticmethod
+    def _total_size(conn: sqlite3.Connection) -> int:
+        return int(
+            conn.execute("SELECT total_size FROM meta WHERE id = 0").fetchone()[0]
+        )
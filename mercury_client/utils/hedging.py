@@ -0,0 +1,193 @@
+"""Hedged requests for the async client.
+
+When a request has not answered within a high percentile of recent
+latencies for its model, :class:`HedgingPolicy` lets the client send a
+duplicate and use whichever answer arrives first. The extra load is capped
+by a :class:`~mercury_client.utils.retry.RetryBudget` so that hedging cannot
+amplify traffic to an API that is slow across the board.
+"""
+
+import asyncio
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from mercury_client.utils.retry import RetryBudget
+
+T = TypeVar("T")
+
+
+@dataclass
+class HedgingStats:
+    """Snapshot of hedging activity."""
+
+    requests: int
+    hedged: int
+    hedge_wins: int
+    budget_exhausted: int
+
+
+class HedgingPolicy:
+    """Per-model latency tracking and hedging budget shared by clients."""
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_hedge_ratio: float = 0.05,
+        min_samples: int = 20,
+        window: int = 1000,
+        min_delay: float = 0.0,
+        max_delay: Optional[float] = None,
+    ) -> None:
+        """Initialize hedging policy.
+
+        Args:
+            percentile: Latency percentile after which a request is hedged
+            max_hedge_ratio: Maximum hedged requests per request sent,
+                enforced over a sliding window
+            min_samples: Latencies recorded for a model before its requests
+                are hedged
+            window: Most recent latencies kept per model
+            min_delay: Lower bound of the hedging delay in seconds
+            max_delay: Upper bound of the hedging delay in seconds
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget = RetryBudget(ratio=max_hedge_ratio, min_retries=0)
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+        # model -> (samples recorded when computed, threshold)
+        self._thresholds: Dict[str, Tuple[int, float]] = {}
+        self._recorded: Dict[str, int] = {}
+        self._stats = HedgingStats(0, 0, 0, 0)
+
+    def record(self, model: str, latency: float) -> None:
+        """Record the latency of a successful request to ``model``."""
+        with self._lock:
+            latencies = self._latencies.get(model)
+            if latencies is None:
+                latencies = self._latencies[model] = deque(maxlen=self.window)
+            latencies.append(latency)
+            self._recorded[model] = self._recorded.get(model, 0) + 1
+
+    def delay(self, model: str) -> Optional[float]:
+        """Return how long to wait before hedging a request to ``model``.
+
+        Returns:
+            Delay in seconds, or None while too few latencies are known
+        """
+        with self._lock:
+            latencies = self._latencies.get(model)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            recorded = self._recorded[model]
+            cached = self._thresholds.get(model)
+            # Sorting the window on every call would dominate the cost of
+            # fast requests; a percentile moves slowly, so refresh it only
+            # after a few new samples.
+            if cached is None or recorded - cached[0] >= max(1, len(latencies) // 20):
+                ordered = sorted(latencies)
+                rank = math.ceil(self.percentile / 100 * len(ordered)) - 1
+                cached = (recorded, ordered[rank])
+                self._thresholds[model] = cached
+            threshold = max(cached[1], self.min_delay)
+            if self.max_delay is not None:
+                threshold = min(threshold, self.max_delay)
+            return threshold
+
+    def stats(self) -> HedgingStats:
+        """Return a snapshot of the hedging counters."""
+        with self._lock:
+            return HedgingStats(
+                requests=self._stats.requests,
+                hedged=self._stats.hedged,
+                hedge_wins=self._stats.hedge_wins,
+                budget_exhausted=self._stats.budget_exhausted,
+            )
+
+    async def run(self, model: str, send: Callable[[], Awaitable[T]]) -> T:
+        """Run ``send``, hedging it with a second call if it is slow.
+
+        The first successful result wins and the other call is cancelled. If
+        one call fails, the other is still awaited; the error is raised only
+        if both fail.
+
+        Args:
+            model: Model the request is sent to
+            send: Coroutine function performing the request
+
+        Returns:
+            Result of whichever call succeeded first
+        """
+        loop = asyncio.get_running_loop()
+        self.budget.record_request()
+        with self._lock:
+            self._stats.requests += 1
+        delay = self.delay(model)
+        started = loop.time()
+        primary = asyncio.ensure_future(send())
+        # The primary resolves to the result, the hedge to (result, latency)
+        tasks: Set[asyncio.Future[Any]] = {primary}
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    if self.budget.try_spend():
+                        with self._lock:
+                            self._stats.hedged += 1
+                        tasks.add(asyncio.ensure_future(self._timed(loop, send)))
+                    else:
+                        with self._lock:
+                            self._stats.budget_exhausted += 1
+
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    if task is primary:
+                        result: T = primary.result()
+                        self.record(model, loop.time() - started)
+                        return result
+                    hedged: Tuple[T, float] = task.result()
+                    result, latency = hedged
+                    with self._lock:
+                        self._stats.hedge_wins += 1
+                    self.record(model, latency)
+                    return result
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    @staticmethod
+    async def _timed(
+        loop: asyncio.AbstractEventLoop, send: Callable[[], Awaitable[T]]
+    ) -> Tuple[T, float]:
+        started = loop.time()
+        result = await send()
+        return result, loop.time() - started
@@ -0,0 +1,38 @@
+"""Canonical request keys for deduplication and caching."""
+
+import hashlib
+import json
+from typing import Any, Dict
+
+
+def canonical_json(payload: Dict[str, Any]) -> bytes:
+    """Serialize a request payload to canonical JSON bytes.
+
+    Keys are sorted and insignificant whitespace removed, so two payloads with
+    the same content always produce the same bytes.
+
+    Args:
+        payload: JSON-compatible request payload
+
+    Returns:
+        Canonical UTF-8 encoded JSON
+    """
+    return json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def request_key(endpoint: str, payload: Dict[str, Any]) -> str:
+    """Compute a stable hash identifying a request.
+
+    Args:
+        endpoint: API path the payload is sent to
+        payload: JSON-compatible request payload
+
+    Returns:
+        Hex-encoded SHA-256 digest of the endpoint and canonical payload
+    """
+    digest = hashlib.sha256(endpoint.encode("utf-8"))
+    digest.update(b"\n")
+    digest.update(canonical_json(payload))
+    return digest.hexdigest()
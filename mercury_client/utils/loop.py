@@ -0,0 +1,183 @@
+"""Event loop protection and instrumentation for the async client.
+
+Decoding and validating a large completion is CPU-bound and runs on the
+event loop thread, delaying every other coroutine meanwhile.
+:class:`LoopConfig` moves the parsing of responses above a size threshold to
+an executor, and reports how long each request held the loop.
+
+The time a request holds the loop is measured by :class:`LoopTimer`, which
+drives the request's coroutine and times every step it runs between two
+suspensions. Work done in tasks the request spawns, such as hedged attempts,
+is not included.
+"""
+
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generator,
+    Generic,
+    Optional,
+    TypeVar,
+    cast,
+)
+
+T = TypeVar("T")
+
+
+@dataclass
+class LoopBlockReport:
+    """How long one request held the event loop.
+
+    Attributes:
+        url: URL path of the request
+        held: Seconds the request's own code ran on the event loop, from
+            encoding the request to parsing the response or, for streams,
+            until the last chunk
+        longest: Longest stretch in seconds without yielding to the loop
+        steps: Number of stretches the request ran in
+        response_bytes: Size of the parsed response body; 0 for streams
+        offloaded: Whether the response was parsed in the executor
+        stream: Whether the request was a stream
+    """
+
+    url: str
+    held: float = 0.0
+    longest: float = 0.0
+    steps: int = 0
+    response_bytes: int = 0
+    offloaded: bool = False
+    stream: bool = False
+
+    def add(self, timer: "LoopTimer[Any]") -> None:
+        """Add the steps measured by ``timer``."""
+        self.held += timer.held
+        self.longest = max(self.longest, timer.longest)
+        self.steps += timer.steps
+
+
+LoopBlockListener = Callable[[LoopBlockReport], None]
+
+
+@dataclass
+class LoopConfig:
+    """Configuration of response parsing and loop instrumentation.
+
+    With the GIL, a worker thread still holds the interpreter while
+    pydantic-core validates, so other coroutines wait for it even though the
+    loop is free. Offloading pays off on free-threaded Python builds, and with
+    ``on_loop_block`` showing the parsing dominate the time held.
+
+    Attributes:
+        offload_threshold: Response size in bytes from which responses are
+            decoded and validated in ``executor`` rather than on the event
+            loop, or None to always parse on the loop
+        executor: Executor parsing large responses; the loop's default
+            thread pool if None
+        on_loop_block: Callback invoked with a :class:`LoopBlockReport`
+            after every completion request and at the end of every stream
+    """
+
+    offload_threshold: Optional[int] = None
+    executor: Optional[Executor] = None
+    on_loop_block: Optional[LoopBlockListener] = None
+
+    def should_offload(self, size: int) -> bool:
+        """Whether a response of ``size`` bytes is parsed in the executor."""
+        return self.offload_threshold is not None and size >= self.offload_threshold
+
+
+class LoopTimer(Generic[T]):
+    """Awaitable running a coroutine while timing each step it takes.
+
+    Example::
+
+        timer = LoopTimer(client.chat_completion(messages))
+        response = await timer
+        print(timer.held, timer.longest)
+    """
+
+    def __init__(self, awaitable: Awaitable[T]) -> None:
+        self._awaitable = awaitable
+        self.held = 0.0
+        self.longest = 0.0
+        self.steps = 0
+
+    def __await__(self) -> Generator[Any, Any, T]:
+        iterator = self._awaitable.__await__()
+        send: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            started = time.perf_counter()
+            try:
+                if error is None:
+                    yielded = iterator.send(send)
+                else:
+                    yielded = iterator.throw(error)
+            except StopIteration as stop:
+                self._record(time.perf_counter() - started)
+                return cast("T", stop.value)
+            except BaseException:
+                self._record(time.perf_counter() - started)
+                raise
+            self._record(time.perf_counter() - started)
+            try:
+                send, error = (yield yielded), None
+            except GeneratorExit:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+                raise
+            except BaseException as e:
+                # Cancellation and other errors thrown in by the task
+                send, error = None, e
+
+    def _record(self, elapsed: float) -> None:
+        self.held += elapsed
+        self.steps += 1
+        if elapsed > self.longest:
+            self.longest = elapsed
+
+
+async def timed_stream(
+    chunks: AsyncIterator[T],
+    report: LoopBlockReport,
+    listener: LoopBlockListener,
+) -> AsyncIterator[T]:
+    """Yield ``chunks``, timing the steps that produce them.
+
+    Args:
+        chunks: Stream to time
+        report: Report accumulating the time held
+        listener: Callback receiving ``report`` once the stream ends
+
+    Yields:
+        The chunks of ``chunks``
+    """
+    try:
+        while True:
+            timer = LoopTimer(chunks.__anext__())
+            try:
+                chunk = await timer
+            except StopAsyncIteration:
+                return
+            finally:
+                report.add(timer)
+            yield chunk
+    finally:
+        try:
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                # Run the stream's cleanup now, while it still counts toward
+                # the report, instead of whenever ``chunks`` is collected.
+                timer = LoopTimer(aclose())
+                try:
+                    await timer
+                finally:
+                    report.add(timer)
+        finally:
+            listener(report)
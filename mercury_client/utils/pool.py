@@ -0,0 +1,220 @@
+"""Connection pool configuration and instrumentation for Mercury API clients."""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import httpx
+
+ClientT = TypeVar("ClientT")
+
+
+@dataclass
+class PoolConfig:
+    """Configuration for the HTTP connection pool.
+
+    Attributes:
+        max_connections: Maximum number of concurrent connections, or None
+            for no limit
+        max_keepalive_connections: Maximum number of idle connections kept
+            open for reuse
+        keepalive_expiry: Seconds an idle connection is kept before closing
+        pool_timeout: Seconds to wait for a free connection before raising
+            ``httpx.PoolTimeout``. Defaults to the client's request timeout.
+        http2: Enable HTTP/2 multiplexing (requires the ``h2`` package)
+    """
+
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 5.0
+    pool_timeout: Optional[float] = None
+    http2: bool = False
+
+    def to_limits(self) -> httpx.Limits:
+        """Build the equivalent ``httpx.Limits``."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def to_timeout(self, timeout: float, cap: Optional[float] = None) -> httpx.Timeout:
+        """Build an ``httpx.Timeout`` with this pool's acquire timeout.
+
+        Args:
+            timeout: Default timeout for connect, read and write
+            cap: Upper bound applied to every timeout, such as the time left
+                before a call's deadline
+
+        Returns:
+            Timeout configuration
+        """
+        pool = self.pool_timeout if self.pool_timeout is not None else timeout
+        if cap is not None:
+            cap = max(cap, 0.0)
+            timeout, pool = min(timeout, cap), min(pool, cap)
+        return httpx.Timeout(timeout, pool=pool)
+
+
+@dataclass
+class PoolStats:
+    """Snapshot of connection pool usage."""
+
+    max_connections: Optional[int]
+    in_flight: int
+    peak_in_flight: int
+    total_requests: int
+    total_wait_time: float
+    max_wait_time: float
+
+    @property
+    def average_wait_time(self) -> float:
+        """Mean time spent waiting for a pooled connection, in seconds."""
+        if not self.total_requests:
+            return 0.0
+        return self.total_wait_time / self.total_requests
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of ``max_connections`` currently in use."""
+        if not self.max_connections:
+            return 0.0
+        return self.in_flight / self.max_connections
+
+
+class PoolMonitor:
+    """Thread-safe tracker of pool occupancy and connection wait time.
+
+    Wait time is measured from the moment a request is handed to httpx until
+    the transport reports its first connection event (a new TCP connect or
+    request headers being written to a reused connection), using the httpcore
+    ``trace`` request extension.
+    """
+
+    def __init__(self, max_connections: Optional[int] = None) -> None:
+        """Initialize pool monitor.
+
+        Args:
+            max_connections: Configured pool size, reported in stats
+        """
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._total_requests = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    def track(self) -> "TrackedRequest":
+        """Start tracking a request.
+
+        Returns:
+            Handle whose ``trace``/``atrace`` callbacks are passed as the
+            httpx ``trace`` extension and which must be closed when the
+            response has been released.
+        """
+        with self._lock:
+            self._in_flight += 1
+            self._total_requests += 1
+            if self._in_flight > self._peak_in_flight:
+                self._peak_in_flight = self._in_flight
+        return TrackedRequest(self)
+
+    def _record_wait(self, waited: float) -> None:
+        with self._lock:
+            self._total_wait_time += waited
+            if waited > self._max_wait_time:
+                self._max_wait_time = waited
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def stats(self) -> PoolStats:
+        """Return a snapshot of the current pool statistics."""
+        with self._lock:
+            return PoolStats(
+                max_connections=self.max_connections,
+                in_flight=self._in_flight,
+                peak_in_flight=self._peak_in_flight,
+                total_requests=self._total_requests,
+                total_wait_time=self._total_wait_time,
+                max_wait_time=self._max_wait_time,
+            )
+
+
+class TrackedRequest:
+    """Per-request handle returned by :meth:`PoolMonitor.track`."""
+
+    __slots__ = ("_monitor", "_started", "_acquired", "_closed")
+
+    def __init__(self, monitor: PoolMonitor) -> None:
+        self._monitor = monitor
+        self._started = time.perf_counter()
+        self._acquired = False
+        self._closed = False
+
+    def trace(self, name: str, info: Dict[str, Any]) -> None:
+        """Synchronous httpcore trace callback."""
+        if not self._acquired:
+            self._acquired = True
+            self._monitor._record_wait(time.perf_counter() - self._started)
+
+    async def atrace(self, name: str, info: Dict[str, Any]) -> None:
+        """Asynchronous httpcore trace callback."""
+        self.trace(name, info)
+
+    def close(self) -> None:
+        """Mark the request's connection as released."""
+        if not self._closed:
+            self._closed = True
+            self._monitor._release()
+
+
+class BorrowedTransport(httpx.BaseTransport):
+    """Wrapper around a caller-owned transport that is never closed by the client."""
+
+    def __init__(self, transport: httpx.BaseTransport) -> None:
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._transport.handle_request(request)
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncBorrowedTransport(httpx.AsyncBaseTransport):
+    """Async wrapper around a caller-owned transport that is never closed by the client."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class LazyClients(Dict[str, ClientT]):
+    """HTTP clients per endpoint, each created on first use.
+
+    Creating an httpx client builds its transport and SSL context, which
+    dominates the construction time of a Mercury client; deferring it keeps
+    clients that are created but never used, and cold starts, cheap. Only the
+    clients created so far are listed by ``values()``.
+    """
+
+    def __init__(self, factory: Callable[[str], ClientT]) -> None:
+        super().__init__()
+        self._factory = factory
+        self._lock = threading.Lock()
+
+    def __missing__(self, url: str) -> ClientT:
+        with self._lock:
+            client = self.get(url)
+            if client is None:
+                client = self[url] = self._factory(url)
+            return client
@@ -0,0 +1,157 @@
+"""Prepared chat requests sharing a fixed model, parameters and prompt.
+
+Services sending many requests that differ only in their last messages
+rebuild and revalidate the same model, sampling parameters, tools, system
+prompt and few-shot examples on every call. :class:`PreparedChatRequest`
+validates those fixed parts once and keeps them both as a dumped payload and,
+per codec, as encoded JSON. Each call then validates only the variable
+messages and splices their encoding into the cached request body.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from mercury_client.models.chat import ChatCompletionRequest, Message
+from mercury_client.utils.codec import JSONCodec
+
+MessageLike = Union[Dict[str, Any], Message]
+
+
+def dump_message(message: MessageLike) -> Dict[str, Any]:
+    """Validate a message and return its request payload form."""
+    if not isinstance(message, Message):
+        message = Message.model_validate(message)
+    return message.model_dump(exclude_none=True)
+
+
+class PreparedChatRequest:
+    """Chat request template with its fixed parts validated and encoded once.
+
+    Example::
+
+        template = PreparedChatRequest(
+            system="You are a terse code reviewer.",
+            model="mercury-coder-small",
+            max_tokens=512,
+        )
+        response = client.chat_completion_prepared(
+            template, [{"role": "user", "content": diff}]
+        )
+
+    Templates are immutable and may be shared between clients and threads.
+    """
+
+    def __init__(
+        self,
+        messages: Sequence[MessageLike] = (),
+        model: str = "mercury-coder-small",
+        system: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize template.
+
+        Args:
+            messages: Fixed leading messages, such as few-shot examples
+            model: Model to use for completion
+            system: System prompt placed before ``messages``
+            **kwargs: Additional request parameters, validated like
+                ``chat_completion`` arguments
+
+        Raises:
+            pydantic.ValidationError: If the fixed parts are invalid
+        """
+        fixed: List[Any] = list(messages)
+        if system is not None:
+            fixed.insert(0, {"role": "system", "content": system})
+        kwargs.pop("stream", None)
+        request = ChatCompletionRequest(model=model, messages=fixed, **kwargs)
+        params = request.model_dump(exclude_none=True)
+        self.messages: List[Dict[str, Any]] = params.pop("messages")
+        params.pop("stream", None)
+        self.params: Dict[str, Any] = params
+        # Encoded fixed payload per (codec, stream), ending with the messages
+        self._heads: Dict[Tuple[JSONCodec, bool], bytes] = {}
+
+    @property
+    def model(self) -> str:
+        """Model the requests are sent to."""
+        return str(self.params["model"])
+
+    def payload(
+        self, messages: Sequence[MessageLike], stream: bool = False
+    ) -> Dict[str, Any]:
+        """Build the request payload for ``messages``.
+
+        Args:
+            messages: Variable messages appended to the fixed ones
+            stream: Whether the request is streamed
+
+        Returns:
+            JSON request body; messages are listed last
+        """
+        return self._payload([dump_message(m) for m in messages], stream)
+
+    def render(
+        self,
+        messages: Sequence[MessageLike],
+        codec: JSONCodec,
+        stream: bool = False,
+    ) -> Tuple[Dict[str, Any], bytes]:
+        """Build the request payload for ``messages`` and encode it.
+
+        Only the variable messages are validated and encoded; the encoding of
+        the fixed parts is computed once per codec.
+
+        Args:
+            messages: Variable messages appended to the fixed ones
+            codec: Codec encoding the request body
+            stream: Whether the request is streamed
+
+        Returns:
+            JSON request body and its encoding
+        """
+        variable = [dump_message(m) for m in messages]
+        return self.splice(variable, [codec.dumps(m) for m in variable], codec, stream)
+
+    def splice(
+        self,
+        messages: List[Dict[str, Any]],
+        fragments: Sequence[bytes],
+        codec: JSONCodec,
+        stream: bool = False,
+    ) -> Tuple[Dict[str, Any], bytes]:
+        """Build the request for messages that are already validated and encoded.
+
+        Args:
+            messages: Dumped variable messages appended to the fixed ones
+            fragments: Encodings of ``messages`` by ``codec``
+            codec: Codec encoding the request body
+            stream: Whether the request is streamed
+
+        Returns:
+            JSON request body and its encoding
+        """
+        payload = self._payload(messages, stream)
+        head = self._heads.get((codec, stream))
+        if head is None:
+            head = codec.dumps(self._payload([], stream))
+            self._heads[(codec, stream)] = head
+        if not messages:
+            return payload, head
+        # The messages list closes the encoded head; with codecs emitting
+        # anything else there, the body is encoded in full.
+        if not head.endswith(b"]}"):
+            return payload, codec.dumps(payload)
+        separator = b"," if self.messages else b""
+        return payload, b"".join((head[:-2], separator, b",".join(fragments), b"]}"))
+
+    def _payload(self, variable: List[Dict[str, Any]], stream: bool) -> Dict[str, Any]:
+        payload = dict(self.params)
+        payload["stream"] = stream
+        payload["messages"] = self.messages + variable
+        return payload
+
+    def __repr__(self) -> str:
+        return (
+            f"PreparedChatRequest(model={self.model!r}, "
+            f"messages={len(self.messages)})"
+        )
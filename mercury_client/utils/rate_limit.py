@@ -0,0 +1,185 @@
+"""Client-side rate limiting for requests and tokens.
+
+A :class:`RateLimiter` paces requests before they are sent so that a process
+stays under its requests-per-second and tokens-per-minute quotas instead of
+discovering them through ``RateLimitError`` responses. One limiter can be
+shared by any number of clients, threads and coroutines.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+# Rough characters-per-token ratio used to estimate prompt size.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(payload: Dict[str, Any]) -> int:
+    """Estimate the tokens a request counts against a tokens-per-minute quota.
+
+    The prompt size is approximated from its character count and the
+    requested ``max_tokens`` is added on top, since the completion may use
+    all of them.
+
+    Args:
+        payload: JSON request body of a chat or FIM completion
+
+    Returns:
+        Estimated token count
+    """
+    chars = 0
+    for message in payload.get("messages") or ():
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+    for field in ("prompt", "suffix"):
+        value = payload.get(field)
+        if isinstance(value, str):
+            chars += len(value)
+    return chars // CHARS_PER_TOKEN + 1 + int(payload.get("max_tokens") or 0)
+
+
+class TokenBucket:
+    """Token bucket supporting reservations.
+
+    A reservation always succeeds and may drive the balance negative; the
+    caller then waits until the bucket has refilled to zero. This keeps
+    waiters first-come, first-served without a queue. Not thread-safe on its
+    own; :class:`RateLimiter` serializes access.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize a full token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens the bucket holds
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take ``amount`` tokens and return how long to wait before using them."""
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        self._tokens -= amount
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+
+@dataclass
+class RateLimitStats:
+    """Snapshot of rate limiter activity."""
+
+    requests: int
+    tokens: int
+    throttled: int
+    total_wait_time: float
+
+
+class RateLimiter:
+    """Thread- and coroutine-safe limiter for requests and estimated tokens."""
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        burst_requests: Optional[float] = None,
+        burst_tokens: Optional[float] = None,
+    ) -> None:
+        """Initialize rate limiter.
+
+        Args:
+            requests_per_second: Sustained request rate, or None for no limit
+            tokens_per_minute: Sustained estimated-token rate, or None for no
+                limit
+            burst_requests: Requests that may be sent at once after an idle
+                period, defaults to one second's worth
+            burst_tokens: Tokens that may be used at once after an idle
+                period, defaults to one minute's worth
+        """
+        self._requests = (
+            TokenBucket(
+                requests_per_second,
+                burst_requests or max(requests_per_second, 1.0),
+            )
+            if requests_per_second
+            else None
+        )
+        self._tokens = (
+            TokenBucket(tokens_per_minute / 60.0, burst_tokens or tokens_per_minute)
+            if tokens_per_minute
+            else None
+        )
+        self._lock = threading.Lock()
+        self._stats = RateLimitStats(0, 0, 0, 0.0)
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserve capacity for one request.
+
+        Args:
+            tokens: Estimated tokens of the request
+
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = 0.0
+            if self._requests is not None:
+                delay = self._requests.reserve(1, now)
+            if self._tokens is not None and tokens:
+                delay = max(delay, self._tokens.reserve(tokens, now))
+            self._stats.requests += 1
+            self._stats.tokens += tokens
+            if delay > 0:
+                self._stats.throttled += 1
+                self._stats.total_wait_time += delay
+            return delay
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block the current thread until a request may be sent.
+
+        Args:
+            tokens: Estimated tokens of the request
+
+        Returns:
+            Seconds waited
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """Wait without blocking the event loop until a request may be sent.
+
+        Args:
+            tokens: Estimated tokens of the request
+
+        Returns:
+            Seconds waited
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def stats(self) -> RateLimitStats:
+        """Return a snapshot of the limiter counters."""
+        with self._lock:
+            return RateLimitStats(
+                requests=self._stats.requests,
+                tokens=self._stats.tokens,
+                throttled=self._stats.throttled,
+                total_wait_time=self._stats.total_wait_time,
+            )
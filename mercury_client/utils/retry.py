@@ -1,17 +1,30 @@
 """Retry logic with exponential backoff for Mercury API."""
 
 import asyncio
+import random
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import TypeVar, Callable, Awaitable, Optional, Tuple, Type
 from functools import wraps
-import random
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import httpx
 
 from mercury_client.exceptions import (
-    MercuryAPIError,
+    EngineOverloadedError,
     RateLimitError,
     ServerError,
-    EngineOverloadedError,
 )
 
 T = TypeVar("T")
@@ -20,7 +33,7 @@ T = TypeVar("T")
 @dataclass
 class RetryConfig:
     """Configuration for retry behavior."""
-    
+
     max_retries: int = 3
     initial_delay: float = 1.0
     max_delay: float = 60.0
@@ -30,7 +43,116 @@ class RetryConfig:
         RateLimitError,
         ServerError,
         EngineOverloadedError,
+        # Transport failures, typically from stale keep-alive connections
+        httpx.ConnectError,
+        httpx.ConnectTimeout,
+        httpx.ReadError,
+        httpx.ReadTimeout,
+        httpx.RemoteProtocolError,
     )
+    # Seconds a call may take across all attempts and backoff sleeps
+    deadline: Optional[float] = None
+
+
+@dataclass
+class RetryBudgetStats:
+    """Snapshot of a retry budget over its sliding window."""
+
+    requests: int
+    retries: int
+    available: int
+    exhausted: int
+
+
+class RetryBudget:
+    """Thread-safe cap on retries relative to first attempts.
+
+    Every first attempt deposits ``ratio`` of a retry into the budget and
+    every retry withdraws one, over a sliding window. A small allowance of
+    ``min_retries`` per window lets low-traffic clients retry at all. Once
+    the budget is spent, retryable errors are raised immediately, so retries
+    cannot multiply the load on an API that is already failing.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        window: float = 10.0,
+        min_retries: int = 10,
+        buckets: int = 10,
+    ) -> None:
+        """Initialize retry budget.
+
+        Args:
+            ratio: Retries allowed per first attempt
+            window: Length of the sliding window in seconds
+            min_retries: Retries allowed per window regardless of traffic
+            buckets: Number of buckets the window is divided into
+        """
+        self.ratio = ratio
+        self.window = window
+        self.min_retries = min_retries
+        self._width = window / buckets
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        # [bucket number, requests, retries], oldest first
+        self._counts: Deque[List[int]] = deque()
+        self._requests = 0
+        self._retries = 0
+        self._exhausted = 0
+
+    @property
+    def available(self) -> int:
+        """Number of retries that may currently be spent."""
+        with self._lock:
+            self._advance()
+            return self._available()
+
+    def record_request(self) -> None:
+        """Record a first attempt, adding to the budget."""
+        with self._lock:
+            self._advance()[1] += 1
+            self._requests += 1
+
+    def try_spend(self) -> bool:
+        """Withdraw one retry if the budget allows it.
+
+        Returns:
+            Whether the retry may be sent
+        """
+        with self._lock:
+            bucket = self._advance()
+            if self._available() <= 0:
+                self._exhausted += 1
+                return False
+            bucket[2] += 1
+            self._retries += 1
+            return True
+
+    def stats(self) -> RetryBudgetStats:
+        """Return a snapshot of the budget over the current window."""
+        with self._lock:
+            self._advance()
+            return RetryBudgetStats(
+                requests=self._requests,
+                retries=self._retries,
+                available=self._available(),
+                exhausted=self._exhausted,
+            )
+
+    def _available(self) -> int:
+        return int(self._requests * self.ratio) + self.min_retries - self._retries
+
+    def _advance(self) -> List[int]:
+        """Drop buckets that left the window and return the current one."""
+        number = int(time.monotonic() / self._width)
+        while self._counts and self._counts[0][0] <= number - self._buckets:
+            _, requests, retries = self._counts.popleft()
+            self._requests -= requests
+            self._retries -= retries
+        if not self._counts or self._counts[-1][0] != number:
+            self._counts.append([number, 0, 0])
+        return self._counts[-1]
 
 
 def calculate_delay(
@@ -39,100 +161,154 @@ def calculate_delay(
     retry_after: Optional[int] = None,
 ) -> float:
     """Calculate delay for next retry attempt.
-    
+
     Args:
         attempt: Current attempt number (0-indexed)
         config: Retry configuration
         retry_after: Optional retry-after header value
-        
+
     Returns:
         Delay in seconds
     """
     if retry_after is not None:
         return float(retry_after)
-    
+
     delay = min(
-        config.initial_delay * (config.exponential_base ** attempt),
-        config.max_delay
+        config.initial_delay * (config.exponential_base**attempt), config.max_delay
     )
-    
+
     if config.jitter:
-        delay *= (0.5 + random.random())
-    
+        delay *= 0.5 + random.random()
+
     return delay
 
 
-def retry_sync(config: Optional[RetryConfig] = None):
+def start_deadline(config: RetryConfig) -> Optional[float]:
+    """Return the ``time.monotonic()`` value at which a call starting now expires.
+
+    Args:
+        config: Retry configuration
+
+    Returns:
+        Absolute deadline, or None if the configuration sets no deadline
+    """
+    if config.deadline is None:
+        return None
+    return time.monotonic() + config.deadline
+
+
+def retry_delay(
+    attempt: int,
+    config: RetryConfig,
+    error: BaseException,
+    deadline: Optional[float] = None,
+) -> Optional[float]:
+    """Decide whether to retry after a retryable error, and when.
+
+    Args:
+        attempt: Attempt that just failed (0-indexed)
+        config: Retry configuration
+        error: Exception raised by the attempt
+        deadline: Absolute deadline from :func:`start_deadline`
+
+    Returns:
+        Seconds to sleep before the next attempt, or None if the retries are
+        used up or the next attempt could not start before the deadline
+    """
+    if attempt >= config.max_retries:
+        return None
+    retry_after = getattr(error, "retry_after", None)
+    delay = calculate_delay(attempt, config, retry_after)
+    if deadline is not None and time.monotonic() + delay >= deadline:
+        return None
+    return delay
+
+
+def retry_sync(
+    config: Optional[RetryConfig] = None,
+    budget: Optional[RetryBudget] = None,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator for synchronous retry logic.
-    
+
     Args:
         config: Retry configuration
-        
+        budget: Retry budget shared with other callers
+
     Returns:
         Decorated function with retry logic
     """
     if config is None:
         config = RetryConfig()
-    
+
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
-        def wrapper(*args, **kwargs) -> T:
+        def wrapper(*args: Any, **kwargs: Any) -> T:
             last_exception = None
-            
+            deadline = start_deadline(config)
+            if budget is not None:
+                budget.record_request()
+
             for attempt in range(config.max_retries + 1):
                 try:
                     return func(*args, **kwargs)
                 except tuple(config.retry_on) as e:
                     last_exception = e
-                    if attempt < config.max_retries:
-                        retry_after = getattr(e, 'retry_after', None)
-                        delay = calculate_delay(attempt, config, retry_after)
+                    delay = retry_delay(attempt, config, e, deadline)
+                    if delay is not None and (budget is None or budget.try_spend()):
                         time.sleep(delay)
                         continue
                     raise
                 except Exception:
                     raise
-            
-            if last_exception:
-                raise last_exception
-        
+
+            assert last_exception is not None
+            raise last_exception
+
         return wrapper
+
     return decorator
 
 
-def retry_async(config: Optional[RetryConfig] = None):
+def retry_async(
+    config: Optional[RetryConfig] = None,
+    budget: Optional[RetryBudget] = None,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
     """Decorator for asynchronous retry logic.
-    
+
     Args:
         config: Retry configuration
-        
+        budget: Retry budget shared with other callers
+
     Returns:
         Decorated function with retry logic
     """
     if config is None:
         config = RetryConfig()
-    
+
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
         @wraps(func)
-        async def wrapper(*args, **kwargs) -> T:
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
             last_exception = None
-            
+            deadline = start_deadline(config)
+            if budget is not None:
+                budget.record_request()
+
             for attempt in range(config.max_retries + 1):
                 try:
                     return await func(*args, **kwargs)
                 except tuple(config.retry_on) as e:
                     last_exception = e
-                    if attempt < config.max_retries:
-                        retry_after = getattr(e, 'retry_after', None)
-                        delay = calculate_delay(attempt, config, retry_after)
+                    delay = retry_delay(attempt, config, e, deadline)
+                    if delay is not None and (budget is None or budget.try_spend()):
                         await asyncio.sleep(delay)
                         continue
                     raise
                 except Exception:
                     raise
-            
-            if last_exception:
-                raise last_exception
-        
+
+            assert last_exception is not None
+            raise last_exception
+
         return wrapper
-    return decorator
\ No newline at end of file
+
+    return decorator
@@ -0,0 +1,322 @@
+"""Single-flight coalescing of identical in-flight requests.
+
+Mercury completions are greedy (``temperature=0.0``), so identical payloads
+produce identical results. Callers that issue the same request while an
+earlier one is still outstanding wait for that call instead of sending their
+own, and streamed chunks are broadcast to every waiter.
+"""
+
+import asyncio
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    cast,
+)
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """An in-flight synchronous call shared by all callers with the same key."""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class _StreamBroadcast(Generic[T]):
+    """Fans a single iterator out to any number of subscribers.
+
+    Chunks are buffered so that late subscribers replay the stream from the
+    start. Whichever subscriber reaches the end of the buffer pulls the next
+    chunk from the source while holding the pump lock.
+    """
+
+    def __init__(self, source: Iterator[T], on_finish: Callable[[], None]) -> None:
+        self._source = source
+        self._on_finish = on_finish
+        self._chunks: List[T] = []
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._pump_lock = threading.Lock()
+        self._subscribers = 0
+        self._abandoned = False
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Optional[Iterator[T]]:
+        """Attach a new subscriber, or return None if the stream was abandoned."""
+        with self._lock:
+            if self._abandoned:
+                return None
+            self._subscribers += 1
+        return self._iterate()
+
+    def _finish(self) -> None:
+        if not self._done:
+            self._done = True
+            self._on_finish()
+
+    def _iterate(self) -> Iterator[T]:
+        index = 0
+        try:
+            while True:
+                if index < len(self._chunks):
+                    chunk = self._chunks[index]
+                else:
+                    with self._pump_lock:
+                        if index < len(self._chunks):
+                            continue
+                        if self._error is not None:
+                            raise self._error
+                        if self._done:
+                            return
+                        try:
+                            chunk = next(self._source)
+                        except StopIteration:
+                            self._finish()
+                            return
+                        except BaseException as e:
+                            self._error = e
+                            self._finish()
+                            raise
+                        self._chunks.append(chunk)
+                index += 1
+                yield chunk
+        finally:
+            with self._lock:
+                self._subscribers -= 1
+                abandoned = self._subscribers == 0 and not self._done
+                self._abandoned = abandoned
+            if abandoned:
+                with self._pump_lock:
+                    self._finish()
+                    close = getattr(self._source, "close", None)
+                    if close is not None:
+                        close()
+
+
+class SingleFlight:
+    """Thread-safe single-flight group for the synchronous client."""
+
+    def __init__(self) -> None:
+        """Initialize an empty single-flight group."""
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call[Any]] = {}
+        self._streams: Dict[str, _StreamBroadcast[Any]] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run ``fn`` unless a call with the same key is already in flight.
+
+        Args:
+            key: Canonical request key
+            fn: Function performing the request
+
+        Returns:
+            The result of the single shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        with self._lock:
+            waiting = self._calls.get(key)
+            if waiting is None:
+                call: _Call[T] = _Call()
+                self._calls[key] = call
+
+        if waiting is not None:
+            waiting.event.wait()
+            if waiting.error is not None:
+                raise waiting.error
+            return cast("T", waiting.result)
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def stream(self, key: str, fn: Callable[[], Iterator[T]]) -> Iterator[T]:
+        """Share one streaming call between all concurrent callers.
+
+        Args:
+            key: Canonical request key
+            fn: Function returning the chunk iterator of the request
+
+        Returns:
+            Iterator over every chunk of the shared stream
+        """
+        with self._lock:
+            broadcast = self._streams.get(key)
+            if broadcast is not None:
+                iterator = broadcast.subscribe()
+                if iterator is not None:
+                    return iterator
+            broadcast = _StreamBroadcast(
+                fn(), lambda: self._forget_stream(key, broadcast)
+            )
+            self._streams[key] = broadcast
+            return broadcast.subscribe()  # type: ignore[return-value]
+
+    def _forget_stream(self, key: str, broadcast: object) -> None:
+        with self._lock:
+            if self._streams.get(key) is broadcast:
+                del self._streams[key]
+
+
+class _AsyncStreamBroadcast(Generic[T]):
+    """Fans a single async iterator out to any number of subscribers.
+
+    The source is drained by a dedicated task so that cancelling one
+    subscriber never tears down the stream for the others.
+    """
+
+    def __init__(self, source: AsyncIterator[T], on_finish: Callable[[], None]) -> None:
+        self._source = source
+        self._on_finish = on_finish
+        self._chunks: List[T] = []
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._changed = asyncio.Event()
+        self._subscribers = 0
+        self._abandoned = False
+        self._task: Optional[asyncio.Future[None]] = None
+
+    async def _pump(self) -> None:
+        try:
+            async for chunk in self._source:
+                self._chunks.append(chunk)
+                self._changed.set()
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._done = True
+            self._on_finish()
+            self._changed.set()
+            aclose = getattr(self._source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    def subscribe(self) -> Optional[AsyncIterator[T]]:
+        """Attach a new subscriber, or return None if the stream was abandoned."""
+        if self._abandoned:
+            return None
+        self._subscribers += 1
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[T]:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._pump())
+        index = 0
+        try:
+            while True:
+                if index < len(self._chunks):
+                    yield self._chunks[index]
+                    index += 1
+                    continue
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                self._changed.clear()
+                await self._changed.wait()
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0 and not self._done:
+                self._abandoned = True
+                self._on_finish()
+                self._task.cancel()
+
+
+class AsyncSingleFlight:
+    """Single-flight group for the asynchronous client."""
+
+    def __init__(self) -> None:
+        """Initialize an empty single-flight group."""
+        self._calls: Dict[str, asyncio.Future[Any]] = {}
+        self._waiters: Dict[str, int] = {}
+        self._streams: Dict[str, _AsyncStreamBroadcast[Any]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn`` unless a call with the same key is already in flight.
+
+        The shared call runs in its own task; it is cancelled only when every
+        waiter has been cancelled.
+
+        Args:
+            key: Canonical request key
+            fn: Coroutine function performing the request
+
+        Returns:
+            The result of the single shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda _: self._forget_call(key, task))
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._waiters.get(key) == 1:
+                task.cancel()
+            raise
+        finally:
+            if key in self._waiters and self._calls.get(key) is task:
+                self._waiters[key] -= 1
+
+    def _forget_call(self, key: str, task: "asyncio.Future[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            del self._waiters[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every waiter was cancelled.
+            task.exception()
+
+    def stream(self, key: str, fn: Callable[[], AsyncIterator[T]]) -> AsyncIterator[T]:
+        """Share one streaming call between all concurrent callers.
+
+        Args:
+            key: Canonical request key
+            fn: Function returning the async chunk iterator of the request
+
+        Returns:
+            Async iterator over every chunk of the shared stream
+        """
+        broadcast = self._streams.get(key)
+        if broadcast is not None:
+            iterator = broadcast.subscribe()
+            if iterator is not None:
+                return iterator
+        broadcast = _AsyncStreamBroadcast(
+            fn(), lambda: self._forget_stream(key, broadcast)
+        )
+        self._streams[key] = broadcast
+        return broadcast.subscribe()  # type: ignore[return-value]
+
+    def _forget_stream(self, key: str, broadcast: object) -> None:
+        if self._streams.get(key) is broadcast:
+            del self._streams[key]
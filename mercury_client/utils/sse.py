@@ -0,0 +1,197 @@
+"""Incremental decoder for server-sent event streams.
+
+:class:`SSEDecoder` turns the raw byte chunks of a ``text/event-stream``
+response into :class:`ServerSentEvent` objects. It implements the event
+stream grammar: ``data``, ``event``, ``id`` and ``retry`` fields, multi-line
+data, comments and LF, CR or CRLF line endings, including terminators split
+across chunks. Event data is kept as bytes so that JSON payloads can be
+validated without decoding them to ``str`` first.
+"""
+
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
+
+_BOM = b"\xef\xbb\xbf"
+
+
+class ServerSentEvent:
+    """One dispatched server-sent event."""
+
+    __slots__ = ("event", "data", "id", "retry")
+
+    def __init__(
+        self,
+        data: bytes,
+        event: str = "message",
+        id: Optional[str] = None,
+        retry: Optional[int] = None,
+    ) -> None:
+        """Initialize event.
+
+        Args:
+            data: Data lines of the event joined with newlines
+            event: Event type
+            id: Last event ID seen on the stream
+            retry: Reconnection time in milliseconds, if the event set one
+        """
+        self.data = data
+        self.event = event
+        self.id = id
+        self.retry = retry
+
+    @property
+    def text(self) -> str:
+        """Event data decoded as UTF-8."""
+        return self.data.decode("utf-8")
+
+    def __repr__(self) -> str:
+        return (
+            f"ServerSentEvent(event={self.event!r}, data={self.data!r}, "
+            f"id={self.id!r}, retry={self.retry!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ServerSentEvent):
+            return NotImplemented
+        return (self.data, self.event, self.id, self.retry) == (
+            other.data,
+            other.event,
+            other.id,
+            other.retry,
+        )
+
+
+class SSEDecoder:
+    """Decode an event stream fed as arbitrary byte chunks."""
+
+    def __init__(self) -> None:
+        # Incomplete last line of the previous chunk
+        self._partial = b""
+        # Previous chunk ended with CR, so a leading LF belongs to it
+        self._pending_cr = False
+        self._started = False
+        self._data: List[bytes] = []
+        self._event: Optional[str] = None
+        self._retry: Optional[int] = None
+        self.last_event_id: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> List[ServerSentEvent]:
+        """Decode a chunk of the stream.
+
+        Args:
+            chunk: Next bytes of the stream, split anywhere
+
+        Returns:
+            Events completed by this chunk
+        """
+        if not chunk:
+            return []
+        if self._pending_cr:
+            self._pending_cr = False
+            if chunk[0] == 0x0A:
+                chunk = chunk[1:]
+                if not chunk:
+                    return []
+        if self._partial:
+            chunk = self._partial + chunk
+            self._partial = b""
+        if not self._started:
+            if len(chunk) < len(_BOM) and _BOM.startswith(chunk):
+                self._partial = chunk
+                return []
+            self._started = True
+            if chunk.startswith(_BOM):
+                chunk = chunk[len(_BOM) :]
+                if not chunk:
+                    return []
+
+        # bytes.splitlines splits on exactly the LF, CR and CRLF terminators
+        # of the event stream grammar, in C.
+        lines = chunk.splitlines()
+        last = chunk[-1]
+        if last == 0x0D:
+            self._pending_cr = True
+        elif last != 0x0A:
+            self._partial = lines.pop()
+
+        events: List[ServerSentEvent] = []
+        data = self._data
+        for line in lines:
+            if not line:
+                if data:
+                    # Inlined _dispatch(), the per-event hot path
+                    events.append(
+                        ServerSentEvent(
+                            data[0] if len(data) == 1 else b"\n".join(data),
+                            self._event or "message",
+                            self.last_event_id,
+                            self._retry,
+                        )
+                    )
+                    data = self._data = []
+                self._event = None
+                self._retry = None
+            elif line[:6] == b"data: ":
+                data.append(line[6:])
+            elif line[0] != 0x3A:  # lines starting with ":" are comments
+                self._field(line)
+        return events
+
+    def flush(self) -> List[ServerSentEvent]:
+        """Finish the stream, returning an event left without a blank line.
+
+        Strictly, such an event should be discarded; servers that omit the
+        final blank line are common enough that it is dispatched instead.
+        """
+        events: List[ServerSentEvent] = []
+        if self._partial:
+            line, self._partial = self._partial, b""
+            events.extend(self.feed(line + b"\n"))
+        self._pending_cr = False
+        if self._data:
+            events.append(self._dispatch())
+        return events
+
+    def iter_events(self, chunks: Iterable[bytes]) -> Iterator[ServerSentEvent]:
+        """Decode events from an iterable of byte chunks."""
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.flush()
+
+    async def aiter_events(
+        self, chunks: AsyncIterable[bytes]
+    ) -> AsyncIterator[ServerSentEvent]:
+        """Decode events from an async iterable of byte chunks."""
+        async for chunk in chunks:
+            for event in self.feed(chunk):
+                yield event
+        for event in self.flush():
+            yield event
+
+    def _field(self, line: bytes) -> None:
+        name, colon, value = line.partition(b":")
+        if colon and value[:1] == b" ":
+            value = value[1:]
+        if name == b"event":
+            self._event = value.decode("utf-8")
+        elif name == b"data":
+            # "data" without a colon adds an empty line
+            self._data.append(value)
+        elif name == b"id":
+            if b"\x00" not in value:
+                self.last_event_id = value.decode("utf-8")
+        elif name == b"retry" and value.isdigit():
+            self._retry = int(value)
+        # Other field names are ignored.
+
+    def _dispatch(self) -> ServerSentEvent:
+        data = self._data
+        event = ServerSentEvent(
+            data[0] if len(data) == 1 else b"\n".join(data),
+            self._event or "message",
+            self.last_event_id,
+            self._retry,
+        )
+        self._data = []
+        self._event = None
+        self._retry = None
+        return event
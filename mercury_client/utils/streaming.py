@@ -0,0 +1,215 @@
+"""Retry and resume support for streamed chat completions.
+
+A stream that fails before yielding anything is retried like any other
+request. Once chunks have reached the caller, a retry would repeat them, so
+:class:`StreamConfig` chooses between raising
+:class:`~mercury_client.exceptions.StreamInterruptedError` with the partial
+result and restarting the request while skipping the text already yielded.
+Restarting relies on Mercury's greedy decoding producing the same completion
+again.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import httpx
+from pydantic import ValidationError
+from pydantic_core import from_json
+
+from mercury_client.exceptions import (
+    MercuryAPIError,
+    StreamDecodeError,
+    StreamInterruptedError,
+)
+from mercury_client.models.chat import ChatCompletionResponse
+from mercury_client.models.stream import FastChunk
+from mercury_client.utils.sse import ServerSentEvent
+
+# Data of the event that ends a chat completion stream
+DONE = b"[DONE]"
+
+
+@dataclass
+class StreamConfig:
+    """Configuration for streamed chat completions."""
+
+    # Seconds to wait for the next bytes of a stream, including the response
+    # headers, before treating it as stalled; None uses the client timeout.
+    idle_timeout: Optional[float] = None
+    # Restart an interrupted stream and skip the text already yielded instead
+    # of raising StreamInterruptedError.
+    resume: bool = False
+    # Yield unvalidated FastChunk objects instead of ChatCompletionResponse
+    # models; they expose the same attributes at a fraction of the cost.
+    fast_chunks: bool = False
+
+    def to_timeout(
+        self, timeout: httpx.Timeout, cap: Optional[float] = None
+    ) -> httpx.Timeout:
+        """Apply the idle timeout to the read timeout of ``timeout``.
+
+        Args:
+            timeout: Timeout of the request
+            cap: Upper bound of the idle timeout, such as the time left
+                before a call's deadline
+        """
+        if self.idle_timeout is None:
+            return timeout
+        read = self.idle_timeout
+        if cap is not None:
+            read = min(read, max(cap, 0.0))
+        return httpx.Timeout(
+            connect=timeout.connect,
+            read=read,
+            write=timeout.write,
+            pool=timeout.pool,
+        )
+
+
+def parse_chunk(
+    event: ServerSentEvent,
+    fast: bool = False,
+    loads: Callable[[bytes], Any] = from_json,
+) -> Optional[Union[ChatCompletionResponse, FastChunk]]:
+    """Decode one event of a chat completion stream.
+
+    Args:
+        event: Event received from the stream
+        fast: Build an unvalidated :class:`FastChunk` instead of a model
+        loads: JSON decoder used for fast chunks, raising ValueError for
+            malformed JSON like every :class:`~mercury_client.utils.codec.JSONCodec`
+
+    Returns:
+        The chunk carried by the event, or None at the end of the stream
+
+    Raises:
+        MercuryAPIError: If the server reported an error mid-stream
+        StreamDecodeError: If the event data is not a valid chunk
+    """
+    data = event.data
+    if data == DONE:
+        return None
+    if event.event == "error":
+        raise _stream_error(data)
+    if fast:
+        try:
+            return FastChunk.from_dict(loads(data))
+        except (ValueError, TypeError, AttributeError) as e:
+            raise StreamDecodeError(
+                f"Malformed stream event: {data[:200]!r}", data=data
+            ) from e
+    try:
+        return ChatCompletionResponse.model_validate_json(data)
+    except ValidationError as e:
+        raise StreamDecodeError(
+            f"Malformed stream event: {data[:200]!r}", data=data
+        ) from e
+
+
+def _stream_error(data: bytes) -> MercuryAPIError:
+    try:
+        error = json.loads(data).get("error", {})
+        message = error.get("message") or data.decode("utf-8", "replace")
+    except (ValueError, AttributeError):
+        message = data.decode("utf-8", "replace")
+    return MercuryAPIError(message, response_data={"error": message})
+
+
+class StreamProgress:
+    """Track what a stream has yielded so that a restart can skip it."""
+
+    def __init__(self) -> None:
+        self.chunks = 0
+        self._content: Dict[int, List[str]] = {}
+        self._tool_calls = False
+        self._skip: Dict[int, int] = {}
+
+    @property
+    def started(self) -> bool:
+        """Whether any chunk has been yielded."""
+        return self.chunks > 0
+
+    @property
+    def partial_content(self) -> str:
+        """Content yielded so far for the first choice."""
+        return "".join(self._content.get(0, ()))
+
+    def can_retry(self, config: StreamConfig, payload: Dict[str, Any]) -> bool:
+        """Whether a failed attempt may be followed by another one.
+
+        A stream is retried freely until it yields its first chunk. Later
+        restarts need ``config.resume`` and must be alignable with what was
+        already yielded: skipping works on message text, so streams that
+        yielded tool calls or that diffuse (revise earlier text) cannot be
+        resumed.
+        """
+        if not self.started:
+            return True
+        return config.resume and not self._tool_calls and not payload.get("diffusing")
+
+    def interrupted(self, error: BaseException) -> StreamInterruptedError:
+        """Build the error raised when the stream cannot be continued."""
+        return StreamInterruptedError(
+            f"Stream interrupted after {self.chunks} chunks: {error}",
+            partial_content=self.partial_content,
+            chunks_received=self.chunks,
+        )
+
+    def restart(self) -> None:
+        """Prepare to skip everything yielded so far on the next attempt."""
+        self._skip = {
+            index: sum(map(len, parts)) for index, parts in self._content.items()
+        }
+
+    def advance(
+        self, chunk: ChatCompletionResponse
+    ) -> Optional[ChatCompletionResponse]:
+        """Record a received chunk and return the part the caller has not seen.
+
+        Returns:
+            The chunk, trimmed of already-yielded text, or None if nothing is
+            left to yield
+        """
+        if self._skip:
+            trimmed = self._trim(chunk)
+            if trimmed is None:
+                return None
+            chunk = trimmed
+        for choice in chunk.choices:
+            delta = choice.delta
+            if delta is None:
+                continue
+            if delta.content:
+                self._content.setdefault(choice.index, []).append(delta.content)
+            if delta.tool_calls:
+                self._tool_calls = True
+        self.chunks += 1
+        return chunk
+
+    def _trim(self, chunk: ChatCompletionResponse) -> Optional[ChatCompletionResponse]:
+        choices = []
+        for choice in chunk.choices:
+            delta = choice.delta
+            skip = self._skip.get(choice.index, 0)
+            if delta is None or not skip:
+                choices.append(choice)
+                continue
+            content = delta.content or ""
+            if len(content) <= skip:
+                self._skip[choice.index] = skip - len(content)
+                content = ""
+            else:
+                self._skip[choice.index] = 0
+                content = content[skip:]
+            if content or choice.finish_reason is not None:
+                # The role was already sent with the first yielded chunk.
+                delta = delta.model_copy(
+                    update={"content": content or None, "role": None}
+                )
+                choices.append(choice.model_copy(update={"delta": delta}))
+        if not any(self._skip.values()):
+            self._skip = {}
+        if not choices and chunk.choices and chunk.usage is None:
+            return None
+        return chunk.model_copy(update={"choices": choices})
@@ -0,0 +1,241 @@
+"""Text-only views of streamed chat completions.
+
+:class:`TextStream` and :class:`AsyncTextStream` wrap the chunks of
+``chat_completion_stream`` and yield only the content of the first choice.
+Deltas can be coalesced, so that consumers re-rendering or forwarding every
+yield handle a burst of tiny chunks as one string. The finish reason and the
+usage reported by the API are kept on the stream object once it ends.
+"""
+
+import asyncio
+import contextlib
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional, Union
+
+# Chunk types yielded by chat_completion_stream
+Chunk = Any
+
+_END = object()
+
+
+class _TextState:
+    """Text extraction shared by the sync and async streams."""
+
+    def __init__(
+        self,
+        coalesce_ms: Optional[float] = None,
+        max_chars: Optional[int] = None,
+    ) -> None:
+        if coalesce_ms is not None and coalesce_ms < 0:
+            raise ValueError("coalesce_ms must not be negative")
+        if max_chars is not None and max_chars < 1:
+            raise ValueError("max_chars must be at least 1")
+        self.coalesce_ms = coalesce_ms
+        self.max_chars = max_chars
+        self.finish_reason: Optional[str] = None
+        self.usage: Optional[Any] = None
+
+    @property
+    def _window(self) -> Optional[float]:
+        return None if self.coalesce_ms is None else self.coalesce_ms / 1000
+
+    def _consume(self, chunk: Chunk) -> Optional[str]:
+        """Record the chunk's metadata and return its text, if any."""
+        if chunk.usage is not None:
+            self.usage = chunk.usage
+        text = None
+        for choice in chunk.choices:
+            if choice.index != 0:
+                continue
+            if choice.finish_reason is not None:
+                self.finish_reason = choice.finish_reason
+            if choice.delta is not None:
+                text = choice.delta.content
+        return text
+
+
+class TextStream(_TextState):
+    """Iterator over the text deltas of a streamed chat completion.
+
+    With ``coalesce_ms`` or ``max_chars`` set, deltas are merged until the
+    first of them is ``coalesce_ms`` old or ``max_chars`` characters are
+    buffered. Without a background thread the age is checked when the next
+    delta arrives, so a pause in the stream delays the buffered text until
+    then; :class:`AsyncTextStream` flushes on time.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterator[Chunk],
+        coalesce_ms: Optional[float] = None,
+        max_chars: Optional[int] = None,
+    ) -> None:
+        """Initialize text stream.
+
+        Args:
+            chunks: Chunks of ``chat_completion_stream``
+            coalesce_ms: Maximum age in milliseconds of a buffered delta
+            max_chars: Characters after which buffered deltas are yielded
+        """
+        super().__init__(coalesce_ms, max_chars)
+        self._chunks = chunks
+
+    def __iter__(self) -> "TextStream":
+        return self
+
+    def __next__(self) -> str:
+        window = self._window
+        max_chars = self.max_chars
+        buffer: List[str] = []
+        size = 0
+        started = 0.0
+        for chunk in self._chunks:
+            text = self._consume(chunk)
+            if not text:
+                continue
+            if window is None and max_chars is None:
+                return text
+            if not buffer:
+                started = time.monotonic()
+            buffer.append(text)
+            size += len(text)
+            if (max_chars is not None and size >= max_chars) or (
+                window is not None and time.monotonic() - started >= window
+            ):
+                return "".join(buffer)
+        if buffer:
+            return "".join(buffer)
+        raise StopIteration
+
+    def close(self) -> None:
+        """Stop the underlying stream and release its connection."""
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+
+
+class AsyncTextStream(_TextState):
+    """Async iterator over the text deltas of a streamed chat completion.
+
+    With ``coalesce_ms`` set, the stream is read by a background task so
+    that buffered text is yielded once its first delta is ``coalesce_ms``
+    old, even while the API pauses. ``max_chars`` yields as soon as that many
+    characters are buffered.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterator[Chunk],
+        coalesce_ms: Optional[float] = None,
+        max_chars: Optional[int] = None,
+    ) -> None:
+        """Initialize async text stream.
+
+        Args:
+            chunks: Chunks of ``chat_completion_stream``
+            coalesce_ms: Maximum age in milliseconds of a buffered delta
+            max_chars: Characters after which buffered deltas are yielded
+        """
+        super().__init__(coalesce_ms, max_chars)
+        self._chunks = chunks
+        self._queue: Optional[asyncio.Queue[Union[str, object]]] = None
+        self._reader: Optional[asyncio.Task[None]] = None
+        self._error: Optional[BaseException] = None
+        self._done = False
+
+    def __aiter__(self) -> "AsyncTextStream":
+        return self
+
+    async def __anext__(self) -> str:
+        if self._done:
+            raise StopAsyncIteration
+        if self._window is None:
+            return await self._next_direct()
+        return await self._next_timed()
+
+    async def aclose(self) -> None:
+        """Stop the underlying stream and release its connection."""
+        self._done = True
+        if self._reader is not None:
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader
+            self._reader = None
+        else:
+            aclose = getattr(self._chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def _next_direct(self) -> str:
+        max_chars = self.max_chars
+        buffer: List[str] = []
+        size = 0
+        async for chunk in self._chunks:
+            text = self._consume(chunk)
+            if not text:
+                continue
+            if max_chars is None:
+                return text
+            buffer.append(text)
+            size += len(text)
+            if size >= max_chars:
+                return "".join(buffer)
+        self._done = True
+        if buffer:
+            return "".join(buffer)
+        raise StopAsyncIteration
+
+    async def _next_timed(self) -> str:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._reader = asyncio.ensure_future(self._read())
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        window = self._window
+        assert window is not None
+        buffer: List[str] = []
+        size = 0
+        deadline = 0.0
+        while True:
+            if buffer:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    return "".join(buffer)
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    return "".join(buffer)
+            else:
+                item = await queue.get()
+            if item is _END:
+                # Yield what is buffered first; the next call ends the stream.
+                queue.put_nowait(_END)
+                if buffer:
+                    return "".join(buffer)
+                self._done = True
+                self._reader = None
+                if self._error is not None:
+                    raise self._error
+                raise StopAsyncIteration
+            assert isinstance(item, str)
+            if not buffer:
+                deadline = loop.time() + window
+            buffer.append(item)
+            size += len(item)
+            if self.max_chars is not None and size >= self.max_chars:
+                return "".join(buffer)
+
+    async def _read(self) -> None:
+        """Drive the chunk iterator in one task, queueing the text."""
+        assert self._queue is not None
+        try:
+            async for chunk in self._chunks:
+                text = self._consume(chunk)
+                if text:
+                    self._queue.put_nowait(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._error = e
+        finally:
+            self._queue.put_nowait(_END)
@@ -0,0 +1,79 @@
+"""Response bodies and transports shared by the tests."""
+
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from mercury_client.utils.codec import (
+    PYDANTIC_CODEC,
+    JSONCodec,
+    msgspec_codec,
+    orjson_codec,
+)
+
+
+def chat_response(
+    content: str = "Hello!",
+    prompt_tokens: int = 5,
+    completion_tokens: int = 2,
+) -> Dict[str, Any]:
+    """Build a chat completion response body answering ``content``."""
+    return {
+        "id": "chatcmpl-123",
+        "object": "chat.completion",
+        "created": 1677649420,
+        "model": "mercury-coder-small",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+CHAT_RESPONSE = chat_response()
+
+FIM_RESPONSE = {
+    "id": "cmpl-123",
+    "object": "text_completion",
+    "created": 1677649420,
+    "model": "mercury-coder-small",
+    "choices": [{"index": 0, "text": "return a + b", "finish_reason": "stop"}],
+}
+
+
+def json_transport(
+    body: Dict[str, Any] = CHAT_RESPONSE,
+    calls: Optional[List[httpx.Request]] = None,
+) -> httpx.MockTransport:
+    """Build a mock transport answering every request with ``body``.
+
+    Args:
+        body: JSON response body
+        calls: List recording every request received, if given
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if calls is not None:
+            calls.append(request)
+        return httpx.Response(200, json=body)
+
+    return httpx.MockTransport(handler)
+
+
+def installed_codecs() -> List[JSONCodec]:
+    """Return every codec whose backend is installed."""
+    codecs = [PYDANTIC_CODEC]
+    for factory in (orjson_codec, msgspec_codec):
+        try:
+            codecs.append(factory())
+        except ImportError:
+            continue
+    return codecs
@@ -0,0 +1,183 @@
+"""Tests for assembling streamed chat completions."""
+
+import json
+
+import httpx
+import pytest
+
+from mercury_client import AsyncMercuryClient, MercuryClient, StreamConfig
+from mercury_client.models import ChatCompletionResponse
+from mercury_client.utils.accumulator import StreamAccumulator
+from mercury_client.utils.sse import ServerSentEvent
+from mercury_client.utils.streaming import parse_chunk
+
+
+def chunk(delta=None, finish_reason=None, index=0, usage=None, fast=False):
+    data = {
+        "id": "chatcmpl-123",
+        "object": "chat.completion.chunk",
+        "created": 1677649420,
+        "model": "mercury-coder-small",
+        "choices": (
+            [{"index": index, "delta": delta or {}, "finish_reason": finish_reason}]
+            if usage is None
+            else []
+        ),
+    }
+    if usage is not None:
+        data["usage"] = usage
+    return parse_chunk(ServerSentEvent(json.dumps(data).encode()), fast=fast)
+
+
+def tool_call_stream(fast=False):
+    return [
+        chunk({"role": "assistant"}, fast=fast),
+        chunk(
+            {
+                "tool_calls": [
+                    {
+                        "index": 0,
+                        "id": "call_1",
+                        "type": "function",
+                        "function": {"name": "get_weather", "arguments": ""},
+                    }
+                ]
+            },
+            fast=fast,
+        ),
+        chunk(
+            {"tool_calls": [{"index": 0, "function": {"arguments": '{"city": '}}]},
+            fast=fast,
+        ),
+        chunk(
+            {
+                "tool_calls": [
+                    {
+                        "index": 1,
+                        "id": "call_2",
+                        "function": {"name": "get_time"},
+                    }
+                ]
+            },
+            fast=fast,
+        ),
+        chunk(
+            {"tool_calls": [{"index": 0, "function": {"arguments": '"Paris"}'}}]},
+            fast=fast,
+        ),
+        chunk(finish_reason="tool_calls", fast=fast),
+    ]
+
+
+class TestStreamAccumulator:
+    """Test assembling chunks into a complete response."""
+
+    def test_content_and_usage(self):
+        """Test content fragments and usage are assembled."""
+        accumulator = StreamAccumulator()
+        for c in [
+            chunk({"role": "assistant", "content": "Hel"}),
+            chunk({"content": "lo"}),
+            chunk(finish_reason="stop"),
+            chunk(
+                usage={"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3}
+            ),
+        ]:
+            accumulator.add(c)
+
+        response = accumulator.response()
+        assert isinstance(response, ChatCompletionResponse)
+        assert response.object == "chat.completion"
+        assert response.choices[0].message.content == "Hello"
+        assert response.choices[0].finish_reason == "stop"
+        assert response.usage.total_tokens == 3
+        assert accumulator.complete
+
+    @pytest.mark.parametrize("fast", [False, True])
+    def test_tool_call_fragments_merged_by_index(self, fast):
+        """Test argument fragments are joined per tool call."""
+        accumulator = StreamAccumulator()
+        for c in tool_call_stream(fast):
+            accumulator.add(c)
+
+        calls = accumulator.response().choices[0].message.tool_calls
+        assert [(c.id, c.function.name, c.function.arguments) for c in calls] == [
+            ("call_1", "get_weather", '{"city": "Paris"}'),
+            ("call_2", "get_time", ""),
+        ]
+
+    def test_multiple_choices(self):
+        """Test choices are assembled separately and in index order."""
+        accumulator = StreamAccumulator()
+        accumulator.add(chunk({"content": "b"}, index=1))
+        accumulator.add(chunk({"content": "a"}, index=0))
+        accumulator.add(chunk(finish_reason="stop", index=0))
+        assert not accumulator.complete
+        accumulator.add(chunk(finish_reason="stop", index=1))
+
+        response = accumulator.response()
+        assert [c.message.content for c in response.choices] == ["a", "b"]
+        assert accumulator.complete
+
+    def test_diffusing_keeps_latest_frame(self):
+        """Test diffusing streams keep the last full text."""
+        accumulator = StreamAccumulator(diffusing=True)
+        for text in ["d?f", "def f", "def f():"]:
+            accumulator.add(chunk({"content": text}))
+        assert accumulator.response().choices[0].message.content == "def f():"
+
+    def test_empty(self):
+        """Test building a response without chunks fails."""
+        with pytest.raises(ValueError, match="No chunks"):
+            StreamAccumulator().response()
+
+
+class TestClientAccumulation:
+    """Test wrapping client streams."""
+
+    def body(self):
+        chunks = [
+            chunk({"role": "assistant", "content": "Hello"}),
+            chunk({"content": " world!"}),
+            chunk(finish_reason="stop"),
+        ]
+        return (
+            "".join(f"data: {c.model_dump_json(exclude_none=True)}\n\n" for c in chunks)
+            + "data: [DONE]\n\n"
+        )
+
+    def test_wrap_sync_stream(self):
+        """Test chunks pass through while being accumulated."""
+        transport = httpx.MockTransport(lambda r: httpx.Response(200, text=self.body()))
+        accumulator = StreamAccumulator()
+        with MercuryClient(
+            api_key="test-key",
+            transport=transport,
+            stream_config=StreamConfig(fast_chunks=True),
+        ) as client:
+            chunks = list(
+                accumulator.wrap(
+                    client.chat_completion_stream(
+                        messages=[{"role": "user", "content": "Hi"}]
+                    )
+                )
+            )
+
+        assert len(chunks) == 3
+        assert accumulator.response().choices[0].message.content == "Hello world!"
+
+    async def test_wrap_async_stream(self):
+        """Test the async wrapper."""
+        transport = httpx.MockTransport(lambda r: httpx.Response(200, text=self.body()))
+        accumulator = StreamAccumulator()
+        async with AsyncMercuryClient(
+            api_key="test-key", transport=transport
+        ) as client:
+            async for _ in accumulator.awrap(
+                client.chat_completion_stream(
+                    messages=[{"role": "user", "content": "Hi"}]
+                )
+            ):
+                pass
+
+        assert accumulator.response().choices[0].message.content == "Hello world!"
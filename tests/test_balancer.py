@@ -0,0 +1,267 @@
+"""Tests for multi-endpoint load balancing."""
+
+import asyncio
+import gc
+import json
+import time
+import weakref
+
+import httpx
+import pytest
+
+from mercury_client import (
+    AsyncMercuryClient,
+    BalancerConfig,
+    MercuryClient,
+    RetryConfig,
+)
+from mercury_client.exceptions import AuthenticationError, ServerError
+from mercury_client.utils.balancer import LoadBalancer
+from tests.helpers import CHAT_RESPONSE
+
+URLS = ["https://a.example.com/v1", "https://b.example.com/v1"]
+MESSAGES = [{"role": "user", "content": "Hi"}]
+
+
+def router(down=()):
+    """Build a handler failing on the hosts in ``down``, recording hosts."""
+    hosts = []
+
+    def handler(request):
+        hosts.append(request.url.host)
+        if request.url.host in down:
+            return httpx.Response(500, json={"error": {"message": "boom"}})
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    handler.hosts = hosts
+    return handler
+
+
+class TestLoadBalancer:
+    """Test endpoint selection and ejection."""
+
+    def test_least_outstanding(self):
+        """Test requests go to the endpoint with the fewest in flight."""
+        balancer = LoadBalancer(URLS)
+        first = balancer.acquire()
+        second = balancer.acquire()
+        assert {first.url, second.url} == set(URLS)
+        balancer.release(first, 0.1)
+        assert balancer.acquire() is first
+
+    def test_ewma_prefers_faster_endpoint(self):
+        """Test the EWMA policy routes to the endpoint with lower latency."""
+        balancer = LoadBalancer(URLS, BalancerConfig(policy="ewma"))
+        fast, slow = balancer.endpoints
+        balancer.release(balancer.acquire(), 0.0)
+        balancer.release(balancer.acquire(), 0.0)
+        fast.latency, slow.latency = 0.1, 1.0
+        assert all(balancer.acquire() is fast for _ in range(5))
+
+    def test_ejection_and_probe(self):
+        """Test consecutive failures eject and a probe restores an endpoint."""
+        balancer = LoadBalancer(URLS, BalancerConfig(failure_threshold=2))
+        bad = balancer.endpoints[0]
+        for _ in range(2):
+            bad.outstanding += 1
+            balancer.release(bad, 0.1, ServerError())
+        assert balancer.ejected() == [bad]
+        assert all(balancer.acquire() is not bad for _ in range(5))
+
+        balancer.probe_result(bad, False)
+        assert not bad.healthy
+        balancer.probe_result(bad, True)
+        assert bad.healthy
+        assert balancer.stats()[0].ejections == 1
+
+    def test_restored_endpoint_receives_traffic_under_ewma(self):
+        """Test a probe clears the latency measured before the ejection."""
+        balancer = LoadBalancer(
+            URLS, BalancerConfig(policy="ewma", failure_threshold=1)
+        )
+        bad, good = balancer.endpoints
+        for endpoint, latency in ((bad, 30.0), (good, 0.2)):
+            endpoint.outstanding += 1
+            balancer.release(endpoint, latency)
+        bad.outstanding += 1
+        balancer.release(bad, 30.0, ServerError())
+        assert balancer.ejected() == [bad]
+
+        balancer.probe_result(bad, True)
+        assert balancer.acquire() is bad
+
+    def test_client_errors_do_not_eject(self):
+        """Test 4xx responses count as the endpoint answering."""
+        balancer = LoadBalancer(URLS, BalancerConfig(failure_threshold=1))
+        endpoint = balancer.acquire()
+        balancer.release(endpoint, 0.1, AuthenticationError())
+        assert endpoint.healthy
+
+    def test_all_ejected_still_routes(self):
+        """Test an endpoint is still chosen when every one is ejected."""
+        balancer = LoadBalancer(URLS, BalancerConfig(failure_threshold=1))
+        for endpoint in balancer.endpoints:
+            endpoint.outstanding += 1
+            balancer.release(endpoint, 0.1, httpx.ConnectError("refused"))
+        assert balancer.acquire() in balancer.endpoints
+
+    def test_route_latency_from_first_response(self):
+        """Test a route records latency up to its first response."""
+        balancer = LoadBalancer(URLS[:1], BalancerConfig(policy="ewma"))
+        route = balancer.route()
+        with route as endpoint:
+            route.responded()
+            time.sleep(0.05)
+            route.responded()
+        assert endpoint.latency < 0.05
+        assert endpoint.outstanding == 0
+
+
+class TestClientBalancing:
+    """Test both clients route requests across endpoints."""
+
+    def test_requests_spread_across_endpoints(self):
+        """Test each endpoint receives requests from one client."""
+        handler = router()
+        with MercuryClient(
+            api_key="test-key",
+            base_url=URLS,
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            for _ in range(20):
+                client.chat_completion(messages=MESSAGES)
+            stats = client.endpoint_stats()
+
+        assert set(handler.hosts) == {"a.example.com", "b.example.com"}
+        assert sum(s.requests for s in stats) == 20
+
+    def test_stream_latency_is_time_to_first_chunk(self):
+        """Test a long stream does not inflate its endpoint's latency."""
+        chunk = {**CHAT_RESPONSE, "object": "chat.completion.chunk"}
+        chunk["choices"] = [{"index": 0, "delta": {"content": "Hi"}}]
+
+        def events():
+            for _ in range(3):
+                yield b"data: " + json.dumps(chunk).encode() + b"\n\n"
+                time.sleep(0.05)
+            yield b"data: [DONE]\n\n"
+
+        def handler(request):
+            return httpx.Response(
+                200, content=events(), headers={"content-type": "text/event-stream"}
+            )
+
+        with MercuryClient(
+            api_key="test-key",
+            base_url=URLS,
+            transport=httpx.MockTransport(handler),
+            balancer_config=BalancerConfig(policy="ewma"),
+        ) as client:
+            assert len(list(client.chat_completion_stream(messages=MESSAGES))) == 3
+            stats = client.endpoint_stats()
+
+        assert max(s.latency for s in stats) < 0.1
+
+    def test_retry_moves_to_healthy_endpoint(self):
+        """Test a failing endpoint is ejected and retries go elsewhere."""
+        handler = router(down={"a.example.com"})
+        with MercuryClient(
+            api_key="test-key",
+            base_url=URLS,
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(initial_delay=0.0, jitter=False),
+            balancer_config=BalancerConfig(
+                failure_threshold=2, health_check_interval=60.0
+            ),
+        ) as client:
+            for _ in range(10):
+                response = client.chat_completion(messages=MESSAGES)
+                assert response.choices[0].message.content == "Hello!"
+            stats = {s.url: s for s in client.endpoint_stats()}
+
+        assert not stats[URLS[0]].healthy
+        assert stats[URLS[0]].failures == 2
+        assert handler.hosts.count("a.example.com") == 2
+
+    def test_health_check_restores_endpoint(self):
+        """Test the background probe brings an ejected endpoint back."""
+        handler = router()
+        with MercuryClient(
+            api_key="test-key",
+            base_url=URLS,
+            transport=httpx.MockTransport(handler),
+            balancer_config=BalancerConfig(health_check_interval=0.01),
+        ) as client:
+            assert client._health_thread is None
+            client.chat_completion(messages=MESSAGES)
+            endpoint = client._balancer.endpoints[0]
+            endpoint.healthy = False
+            for _ in range(100):
+                if endpoint.healthy:
+                    break
+                client._closed.wait(0.01)
+            assert endpoint.healthy
+
+    def test_unclosed_client_is_collected(self):
+        """Test the health check thread does not keep the client alive."""
+        client = MercuryClient(
+            api_key="test-key",
+            base_url=URLS,
+            transport=httpx.MockTransport(router()),
+            balancer_config=BalancerConfig(health_check_interval=0.01),
+        )
+        client.chat_completion(messages=MESSAGES)
+        thread = client._health_thread
+        ref = weakref.ref(client)
+        del client
+        gc.collect()
+
+        assert ref() is None
+        thread.join(timeout=1.0)
+        assert not thread.is_alive()
+
+    def test_single_url_has_no_balancer(self):
+        """Test a single base URL keeps the plain request path."""
+        client = MercuryClient(api_key="test-key", base_url="https://x.example.com/v1/")
+        assert client.base_url == "https://x.example.com/v1"
+        assert client.endpoint_stats() == []
+        client.close()
+
+    def test_empty_base_url_list(self):
+        """Test an empty endpoint list is rejected."""
+        with pytest.raises(ValueError, match="base URL"):
+            MercuryClient(api_key="test-key", base_url=[])
+
+    async def test_async_client_ejects_and_recovers(self):
+        """Test the async client ejects a failing endpoint and probes it."""
+        down = {"a.example.com"}
+        hosts = []
+
+        async def handler(request):
+            hosts.append(request.url.host)
+            if request.url.host in down:
+                return httpx.Response(503, json={"error": {"message": "boom"}})
+            return httpx.Response(200, json=CHAT_RESPONSE)
+
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            base_url=URLS,
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(initial_delay=0.0, jitter=False),
+            balancer_config=BalancerConfig(
+                failure_threshold=1, health_check_interval=0.01
+            ),
+        ) as client:
+            await asyncio.gather(
+                *[client.chat_completion(messages=MESSAGES) for _ in range(5)]
+            )
+            endpoint = client._balancer.endpoints[0]
+            assert endpoint.ejections >= 1
+
+            down.clear()
+            for _ in range(100):
+                if endpoint.healthy:
+                    break
+                await asyncio.sleep(0.01)
+            assert endpoint.healthy
+        assert client._health_task is None
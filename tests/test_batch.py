@@ -0,0 +1,191 @@
+"""Tests for bounded-concurrency batch execution."""
+
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from mercury_client import AsyncMercuryClient, MercuryClient
+from mercury_client.models import ChatCompletionRequest
+from mercury_client.utils.batch import run_batch_async
+from tests.helpers import chat_response
+
+
+class TestRunBatchAsync:
+    """Test the batch runner."""
+
+    async def test_concurrency_limit_and_order(self):
+        """Test in-flight calls never exceed the limit and order is kept."""
+        in_flight = 0
+        peak = 0
+
+        async def worker(n):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001 * (10 - n % 10))
+            in_flight -= 1
+            return n * 2
+
+        results = [r async for r in run_batch_async(range(30), worker, concurrency=4)]
+
+        assert peak <= 4
+        assert [r.index for r in results] == list(range(30))
+        assert [r.response for r in results] == [n * 2 for n in range(30)]
+
+    async def test_as_completed(self):
+        """Test unordered mode yields results as they finish."""
+
+        async def worker(n):
+            await asyncio.sleep(0.02 if n == 0 else 0)
+            return n
+
+        results = [
+            r.index
+            async for r in run_batch_async(
+                range(3), worker, concurrency=3, ordered=False
+            )
+        ]
+        assert sorted(results) == [0, 1, 2]
+        assert results[-1] == 0
+
+    async def test_errors_are_captured(self):
+        """Test failures in prepare and worker do not abort the batch."""
+
+        async def worker(n):
+            if n == 2:
+                raise RuntimeError("worker failed")
+            return n
+
+        def prepare(n):
+            if n == 1:
+                raise ValueError("invalid")
+            return n
+
+        results = [r async for r in run_batch_async(range(4), worker, prepare=prepare)]
+        assert [r.ok for r in results] == [True, False, False, True]
+        assert isinstance(results[1].error, ValueError)
+        assert isinstance(results[2].error, RuntimeError)
+
+    async def test_async_iterable_input(self):
+        """Test async iterables are consumed lazily."""
+
+        async def source():
+            for n in range(5):
+                yield n
+
+        async def worker(n):
+            return n
+
+        results = [r.response async for r in run_batch_async(source(), worker)]
+        assert results == [0, 1, 2, 3, 4]
+
+    async def test_input_failure_propagates(self):
+        """Test an exception raised by the input iterable is surfaced."""
+
+        def source():
+            yield 1
+            raise OSError("input broken")
+
+        async def worker(n):
+            return n
+
+        with pytest.raises(OSError, match="input broken"):
+            async for _ in run_batch_async(source(), worker):
+                pass
+
+
+class TestClientBatch:
+    """Test batch methods on the async client."""
+
+    async def test_chat_completion_batch(self):
+        """Test a batch of chat requests including an invalid one."""
+
+        def handler(request):
+            content = json.loads(request.content)["messages"][0]["content"]
+            return httpx.Response(200, json=chat_response(content.upper()))
+
+        requests = [
+            {"messages": [{"role": "user", "content": "a"}]},
+            {"messages": [{"role": "robot", "content": "b"}]},
+            ChatCompletionRequest(messages=[{"role": "user", "content": "c"}]),
+        ]
+        async with AsyncMercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(handler)
+        ) as client:
+            results = [
+                r async for r in client.chat_completion_batch(requests, concurrency=2)
+            ]
+
+        assert results[0].response.choices[0].message.content == "A"
+        assert not results[1].ok
+        assert results[2].response.choices[0].message.content == "C"
+        assert results[2].request is requests[2]
+
+    async def test_fim_completion_batch_rejects_streams(self):
+        """Test streaming items are reported as errors."""
+        async with AsyncMercuryClient(api_key="test-key") as client:
+            results = [
+                r
+                async for r in client.fim_completion_batch(
+                    [{"prompt": "x", "stream": True}]
+                )
+            ]
+        assert isinstance(results[0].error, ValueError)
+
+
+class TestSyncBatch:
+    """Test thread-pool batch methods on the sync client."""
+
+    def test_chat_completion_batch_parallel(self):
+        """Test requests run concurrently and keep input order."""
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def handler(request):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            content = json.loads(request.content)["messages"][0]["content"]
+            return httpx.Response(200, json=chat_response(content))
+
+        requests = [
+            {"messages": [{"role": "user", "content": str(n)}]} for n in range(12)
+        ]
+        requests[5] = {"messages": "not a list"}
+        with MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            max_workers=4,
+        ) as client:
+            results = list(client.chat_completion_batch(requests))
+
+        assert 1 < peak <= 4
+        assert [r.index for r in results] == list(range(12))
+        assert not results[5].ok
+        assert results[11].response.choices[0].message.content == "11"
+
+    def test_map_as_completed(self):
+        """Test map yields results as they complete and captures errors."""
+
+        def work(n):
+            if n == 3:
+                raise KeyError(n)
+            time.sleep(0.05 if n == 0 else 0)
+            return n
+
+        with MercuryClient(api_key="test-key") as client:
+            results = list(client.map(work, range(4), concurrency=4, ordered=False))
+
+        assert results[-1].index == 0
+        failed = [r for r in results if not r.ok]
+        assert len(failed) == 1
+        assert isinstance(failed[0].error, KeyError)
@@ -0,0 +1,200 @@
+"""Tests for the mercury-batch command."""
+
+import functools
+import json
+from pathlib import Path
+
+import pytest
+
+from mercury_client import batch_cli
+from mercury_client.async_client import AsyncMercuryClient
+from mercury_client.batch_cli import Checkpoint, main, parse_line
+from mercury_client.utils.retry import RetryConfig
+from tests.helpers import chat_response
+
+
+@pytest.fixture
+def api_key(monkeypatch):
+    """Provide an API key through the environment."""
+    monkeypatch.setenv("MERCURY_API_KEY", "test-key")
+
+
+class TestParseLine:
+    """Test input line parsing."""
+
+    def test_flat_chat_line(self):
+        """Test a flat chat request with an id."""
+        line_id, endpoint, params = parse_line(
+            '{"id": "a", "messages": [{"role": "user", "content": "x"}]}', "m"
+        )
+        assert (line_id, endpoint, params["model"]) == ("a", "chat", "m")
+        assert "id" not in params
+
+    def test_openai_batch_line(self):
+        """Test the custom_id/url/body layout."""
+        line_id, endpoint, params = parse_line(
+            '{"custom_id": "b", "url": "/v1/fim/completions", "body": {"prompt": "x"}}'
+        )
+        assert (line_id, endpoint, params) == ("b", "fim", {"prompt": "x"})
+
+
+class TestCheckpoint:
+    """Test the compact checkpoint."""
+
+    def test_watermark_advances(self, tmp_path):
+        """Test out-of-order completions collapse into the watermark."""
+        checkpoint = Checkpoint(str(tmp_path / "ckpt"))
+        for line in (2, 0, 3):
+            checkpoint.mark(line)
+        assert (checkpoint.watermark, checkpoint.done) == (1, {2, 3})
+        checkpoint.mark(1)
+        assert (checkpoint.watermark, checkpoint.done) == (4, set())
+
+        checkpoint.mark(6)
+        checkpoint.save()
+        loaded = Checkpoint.load(checkpoint.path)
+        assert 3 in loaded
+        assert 6 in loaded
+        assert 5 not in loaded
+
+
+class TestBatchCLI:
+    """Test running the command end to end."""
+
+    def test_run_and_resume(self, tmp_path, httpx_mock, api_key, capsys):
+        """Test results are written and finished lines are not re-sent."""
+        httpx_mock.add_response(
+            method="POST",
+            url="https://api.inceptionlabs.ai/v1/chat/completions",
+            json=chat_response("hi", prompt_tokens=3),
+            is_reusable=True,
+        )
+        source = tmp_path / "in.jsonl"
+        source.write_text(
+            "\n".join(
+                [
+                    json.dumps(
+                        {"id": "a", "messages": [{"role": "user", "content": "1"}]}
+                    ),
+                    "",
+                    "not json",
+                    json.dumps(
+                        {"id": "b", "messages": [{"role": "user", "content": "2"}]}
+                    ),
+                ]
+            )
+            + "\n"
+        )
+        output = tmp_path / "out.jsonl"
+
+        assert main([str(source), "-o", str(output), "-c", "2"]) == 1
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        by_line = {r["line"]: r for r in records}
+        assert set(by_line) == {0, 2, 3}
+        assert by_line[0]["id"] == "a"
+        assert by_line[3]["response"]["choices"][0]["message"]["content"] == "hi"
+        assert by_line[2]["error"]["type"] == "JSONDecodeError"
+        assert "tokens: 6 prompt, 4 completion" in capsys.readouterr().err
+
+        assert main([str(source), "-o", str(output)]) == 0
+        assert len(httpx_mock.get_requests()) == 2
+        assert len(output.read_text().splitlines()) == 3
+
+    def test_resume_retries_failed_lines(
+        self, tmp_path, httpx_mock, api_key, monkeypatch
+    ):
+        """Test lines that failed on the API side are sent again on resume."""
+        monkeypatch.setattr(
+            batch_cli,
+            "AsyncMercuryClient",
+            functools.partial(
+                AsyncMercuryClient, retry_config=RetryConfig(max_retries=0)
+            ),
+        )
+        url = "https://api.inceptionlabs.ai/v1/chat/completions"
+        httpx_mock.add_response(method="POST", url=url, status_code=503)
+        httpx_mock.add_response(method="POST", url=url, json=chat_response("hi"))
+        source = tmp_path / "in.jsonl"
+        source.write_text(
+            json.dumps({"id": "a", "messages": [{"role": "user", "content": "1"}]})
+            + "\n"
+        )
+        output = tmp_path / "out.jsonl"
+
+        assert main([str(source), "-o", str(output)]) == 1
+        assert main([str(source), "-o", str(output)]) == 0
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert "error" in records[0]
+        assert records[1]["response"]["choices"][0]["message"]["content"] == "hi"
+        assert len(httpx_mock.get_requests()) == 2
+
+        assert main([str(source), "-o", str(output)]) == 0
+        assert len(httpx_mock.get_requests()) == 2
+
+    def test_failed_lines_do_not_hold_back_the_watermark(
+        self, tmp_path, httpx_mock, api_key, monkeypatch
+    ):
+        """Test failed lines are queued aside while the watermark advances."""
+        monkeypatch.setattr(
+            batch_cli,
+            "AsyncMercuryClient",
+            functools.partial(
+                AsyncMercuryClient, retry_config=RetryConfig(max_retries=0)
+            ),
+        )
+        url = "https://api.inceptionlabs.ai/v1/chat/completions"
+        httpx_mock.add_response(method="POST", url=url, status_code=503)
+        httpx_mock.add_response(
+            method="POST", url=url, json=chat_response("hi"), is_reusable=True
+        )
+        source = tmp_path / "in.jsonl"
+        source.write_text(
+            "".join(
+                json.dumps({"id": n, "messages": [{"role": "user", "content": "x"}]})
+                + "\n"
+                for n in range(4)
+            )
+        )
+        output = tmp_path / "out.jsonl"
+        checkpoint = tmp_path / "out.jsonl.checkpoint"
+
+        assert main([str(source), "-o", str(output), "-c", "1"]) == 1
+        saved = json.loads(checkpoint.read_text())
+        assert (saved["watermark"], saved["done"]) == (4, [])
+        assert Path(f"{checkpoint}.retry").read_text().count("\n") == 1
+
+        assert main([str(source), "-o", str(output)]) == 0
+        assert len(httpx_mock.get_requests()) == 5
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [r["id"] for r in records] == [0, 1, 2, 3, 0]
+        assert "response" in records[-1]
+        assert json.loads(checkpoint.read_text())["retry_offset"] == 0
+        assert not Path(f"{checkpoint}.retry").exists()
+
+    def test_client_errors_are_not_retried(
+        self, tmp_path, httpx_mock, api_key, monkeypatch
+    ):
+        """Test requests the API rejected with a 4xx are not sent again."""
+        monkeypatch.setattr(
+            batch_cli,
+            "AsyncMercuryClient",
+            functools.partial(
+                AsyncMercuryClient, retry_config=RetryConfig(max_retries=0)
+            ),
+        )
+        httpx_mock.add_response(
+            method="POST",
+            url="https://api.inceptionlabs.ai/v1/chat/completions",
+            status_code=400,
+            json={"error": {"message": "bad request"}},
+        )
+        source = tmp_path / "in.jsonl"
+        source.write_text(
+            json.dumps({"messages": [{"role": "user", "content": "1"}]}) + "\n"
+        )
+        output = tmp_path / "out.jsonl"
+
+        assert main([str(source), "-o", str(output)]) == 1
+        assert main([str(source), "-o", str(output)]) == 0
+        assert len(httpx_mock.get_requests()) == 1
+        assert len(output.read_text().splitlines()) == 1
@@ -0,0 +1,224 @@
+"""Tests for the in-memory response cache."""
+
+import time
+
+import httpx
+
+from mercury_client import AsyncMercuryClient, MercuryClient
+from mercury_client.models import ChatCompletionResponse
+from mercury_client.utils.cache import ResponseCache, cache_key, replay_stream
+from tests.helpers import CHAT_RESPONSE, FIM_RESPONSE, json_transport
+
+
+class TestResponseCache:
+    """Test LRU, TTL and size limits."""
+
+    def test_hit_and_miss_counters(self):
+        """Test hits and misses are counted."""
+        cache = ResponseCache()
+        assert cache.get("a") is None
+        cache.set("a", b"1")
+        assert cache.get("a") == b"1"
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+
+    def test_lru_eviction_by_entries(self):
+        """Test the least recently used entry is evicted first."""
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        cache.get("a")
+        cache.set("c", b"3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.get("c") == b"3"
+        assert cache.stats().evictions == 1
+
+    def test_eviction_by_bytes(self):
+        """Test entries are evicted to stay under the byte limit."""
+        cache = ResponseCache(max_bytes=10)
+        cache.set("a", b"x" * 6)
+        cache.set("b", b"y" * 6)
+        cache.set("huge", b"z" * 11)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == b"y" * 6
+        assert cache.get("huge") is None
+        assert cache.stats().size_bytes == 6
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL."""
+        cache = ResponseCache(ttl=60)
+        cache.set("a", b"1", ttl=0.01)
+        cache.set("b", b"2")
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == b"2"
+        assert cache.stats().expirations == 1
+
+    def test_key_ignores_stream_flags(self):
+        """Test streamed and non-streamed requests share a key."""
+        payload = {"model": "m", "messages": [{"role": "user", "content": "x"}]}
+        streamed = dict(payload, stream=True, stream_options={"include_usage": True})
+        assert cache_key("/chat/completions", payload) == cache_key(
+            "/chat/completions", streamed
+        )
+
+
+class TestClientCache:
+    """Test cache integration in the clients."""
+
+    def test_cache_hit_skips_network(self):
+        """Test a repeated request is served from the cache."""
+        calls = []
+        cache = ResponseCache()
+        client = MercuryClient(
+            api_key="test-key", transport=json_transport(calls=calls), cache=cache
+        )
+        messages = [{"role": "user", "content": "Hi"}]
+
+        first = client.chat_completion(messages=messages)
+        second = client.chat_completion(messages=messages)
+
+        assert len(calls) == 1
+        assert first == second
+        assert cache.stats().hits == 1
+
+    def test_stream_replays_cached_completion(self):
+        """Test a cached completion is replayed as a stream."""
+        calls = []
+        client = MercuryClient(
+            api_key="test-key",
+            transport=json_transport(calls=calls),
+            cache=ResponseCache(),
+        )
+        messages = [{"role": "user", "content": "Hi"}]
+        client.chat_completion(messages=messages)
+
+        chunks = list(
+            client.chat_completion_stream(
+                messages=messages, stream_options={"include_usage": True}
+            )
+        )
+
+        assert len(calls) == 1
+        assert chunks[0].object == "chat.completion.chunk"
+        assert chunks[0].choices[0].delta.content == "Hello!"
+        assert chunks[1].choices[0].finish_reason == "stop"
+        assert chunks[2].usage.total_tokens == 7
+
+    async def test_async_cache_hit(self):
+        """Test the async client shares the cache behaviour."""
+        calls = []
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=json_transport(FIM_RESPONSE, calls),
+            cache=ResponseCache(),
+        ) as client:
+            await client.fim_completion(prompt="def f(", suffix="")
+            await client.fim_completion(prompt="def f(", suffix="")
+
+        assert len(calls) == 1
+
+    def test_replay_without_usage(self):
+        """Test usage chunk is only emitted on request."""
+        response = ChatCompletionResponse(**CHAT_RESPONSE)
+        assert len(replay_stream(response)) == 2
+
+    def test_completed_stream_populates_cache(self):
+        """Test a streamed completion is cached for later requests."""
+        chunks = replay_stream(
+            ChatCompletionResponse(**CHAT_RESPONSE), include_usage=True
+        )
+        body = (
+            "".join(
+                f"data: {chunk.model_dump_json(exclude_none=True)}\n\n"
+                for chunk in chunks
+            )
+            + "data: [DONE]\n\n"
+        )
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, text=body)
+
+        client = MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            cache=ResponseCache(),
+        )
+        messages = [{"role": "user", "content": "Hi"}]
+        list(
+            client.chat_completion_stream(
+                messages=messages, stream_options={"include_usage": True}
+            )
+        )
+
+        response = client.chat_completion(messages=messages)
+        assert len(calls) == 1
+        assert response == ChatCompletionResponse(**CHAT_RESPONSE)
+
+    def test_stream_without_usage_is_not_cached(self):
+        """Test a stream lacking usage does not answer later requests."""
+        chunks = replay_stream(ChatCompletionResponse(**CHAT_RESPONSE))
+        stream_body = (
+            "".join(
+                f"data: {chunk.model_dump_json(exclude_none=True)}\n\n"
+                for chunk in chunks
+            )
+            + "data: [DONE]\n\n"
+        )
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if b'"stream":true' in request.content.replace(b" ", b""):
+                return httpx.Response(200, text=stream_body)
+            return httpx.Response(200, json=CHAT_RESPONSE)
+
+        client = MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            cache=ResponseCache(),
+        )
+        messages = [{"role": "user", "content": "Hi"}]
+        list(client.chat_completion_stream(messages=messages))
+
+        response = client.chat_completion(messages=messages)
+        assert len(calls) == 2
+        assert response.usage.total_tokens == 7
+
+    async def test_async_stream_without_usage_is_not_cached(self):
+        """Test the async client only caches streams carrying usage."""
+        chunks = replay_stream(ChatCompletionResponse(**CHAT_RESPONSE))
+        stream_body = (
+            "".join(
+                f"data: {chunk.model_dump_json(exclude_none=True)}\n\n"
+                for chunk in chunks
+            )
+            + "data: [DONE]\n\n"
+        )
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if b'"stream":true' in request.content.replace(b" ", b""):
+                return httpx.Response(200, text=stream_body)
+            return httpx.Response(200, json=CHAT_RESPONSE)
+
+        cache = ResponseCache()
+        async with AsyncMercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(handler), cache=cache
+        ) as client:
+            messages = [{"role": "user", "content": "Hi"}]
+            async for _ in client.chat_completion_stream(messages=messages):
+                pass
+            response = await client.chat_completion(messages=messages)
+
+        assert len(calls) == 2
+        assert response.usage.total_tokens == 7
@@ -0,0 +1,181 @@
+"""Tests for the circuit breaker."""
+
+import time
+
+import httpx
+import pytest
+
+from mercury_client import (
+    AsyncMercuryClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    MercuryClient,
+    RetryConfig,
+)
+from mercury_client.exceptions import (
+    AuthenticationError,
+    EngineOverloadedError,
+    ServerError,
+)
+from tests.helpers import CHAT_RESPONSE
+
+
+def fail(breaker, error=ServerError):
+    with pytest.raises(error), breaker.guard():
+        raise error()
+
+
+def succeed(breaker):
+    with breaker.guard():
+        pass
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+
+    def test_opens_on_failure_rate(self):
+        """Test the circuit opens once the failure rate crosses the threshold."""
+        breaker = CircuitBreaker(failure_threshold=0.6, minimum_requests=4)
+        succeed(breaker)
+        fail(breaker)
+        fail(breaker)
+        assert breaker.state is CircuitState.CLOSED
+        succeed(breaker)
+        assert breaker.state is CircuitState.CLOSED
+        fail(breaker)
+        assert breaker.state is CircuitState.OPEN
+
+    def test_open_fails_fast(self):
+        """Test an open circuit rejects calls with a retry hint."""
+        breaker = CircuitBreaker(minimum_requests=1, recovery_timeout=30.0)
+        fail(breaker)
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.guard()
+        assert 29.0 < exc_info.value.retry_after <= 30.0
+        assert breaker.stats().rejected == 1
+
+    def test_client_errors_are_not_failures(self):
+        """Test 4xx errors show the API is reachable."""
+        breaker = CircuitBreaker(minimum_requests=2)
+        fail(breaker, AuthenticationError)
+        fail(breaker, AuthenticationError)
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.stats().failures == 0
+
+    def test_half_open_ramps_probes_then_closes(self):
+        """Test probes double after each success until the circuit closes."""
+        breaker = CircuitBreaker(
+            minimum_requests=1, recovery_timeout=0.01, success_threshold=3
+        )
+        fail(breaker)
+        time.sleep(0.02)
+        assert breaker.state is CircuitState.HALF_OPEN
+
+        probe = breaker.guard()
+        with pytest.raises(CircuitOpenError):
+            breaker.guard()
+        with probe:
+            pass
+
+        probes = [breaker.guard(), breaker.guard()]
+        with pytest.raises(CircuitOpenError):
+            breaker.guard()
+        for probe in probes:
+            with probe:
+                pass
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_failed_probe_reopens(self):
+        """Test a failed probe sends the circuit back to open."""
+        breaker = CircuitBreaker(minimum_requests=1, recovery_timeout=0.01)
+        fail(breaker)
+        time.sleep(0.02)
+        fail(breaker)
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.stats().opened == 2
+
+    def test_state_change_hooks(self):
+        """Test listeners observe every transition."""
+        transitions = []
+        breaker = CircuitBreaker(
+            minimum_requests=1,
+            recovery_timeout=0.01,
+            success_threshold=1,
+            on_state_change=lambda old, new: transitions.append((old, new)),
+        )
+        fail(breaker)
+        time.sleep(0.02)
+        succeed(breaker)
+        assert transitions == [
+            (CircuitState.CLOSED, CircuitState.OPEN),
+            (CircuitState.OPEN, CircuitState.HALF_OPEN),
+            (CircuitState.HALF_OPEN, CircuitState.CLOSED),
+        ]
+
+    def test_window_expires_outcomes(self):
+        """Test failures older than the window are forgotten."""
+        breaker = CircuitBreaker(minimum_requests=2, window=0.01)
+        fail(breaker)
+        time.sleep(0.02)
+        fail(breaker)
+        assert breaker.state is CircuitState.CLOSED
+
+
+class TestClientCircuitBreaker:
+    """Test clients fail fast while the circuit is open."""
+
+    def test_sync_client_stops_retrying(self):
+        """Test an opened circuit cuts the retry cycle short."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500, json={"error": {"message": "down"}})
+
+        breaker = CircuitBreaker(minimum_requests=2)
+        with MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(max_retries=5, initial_delay=0.0, jitter=False),
+            circuit_breaker=breaker,
+        ) as client:
+            with pytest.raises(CircuitOpenError):
+                client.chat_completion(messages=[{"role": "user", "content": "Hi"}])
+            with pytest.raises(CircuitOpenError):
+                client.chat_completion(messages=[{"role": "user", "content": "Hi"}])
+
+        assert len(calls) == 2
+
+    async def test_async_client_recovers(self):
+        """Test the async client probes and closes the circuit again."""
+        healthy = False
+
+        def handler(request):
+            if healthy:
+                return httpx.Response(200, json=CHAT_RESPONSE)
+            return httpx.Response(503, json={"error": {"message": "overloaded"}})
+
+        breaker = CircuitBreaker(
+            minimum_requests=1, recovery_timeout=0.01, success_threshold=1
+        )
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(max_retries=0),
+            circuit_breaker=breaker,
+        ) as client:
+            with pytest.raises(EngineOverloadedError):
+                await client.chat_completion(
+                    messages=[{"role": "user", "content": "Hi"}]
+                )
+            assert breaker.state is CircuitState.OPEN
+
+            healthy = True
+            time.sleep(0.02)
+            response = await client.chat_completion(
+                messages=[{"role": "user", "content": "Hi"}]
+            )
+
+        assert response.choices[0].message.content == "Hello!"
+        assert breaker.state is CircuitState.CLOSED
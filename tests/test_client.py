@@ -1,5 +1,7 @@
 """Tests for Mercury client."""
 
+import json
+
 import pytest
 import httpx
 from unittest.mock import Mock, patch
@@ -77,7 +79,8 @@ class TestMercuryClient:
         with patch.object(client._client, 'request') as mock_request:
             mock_request.return_value = Mock(
                 status_code=200,
-                json=lambda: mock_response
+                json=lambda: mock_response,
+                content=json.dumps(mock_response).encode(),
             )
             
             response = client.chat_completion(
@@ -9,6 +9,7 @@ from mercury_client.exceptions import (
     RateLimitError,
     ServerError,
     EngineOverloadedError,
+    StreamDecodeError,
 )
 from mercury_client.models import ChatCompletionResponse
 
@@ -71,7 +72,7 @@ class TestMercuryClientWithHTTPX:
         httpx_mock.add_response(
             method="POST",
             url="https://api.inceptionlabs.ai/v1/chat/completions",
-            text="\n".join(stream_data),
+            text="\n\n".join(stream_data),
             headers={"content-type": "text/event-stream"},
             status_code=200
         )
@@ -84,7 +85,30 @@ class TestMercuryClientWithHTTPX:
         assert len(chunks) == 3
         assert chunks[0].choices[0].delta.content == "Hello"
         assert chunks[1].choices[0].delta.content == " world!"
-        
+
+    def test_streaming_single_newline_framing_raises(self, httpx_mock):
+        """Test streams framed with single newlines are no longer parsed."""
+        # Legacy framing: without blank lines the data lines form one event
+        stream_data = [
+            'data: {"id": "chatcmpl-123", "object": "chat.completion.chunk", "created": 1677649420, "model": "mercury-coder-small", "choices": [{"index": 0, "delta": {"role": "assistant", "content": "Hello"}, "finish_reason": null}]}',
+            'data: {"id": "chatcmpl-123", "object": "chat.completion.chunk", "created": 1677649420, "model": "mercury-coder-small", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}',
+            'data: [DONE]'
+        ]
+
+        httpx_mock.add_response(
+            method="POST",
+            url="https://api.inceptionlabs.ai/v1/chat/completions",
+            text="\n".join(stream_data),
+            headers={"content-type": "text/event-stream"},
+            status_code=200
+        )
+
+        client = MercuryClient(api_key="test-key")
+        with pytest.raises(StreamDecodeError):
+            list(client.chat_completion_stream(
+                messages=[{"role": "user", "content": "Hello"}]
+            ))
+
     def test_authentication_error(self, httpx_mock):
         """Test authentication error handling."""
         # AuthenticationError (401) is not retried, so only one response needed
@@ -245,7 +269,7 @@ class TestAsyncMercuryClientWithHTTPX:
         httpx_mock.add_response(
             method="POST",
             url="https://api.inceptionlabs.ai/v1/chat/completions",
-            text="\n".join(stream_data),
+            text="\n\n".join(stream_data),
             headers={"content-type": "text/event-stream"},
             status_code=200
         )
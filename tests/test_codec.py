@@ -0,0 +1,68 @@
+"""Tests for JSON codecs."""
+
+import json
+
+import httpx
+import pytest
+
+from mercury_client import MercuryClient
+from mercury_client.utils.codec import (
+    PYDANTIC_CODEC,
+    JSONCodec,
+    default_codec,
+    orjson_codec,
+)
+from tests.helpers import CHAT_RESPONSE, installed_codecs
+
+
+class TestCodecs:
+    """Test codec selection and round trips."""
+
+    def test_pydantic_codec_round_trip(self):
+        """Test the always-available codec encodes to bytes."""
+        data = {"a": [1, "é", None]}
+        encoded = PYDANTIC_CODEC.dumps(data)
+        assert isinstance(encoded, bytes)
+        assert PYDANTIC_CODEC.loads(encoded) == data
+
+    def test_default_prefers_orjson(self):
+        """Test orjson is used when installed."""
+        pytest.importorskip("orjson")
+        assert default_codec().name == "orjson"
+        assert orjson_codec().loads(orjson_codec().dumps({"a": 1})) == {"a": 1}
+
+    @pytest.mark.parametrize("codec", installed_codecs(), ids=lambda c: c.name)
+    def test_malformed_json_raises_value_error(self, codec):
+        """Test every codec reports decode errors as ValueError."""
+        assert codec.loads(codec.dumps({"a": [1]})) == {"a": [1]}
+        # Each library words the error differently
+        with pytest.raises(ValueError):  # noqa: PT011
+            codec.loads(b'{"a": [1')
+
+    def test_client_uses_codec_for_request_body(self):
+        """Test request bodies are encoded by the configured codec."""
+        encoded = []
+
+        def dumps(obj):
+            encoded.append(obj)
+            return json.dumps(obj).encode()
+
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=CHAT_RESPONSE)
+
+        with MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            json_codec=JSONCodec("custom", dumps, json.loads),
+        ) as client:
+            response = client.chat_completion(
+                messages=[{"role": "user", "content": "Hi"}]
+            )
+
+        assert response.choices[0].message.content == "Hello!"
+        assert json.loads(requests[0].content) == encoded[0]
+        assert encoded[0]["messages"] == [{"role": "user", "content": "Hi"}]
+        assert requests[0].headers["content-type"] == "application/json"
@@ -0,0 +1,220 @@
+"""Tests for the adaptive (AIMD) concurrency limiter."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from mercury_client import (
+    AdaptiveConcurrencyLimiter,
+    AsyncMercuryClient,
+    RetryConfig,
+)
+from mercury_client.exceptions import RateLimitError, ServerError
+from tests.helpers import CHAT_RESPONSE
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test AIMD limit adjustments."""
+
+    async def test_admits_up_to_limit(self):
+        """Test callers beyond the limit wait for a released slot."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+        await limiter.acquire()
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        assert limiter.stats().waiting == 1
+
+        limiter.release()
+        await waiter
+        assert limiter.stats().in_flight == 2
+
+    async def test_cancelled_waiter_is_removed(self):
+        """Test a cancelled waiter neither holds nor leaks a slot."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        limiter.release()
+        stats = limiter.stats()
+        assert stats.in_flight == 0
+        assert stats.waiting == 0
+
+    async def test_additive_increase_when_saturated(self):
+        """Test a full window of successes raises the limit by one."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        for _ in range(4):
+            await limiter.acquire()
+        for _ in range(4):
+            limiter.on_success(0.01)
+            limiter.release()
+            await limiter.acquire()
+        assert limiter.limit == 4
+        limiter.on_success(0.01)
+        assert limiter.limit == 5
+
+    async def test_no_increase_when_idle(self):
+        """Test successes below the limit do not grow it."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        for _ in range(20):
+            async with limiter.slot():
+                pass
+        assert limiter.limit == 4
+        assert limiter.stats().successes == 20
+
+    def test_multiplicative_decrease_with_cooldown(self):
+        """Test overloads halve the limit at most once per cooldown."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16, cooldown=60.0)
+        limiter.on_overload()
+        limiter.on_overload()
+        assert limiter.limit == 8
+        stats = limiter.stats()
+        assert stats.overloads == 2
+        assert stats.decreases == 1
+
+    def test_decrease_respects_min_limit(self):
+        """Test the limit never drops below min_limit."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=2, cooldown=0.0)
+        for _ in range(5):
+            limiter.on_overload()
+        assert limiter.limit == 2
+
+    def test_latency_target(self):
+        """Test slow successes count as an overload signal."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, latency_target=1.0)
+        limiter.on_success(5.0)
+        assert limiter.limit == 4
+
+    async def test_slot_classifies_errors(self):
+        """Test only overload errors shrink the limit."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, cooldown=0.0)
+        with pytest.raises(ServerError):
+            async with limiter.slot():
+                raise ServerError("boom")
+        assert limiter.limit == 8
+
+        with pytest.raises(RateLimitError):
+            async with limiter.slot():
+                raise RateLimitError("slow down")
+        assert limiter.limit == 4
+        assert limiter.stats().in_flight == 0
+
+    async def test_slot_latency_from_first_response(self):
+        """Test a slot measures latency up to its first response."""
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=8, latency_target=0.05, cooldown=0.0
+        )
+        async with limiter.slot() as slot:
+            slot.responded()
+            await asyncio.sleep(0.1)
+            slot.responded()
+        assert limiter.limit == 8
+
+        async with limiter.slot():
+            await asyncio.sleep(0.1)
+        assert limiter.limit == 4
+
+
+class TestClientConcurrencyLimiting:
+    """Test the async client routes attempts through the limiter."""
+
+    async def test_limit_shrinks_on_429(self):
+        """Test 429 responses shrink the shared limit before the retry."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(
+                    429,
+                    json={"error": {"message": "busy"}},
+                    headers={"Retry-After": "0"},
+                )
+            return httpx.Response(200, json=CHAT_RESPONSE)
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(initial_delay=0.0, jitter=False),
+            concurrency_limiter=limiter,
+        ) as client:
+            response = await client.chat_completion(
+                messages=[{"role": "user", "content": "Hi"}]
+            )
+
+        assert response.choices[0].message.content == "Hello!"
+        assert len(calls) == 2
+        stats = limiter.stats()
+        assert stats.limit == 4
+        assert stats.in_flight == 0
+
+    async def test_in_flight_bounded_by_limit(self):
+        """Test concurrent calls never exceed the current limit."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json=CHAT_RESPONSE)
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=3, max_limit=3)
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            concurrency_limiter=limiter,
+        ) as client:
+            await asyncio.gather(
+                *(
+                    client.chat_completion(
+                        messages=[{"role": "user", "content": str(i)}]
+                    )
+                    for i in range(12)
+                )
+            )
+
+        assert peak == 3
+        assert limiter.stats().peak_in_flight == 3
+
+    async def test_long_stream_is_not_an_overload(self):
+        """Test a stream's latency is its time to first chunk."""
+        chunk = {**CHAT_RESPONSE, "object": "chat.completion.chunk"}
+        chunk["choices"] = [{"index": 0, "delta": {"content": "Hi"}}]
+
+        async def events():
+            for _ in range(3):
+                yield b"data: " + json.dumps(chunk).encode() + b"\n\n"
+                await asyncio.sleep(0.05)
+            yield b"data: [DONE]\n\n"
+
+        def handler(request):
+            return httpx.Response(
+                200, content=events(), headers={"content-type": "text/event-stream"}
+            )
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, latency_target=0.1)
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            concurrency_limiter=limiter,
+        ) as client:
+            chunks = [
+                c
+                async for c in client.chat_completion_stream(
+                    messages=[{"role": "user", "content": "Hi"}]
+                )
+            ]
+
+        assert len(chunks) == 3
+        assert limiter.stats().decreases == 0
@@ -0,0 +1,176 @@
+"""Tests for multi-turn conversations."""
+
+import json
+
+import httpx
+import pytest
+
+from mercury_client import (
+    AsyncConversation,
+    AsyncMercuryClient,
+    Conversation,
+    MercuryClient,
+)
+from mercury_client.exceptions import AuthenticationError
+from mercury_client.models import ChatCompletionRequest
+from tests.helpers import chat_response
+
+
+def stream_body(parts):
+    events = []
+    for i, part in enumerate(parts):
+        chunk = {
+            "id": "chatcmpl-123",
+            "object": "chat.completion.chunk",
+            "created": 1,
+            "model": "mercury-coder-small",
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": part},
+                    "finish_reason": "stop" if i == len(parts) - 1 else None,
+                }
+            ],
+        }
+        events.append(f"data: {json.dumps(chunk)}")
+    events.append("data: [DONE]")
+    return "\n\n".join(events) + "\n\n"
+
+
+class Server:
+    """Mock API numbering its replies and recording request bodies."""
+
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.bodies = []
+
+    def __call__(self, request):
+        body = json.loads(request.content)
+        self.bodies.append(body)
+        if self.status_code != 200:
+            return httpx.Response(self.status_code, json={"error": "denied"})
+        reply = f"reply {len(self.bodies)}"
+        if body["stream"]:
+            return httpx.Response(200, text=stream_body([reply[:3], reply[3:]]))
+        return httpx.Response(200, json=chat_response(reply))
+
+
+def contents(messages):
+    return [m["content"] for m in messages]
+
+
+class TestConversation:
+    """Test the synchronous conversation."""
+
+    def test_send_appends_turns(self):
+        """Test user messages and replies accumulate in the history."""
+        server = Server()
+        with MercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(server)
+        ) as client:
+            chat = client.conversation(system="Be brief.", max_tokens=64)
+            assert isinstance(chat, Conversation)
+            chat.send("Hi")
+            response = chat.send({"role": "user", "content": "Again"})
+
+        assert response.choices[0].message.content == "reply 2"
+        assert chat.last_response is response
+        assert len(chat) == 4
+        assert contents(chat.messages) == ["Hi", "reply 1", "Again", "reply 2"]
+        assert contents(server.bodies[1]["messages"]) == [
+            "Be brief.",
+            "Hi",
+            "reply 1",
+            "Again",
+        ]
+        assert server.bodies[1]["max_tokens"] == 64
+
+    def test_body_matches_unprepared_request(self):
+        """Test the spliced body equals a fully validated request."""
+        server = Server()
+        with MercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(server)
+        ) as client:
+            chat = client.conversation([{"role": "user", "content": "Hi"}])
+            chat.send()
+            chat.send("More")
+
+        expected = ChatCompletionRequest(messages=chat.messages[:-1]).model_dump(
+            exclude_none=True
+        )
+        assert server.bodies[1] == expected
+
+    def test_stream_appends_assembled_reply(self):
+        """Test a completed stream adds the assembled reply."""
+        server = Server()
+        with MercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(server)
+        ) as client:
+            chat = client.conversation()
+            text = "".join(
+                chunk.choices[0].delta.content for chunk in chat.stream("Hi")
+            )
+
+        assert text == "reply 1"
+        assert server.bodies[0]["stream"] is True
+        assert contents(chat.messages) == ["Hi", "reply 1"]
+        assert chat.last_response.choices[0].message.content == "reply 1"
+
+    def test_failed_turn_leaves_history_unchanged(self):
+        """Test the message of a failed turn is not added."""
+        with MercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(Server(401))
+        ) as client:
+            chat = client.conversation(["Hello"])
+            with pytest.raises(AuthenticationError):
+                chat.send("Hi")
+
+        assert contents(chat.messages) == ["Hello"]
+
+    def test_fork_shares_history(self):
+        """Test forks share earlier turns and diverge afterwards."""
+        server = Server()
+        with MercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(server)
+        ) as client:
+            chat = client.conversation()
+            chat.send("Hi")
+            branch = chat.fork()
+            chat.send("Left")
+            branch.send("Right")
+
+        assert contents(chat.messages) == ["Hi", "reply 1", "Left", "reply 2"]
+        assert contents(branch.messages) == ["Hi", "reply 1", "Right", "reply 3"]
+        assert chat.messages[0] is branch.messages[0]
+
+    def test_append_validates_once(self):
+        """Test invalid messages are rejected when added."""
+        with MercuryClient(api_key="test-key") as client:
+            chat = client.conversation()
+            with pytest.raises(ValueError, match="role"):
+                chat.append({"role": "robot", "content": "x"})
+        assert len(chat) == 0
+
+
+class TestAsyncConversation:
+    """Test the asynchronous conversation."""
+
+    async def test_send_and_stream(self):
+        """Test async turns accumulate in the history."""
+        server = Server()
+        async with AsyncMercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(server)
+        ) as client:
+            chat = client.conversation(system="Be brief.")
+            assert isinstance(chat, AsyncConversation)
+            await chat.send("Hi")
+            chunks = [chunk async for chunk in chat.stream("Again")]
+
+        assert len(chunks) == 2
+        assert contents(chat.messages) == ["Hi", "reply 1", "Again", "reply 2"]
+        assert contents(server.bodies[1]["messages"]) == [
+            "Be brief.",
+            "Hi",
+            "reply 1",
+            "Again",
+        ]
@@ -0,0 +1,108 @@
+"""Tests for diffusion frame diffing."""
+
+import json
+import random
+
+import httpx
+import pytest
+
+from mercury_client import MercuryClient
+from mercury_client.utils.diffusion import FrameDiffer, TextEdit, apply_edits
+
+
+def frame_line(content, finish_reason=None):
+    chunk = {
+        "id": "chatcmpl-123",
+        "object": "chat.completion.chunk",
+        "created": 1677649420,
+        "model": "mercury-coder-small",
+        "choices": [
+            {
+                "index": 0,
+                "delta": {"content": content} if content is not None else {},
+                "finish_reason": finish_reason,
+            }
+        ],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+class TestFrameDiffer:
+    """Test edits between successive frames."""
+
+    def test_single_replacement(self):
+        """Test a change inside one line becomes one minimal edit."""
+        differ = FrameDiffer()
+        differ.update("def add(a, b):\n    return a ? b\n")
+        edits = differ.update("def add(a, b):\n    return a + b\n")
+        assert edits == [TextEdit(28, 29, "+")]
+
+    def test_unchanged_frame(self):
+        """Test identical frames produce no edits."""
+        differ = FrameDiffer()
+        differ.update("same")
+        assert differ.update("same") == []
+
+    def test_scattered_line_changes(self):
+        """Test changes on distant lines produce separate small edits."""
+        old = "".join(f"line {i}\n" for i in range(100))
+        new = old.replace("line 10\n", "line X\n").replace("line 90\n", "line Y\n")
+        differ = FrameDiffer()
+        differ.update(old)
+        edits = differ.update(new)
+        assert [edit.text for edit in edits] == ["X", "Y"]
+        assert apply_edits(old, edits) == new
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_edits_reproduce_frames(self, seed):
+        """Test applying the edits of random refinements yields each frame."""
+        rng = random.Random(seed)
+        alphabet = "ab \n"
+        text = ""
+        differ = FrameDiffer()
+        rendered = ""
+        for _ in range(30):
+            chars = list(text)
+            for _ in range(rng.randint(0, 5)):
+                position = rng.randint(0, len(chars))
+                operation = rng.random()
+                if operation < 0.4 or not chars:
+                    chars.insert(position, rng.choice(alphabet))
+                elif operation < 0.7:
+                    del chars[min(position, len(chars) - 1)]
+                else:
+                    chars[min(position, len(chars) - 1)] = rng.choice(alphabet)
+            text = "".join(chars)
+            rendered = apply_edits(rendered, differ.update(text))
+            assert rendered == text
+
+
+class TestClientFrames:
+    """Test frame patches from a client stream."""
+
+    def test_wrap_diffusing_stream(self):
+        """Test each frame of a diffusing stream becomes a patch."""
+        body = "".join(
+            [
+                frame_line("def f(): ????"),
+                frame_line("def f(): return"),
+                frame_line("def f(): return 1"),
+                frame_line(None, "stop"),
+                "data: [DONE]\n\n",
+            ]
+        )
+        transport = httpx.MockTransport(lambda r: httpx.Response(200, text=body))
+        differ = FrameDiffer()
+        with MercuryClient(api_key="test-key", transport=transport) as client:
+            patches = list(
+                differ.wrap(
+                    client.chat_completion_stream(
+                        messages=[{"role": "user", "content": "Hi"}], diffusing=True
+                    )
+                )
+            )
+
+        assert [patch.index for patch in patches] == [1, 2, 3, 3]
+        assert patches[1].edits == [TextEdit(9, 13, "return")]
+        assert patches[-1].finish_reason == "stop"
+        assert patches[-1].text == "def f(): return 1"
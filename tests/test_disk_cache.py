@@ -0,0 +1,121 @@
+"""Tests for the persistent SQLite response cache."""
+
+import threading
+import time
+
+import httpx
+
+from mercury_client import AsyncMercuryClient
+from mercury_client.utils.disk_cache import SQLiteCache
+from tests.helpers import FIM_RESPONSE
+
+
+class TestSQLiteCache:
+    """Test the SQLite cache backend."""
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test entries survive reopening the database."""
+        path = tmp_path / "cache.db"
+        cache = SQLiteCache(path)
+        cache.set("a", b'{"x": 1}')
+        cache.close()
+
+        reopened = SQLiteCache(path)
+        assert reopened.get("a") == b'{"x": 1}'
+        assert reopened.get("missing") is None
+        stats = reopened.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+        assert stats.size_bytes == 8
+
+    def test_ttl_expiry(self, tmp_path):
+        """Test expired entries are not returned."""
+        cache = SQLiteCache(tmp_path / "cache.db")
+        cache.set("a", b"1", ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert cache.stats().expirations == 1
+
+    def test_compaction_evicts_least_recently_used(self, tmp_path):
+        """Test exceeding max_bytes evicts the oldest entries."""
+        cache = SQLiteCache(
+            tmp_path / "cache.db", max_bytes=100, compact_ratio=0.5, touch_interval=0
+        )
+        cache.set("a", b"x" * 40)
+        time.sleep(0.01)
+        cache.set("b", b"y" * 40)
+        time.sleep(0.01)
+        cache.get("a")
+        cache.set("c", b"z" * 40)
+
+        assert cache.get("b") is None
+        assert cache.get("c") == b"z" * 40
+        assert cache.stats().size_bytes <= 50
+        assert cache.stats().evictions >= 1
+
+    def test_overwrite_updates_size(self, tmp_path):
+        """Test replacing an entry keeps the size total consistent."""
+        cache = SQLiteCache(tmp_path / "cache.db")
+        cache.set("a", b"x" * 10)
+        cache.set("a", b"x" * 3)
+        assert cache.stats().size_bytes == 3
+        cache.delete("a")
+        assert cache.stats().size_bytes == 0
+
+    def test_export_import(self, tmp_path):
+        """Test a warmed cache can be shipped to another database."""
+        source = SQLiteCache(tmp_path / "source.db")
+        source.set("a", b'{"x": 1}')
+        source.set("b", b'{"y": 2}')
+        assert source.export_to(tmp_path / "dump.jsonl") == 2
+
+        target = SQLiteCache(tmp_path / "target.db")
+        target.set("a", b'{"local": true}')
+        assert target.import_from(tmp_path / "dump.jsonl") == 1
+        assert target.get("a") == b'{"local": true}'
+        assert target.get("b") == b'{"y": 2}'
+
+        assert target.import_from(tmp_path / "dump.jsonl", overwrite=True) == 2
+        assert target.get("a") == b'{"x": 1}'
+
+    def test_concurrent_writers(self, tmp_path):
+        """Test several connections can write to one database at once."""
+        path = tmp_path / "cache.db"
+        caches = [SQLiteCache(path) for _ in range(3)]
+
+        def write(cache, prefix):
+            for i in range(50):
+                cache.set(f"{prefix}-{i}", b"v" * 10)
+
+        threads = [
+            threading.Thread(target=write, args=(cache, n))
+            for n, cache in enumerate(caches)
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = SQLiteCache(path).stats()
+        assert stats.entries == 150
+        assert stats.size_bytes == 1500
+
+    async def test_async_client_uses_disk_cache(self, tmp_path):
+        """Test the async client serves repeats from the disk cache."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json=FIM_RESPONSE)
+
+        path = tmp_path / "cache.db"
+        for _ in range(2):
+            async with AsyncMercuryClient(
+                api_key="test-key",
+                transport=httpx.MockTransport(handler),
+                cache=SQLiteCache(path),
+            ) as client:
+                response = await client.fim_completion(prompt="def f(")
+                assert response.choices[0].text == "return a + b"
+
+        assert len(calls) == 1
@@ -0,0 +1,183 @@
+"""Tests for request hedging."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from mercury_client import AsyncMercuryClient, HedgingPolicy, RetryConfig
+from mercury_client.exceptions import ServerError
+from tests.helpers import FIM_RESPONSE
+
+
+def warmed(policy, latency=0.01, model="mercury-coder-small"):
+    for _ in range(policy.min_samples):
+        policy.record(model, latency)
+    return policy
+
+
+class TestHedgingPolicy:
+    """Test latency tracking and hedging decisions."""
+
+    def test_no_delay_until_warm(self):
+        """Test requests are not hedged before enough samples exist."""
+        policy = HedgingPolicy(min_samples=5)
+        for _ in range(4):
+            policy.record("m", 0.1)
+        assert policy.delay("m") is None
+        policy.record("m", 0.1)
+        assert policy.delay("m") == pytest.approx(0.1)
+        assert policy.delay("other") is None
+
+    def test_percentile_per_model(self):
+        """Test the delay follows each model's own latency distribution."""
+        policy = HedgingPolicy(percentile=90, min_samples=10)
+        for i in range(1, 101):
+            policy.record("fast", i / 1000)
+            policy.record("slow", i / 10)
+        assert policy.delay("fast") == pytest.approx(0.09)
+        assert policy.delay("slow") == pytest.approx(9.0)
+
+    def test_delay_bounds(self):
+        """Test min_delay and max_delay clamp the threshold."""
+        policy = warmed(HedgingPolicy(min_delay=0.5, min_samples=3))
+        assert policy.delay("mercury-coder-small") == 0.5
+        policy = warmed(HedgingPolicy(max_delay=0.001, min_samples=3))
+        assert policy.delay("mercury-coder-small") == 0.001
+
+    async def test_slow_call_is_hedged(self):
+        """Test a slow primary loses to the hedge and is cancelled."""
+        policy = warmed(HedgingPolicy(max_hedge_ratio=1.0, min_samples=3), model="m")
+        calls = []
+        cancelled = []
+
+        async def send():
+            calls.append(1)
+            if len(calls) == 1:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(1)
+                    raise
+            return len(calls)
+
+        assert await policy.run("m", send) == 2
+        await asyncio.sleep(0)
+        assert cancelled == [1]
+        stats = policy.stats()
+        assert stats.hedged == 1
+        assert stats.hedge_wins == 1
+
+    async def test_fast_call_is_not_hedged(self):
+        """Test calls answering within the threshold are sent once."""
+        policy = warmed(HedgingPolicy(min_samples=3), latency=1.0, model="m")
+        calls = []
+
+        async def send():
+            calls.append(1)
+            return "done"
+
+        assert await policy.run("m", send) == "done"
+        assert len(calls) == 1
+        assert policy.stats().hedged == 0
+
+    async def test_budget_caps_hedges(self):
+        """Test hedging stops once the extra-load budget is spent."""
+        policy = warmed(HedgingPolicy(max_hedge_ratio=0.0, min_samples=3), model="m")
+
+        async def send():
+            await asyncio.sleep(0.05)
+            return "slow"
+
+        assert await policy.run("m", send) == "slow"
+        stats = policy.stats()
+        assert stats.hedged == 0
+        assert stats.budget_exhausted == 1
+
+    async def test_one_failure_falls_back_to_other_call(self):
+        """Test a failing duplicate does not fail the request."""
+        policy = warmed(HedgingPolicy(max_hedge_ratio=1.0, min_samples=3), model="m")
+        calls = []
+
+        async def send():
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(0.05)
+                return "primary"
+            raise ServerError()
+
+        assert await policy.run("m", send) == "primary"
+
+
+class TestClientHedging:
+    """Test AsyncMercuryClient hedges FIM completions."""
+
+    async def test_fim_completion_hedged(self):
+        """Test a stalled replica is raced by a duplicate request."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(10)
+            return httpx.Response(200, json=FIM_RESPONSE)
+
+        policy = warmed(HedgingPolicy(max_hedge_ratio=1.0, min_samples=3))
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(max_retries=0),
+            hedging=policy,
+        ) as client:
+            response = await asyncio.wait_for(
+                client.fim_completion(prompt="def add(a, b):"), timeout=2.0
+            )
+
+        assert response.choices[0].text == "return a + b"
+        assert len(calls) == 2
+        assert policy.stats().hedge_wins == 1
+
+    async def test_latency_excludes_backoff(self):
+        """Test the recorded latency covers the answering attempt only."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(500, json={"error": {"message": "boom"}})
+            return httpx.Response(200, json=FIM_RESPONSE)
+
+        policy = HedgingPolicy(min_samples=1)
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(max_retries=1, initial_delay=0.3, jitter=False),
+            hedging=policy,
+        ) as client:
+            await client.fim_completion(prompt="def add(a, b):")
+
+        assert len(calls) == 2
+        assert policy.delay("mercury-coder-small") < 0.3
+
+    async def test_no_hedge_after_rate_limit(self):
+        """Test the retry of a rate limited attempt is sent once."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, json={"error": {"message": "slow down"}})
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json=FIM_RESPONSE)
+
+        policy = warmed(HedgingPolicy(max_hedge_ratio=1.0, min_samples=3))
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(max_retries=1, initial_delay=0.01, jitter=False),
+            hedging=policy,
+        ) as client:
+            await client.fim_completion(prompt="def add(a, b):")
+
+        assert len(calls) == 2
+        assert policy.stats().hedged == 0
@@ -0,0 +1,191 @@
+"""Tests for response parsing offload and loop instrumentation."""
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from mercury_client import AsyncMercuryClient, LoopConfig
+from mercury_client.utils.loop import LoopBlockReport, LoopTimer, timed_stream
+from tests.helpers import CHAT_RESPONSE
+
+STREAM_BODY = (
+    "\n\n".join(
+        [
+            'data: {"id":"1","object":"chat.completion.chunk","created":1,'
+            '"model":"mercury-coder-small","choices":[{"index":0,'
+            '"delta":{"content":"Hi"},"finish_reason":"stop"}]}',
+            "data: [DONE]",
+        ]
+    )
+    + "\n\n"
+)
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """Thread pool counting the calls submitted to it."""
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+def transport():
+    def handler(request):
+        if json.loads(request.content).get("stream"):
+            return httpx.Response(200, text=STREAM_BODY)
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    return httpx.MockTransport(handler)
+
+
+class TestLoopTimer:
+    """Test timing of coroutine steps."""
+
+    async def test_times_each_step(self):
+        """Test busy stretches between suspensions are measured."""
+
+        async def work():
+            time.sleep(0.02)
+            await asyncio.sleep(0)
+            time.sleep(0.01)
+            return "done"
+
+        timer = LoopTimer(work())
+        assert await timer == "done"
+        assert timer.steps == 2
+        assert timer.held >= 0.03
+        assert 0.02 <= timer.longest < timer.held
+
+    async def test_excludes_time_suspended(self):
+        """Test time spent waiting does not count as held."""
+        timer = LoopTimer(asyncio.sleep(0.05))
+        await timer
+        assert timer.held < 0.05
+
+    async def test_propagates_errors_and_cancellation(self):
+        """Test errors and cancellation pass through the timer."""
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            await LoopTimer(fail())
+
+        task = asyncio.ensure_future(LoopTimer(asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+class TestClientLoopConfig:
+    """Test offloading and reporting in the async client."""
+
+    async def test_reports_requests(self):
+        """Test every completion request is reported."""
+        reports = []
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=transport(),
+            loop_config=LoopConfig(on_loop_block=reports.append),
+        ) as client:
+            response = await client.chat_completion(
+                messages=[{"role": "user", "content": "Hi"}]
+            )
+
+        assert response.choices[0].message.content == "Hello!"
+        assert len(reports) == 1
+        report = reports[0]
+        assert report.url == "/chat/completions"
+        assert report.response_bytes > 0
+        assert report.offloaded is False
+        assert report.steps >= 1
+        assert 0 < report.longest <= report.held
+
+    async def test_large_responses_parsed_in_executor(self):
+        """Test responses above the threshold are parsed in the executor."""
+        executor = RecordingExecutor()
+        reports = []
+        try:
+            async with AsyncMercuryClient(
+                api_key="test-key",
+                transport=transport(),
+                loop_config=LoopConfig(
+                    offload_threshold=100,
+                    executor=executor,
+                    on_loop_block=reports.append,
+                ),
+            ) as client:
+                response = await client.chat_completion(
+                    messages=[{"role": "user", "content": "Hi"}]
+                )
+        finally:
+            executor.shutdown()
+
+        assert response.choices[0].message.content == "Hello!"
+        assert executor.submitted == 1
+        assert reports[0].offloaded is True
+
+    async def test_small_responses_parsed_on_loop(self):
+        """Test responses below the threshold stay on the loop."""
+        executor = RecordingExecutor()
+        try:
+            async with AsyncMercuryClient(
+                api_key="test-key",
+                transport=transport(),
+                loop_config=LoopConfig(offload_threshold=1 << 20, executor=executor),
+            ) as client:
+                await client.chat_completion(
+                    messages=[{"role": "user", "content": "Hi"}]
+                )
+        finally:
+            executor.shutdown()
+
+        assert executor.submitted == 0
+
+    async def test_reports_streams_when_they_end(self):
+        """Test a stream is reported once, after its last chunk."""
+        reports = []
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=transport(),
+            loop_config=LoopConfig(on_loop_block=reports.append),
+        ) as client:
+            stream = client.chat_completion_stream(
+                messages=[{"role": "user", "content": "Hi"}]
+            )
+            async for _chunk in stream:
+                assert reports == []
+
+        assert len(reports) == 1
+        assert reports[0].stream is True
+        assert reports[0].steps >= 1
+
+    async def test_closes_stream_left_early(self):
+        """Test breaking out of a timed stream closes the stream at once."""
+        closed = []
+        reports = []
+
+        async def chunks():
+            try:
+                for i in range(3):
+                    yield i
+            finally:
+                closed.append(reports == [])
+
+        stream = timed_stream(chunks(), LoopBlockReport("/x"), reports.append)
+        async for _chunk in stream:
+            break
+        await stream.aclose()
+
+        assert closed == [True]
+        assert len(reports) == 1
@@ -0,0 +1,108 @@
+"""Tests for connection pool configuration and statistics."""
+
+import httpx
+import pytest
+
+from mercury_client import AsyncMercuryClient, MercuryClient, PoolConfig
+from mercury_client.utils.pool import PoolMonitor
+from tests.helpers import CHAT_RESPONSE
+
+
+class TestPoolConfig:
+    """Test pool configuration."""
+
+    def test_defaults_match_httpx(self):
+        """Test default limits match httpx's own defaults."""
+        limits = PoolConfig().to_limits()
+        assert limits == httpx.Limits(
+            max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0
+        )
+
+    def test_pool_timeout(self):
+        """Test pool timeout falls back to the request timeout."""
+        assert PoolConfig().to_timeout(30.0).pool == 30.0
+        assert PoolConfig(pool_timeout=2.0).to_timeout(30.0).pool == 2.0
+        assert PoolConfig(pool_timeout=2.0).to_timeout(30.0).read == 30.0
+
+
+class TestPoolMonitor:
+    """Test pool statistics tracking."""
+
+    def test_in_flight_and_wait_time(self):
+        """Test occupancy and wait time are recorded per request."""
+        monitor = PoolMonitor(max_connections=4)
+        first = monitor.track()
+        second = monitor.track()
+        first.trace("connection.connect_tcp.started", {})
+        first.trace("http11.send_request_headers.started", {})
+
+        stats = monitor.stats()
+        assert stats.in_flight == 2
+        assert stats.peak_in_flight == 2
+        assert stats.utilization == 0.5
+        assert stats.max_wait_time >= 0.0
+
+        first.close()
+        first.close()
+        second.close()
+        stats = monitor.stats()
+        assert stats.in_flight == 0
+        assert stats.peak_in_flight == 2
+        assert stats.total_requests == 2
+
+
+class TestClientPool:
+    """Test pool integration in the clients."""
+
+    def test_shared_transport_not_closed(self):
+        """Test an injected transport is used and survives client close."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json=CHAT_RESPONSE)
+
+        transport = httpx.MockTransport(handler)
+        with MercuryClient(api_key="test-key", transport=transport) as client:
+            client.chat_completion(messages=[{"role": "user", "content": "Hi"}])
+            stats = client.pool_stats()
+            assert stats.total_requests == 1
+            assert stats.in_flight == 0
+
+        with MercuryClient(api_key="test-key", transport=transport) as client:
+            client.chat_completion(messages=[{"role": "user", "content": "Hi"}])
+        assert len(calls) == 2
+
+    def test_http2_requires_h2(self):
+        """Test HTTP/2 is passed through to httpx."""
+        pytest.importorskip("h2")
+        client = MercuryClient(api_key="test-key", pool_config=PoolConfig(http2=True))
+        client.close()
+
+    async def test_unlimited_connections(self):
+        """Test max_connections=None reports no connection limit."""
+        config = PoolConfig(max_connections=None)
+        with MercuryClient(api_key="test-key", pool_config=config) as client:
+            assert client.pool_stats().max_connections is None
+        async with AsyncMercuryClient(api_key="test-key", pool_config=config) as client:
+            assert client.pool_stats().utilization == 0.0
+
+    async def test_async_stream_releases_slot(self, httpx_mock):
+        """Test streamed requests release their pool slot when finished."""
+        httpx_mock.add_response(
+            method="POST",
+            url="https://api.inceptionlabs.ai/v1/chat/completions",
+            text="data: [DONE]\n",
+            headers={"content-type": "text/event-stream"},
+        )
+        async with AsyncMercuryClient(api_key="test-key") as client:
+            chunks = [
+                c
+                async for c in client.chat_completion_stream(
+                    messages=[{"role": "user", "content": "Hi"}]
+                )
+            ]
+            assert chunks == []
+            stats = client.pool_stats()
+            assert stats.total_requests == 1
+            assert stats.in_flight == 0
@@ -0,0 +1,160 @@
+"""Tests for prepared chat request templates."""
+
+import json
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from mercury_client import AsyncMercuryClient, MercuryClient, PreparedChatRequest
+from mercury_client.models import ChatCompletionRequest, Message
+from mercury_client.utils.codec import PYDANTIC_CODEC, JSONCodec
+from tests.helpers import CHAT_RESPONSE, installed_codecs
+
+STREAM_BODY = (
+    "\n\n".join(
+        [
+            'data: {"id":"1","object":"chat.completion.chunk","created":1,'
+            '"model":"mercury-coder-small","choices":[{"index":0,'
+            '"delta":{"content":"Hi"},"finish_reason":null}]}',
+            'data: {"id":"1","object":"chat.completion.chunk","created":1,'
+            '"model":"mercury-coder-small","choices":[{"index":0,'
+            '"delta":{"content":" there"},"finish_reason":"stop"}]}',
+            "data: [DONE]",
+        ]
+    )
+    + "\n\n"
+)
+
+FEW_SHOT = [
+    {"role": "user", "content": "2+2"},
+    {"role": "assistant", "content": "4"},
+]
+
+USER = [{"role": "user", "content": '3+3 "quoted" é'}]
+
+
+class TestPreparedChatRequest:
+    """Test payload building and body splicing."""
+
+    def test_payload_matches_full_request(self):
+        """Test the payload equals that of an unprepared request."""
+        template = PreparedChatRequest(
+            FEW_SHOT, system="Answer briefly.", max_tokens=64
+        )
+        expected = ChatCompletionRequest(
+            messages=[{"role": "system", "content": "Answer briefly."}]
+            + FEW_SHOT
+            + USER,
+            max_tokens=64,
+        ).model_dump(exclude_none=True)
+
+        assert template.payload(USER) == expected
+        assert template.payload(USER, stream=True)["stream"] is True
+        assert template.model == "mercury-coder-small"
+
+    @pytest.mark.parametrize("codec", installed_codecs(), ids=lambda c: c.name)
+    @pytest.mark.parametrize("fixed", [[], FEW_SHOT])
+    @pytest.mark.parametrize("variable", [[], USER, USER * 3])
+    def test_render_splices_valid_body(self, codec, fixed, variable):
+        """Test the spliced body decodes to the payload."""
+        template = PreparedChatRequest(fixed, temperature=0.0)
+        for _ in range(2):
+            payload, body = template.render(variable, codec)
+            assert json.loads(body) == payload
+            assert len(payload["messages"]) == len(fixed) + len(variable)
+
+    def test_render_accepts_message_objects(self):
+        """Test Message objects are dumped like dicts."""
+        template = PreparedChatRequest()
+        payload, body = template.render([Message(**USER[0])], PYDANTIC_CODEC)
+        assert payload["messages"] == USER
+        assert json.loads(body)["messages"] == USER
+
+    def test_unexpected_codec_output_is_encoded_in_full(self):
+        """Test codecs not ending the object with the messages still work."""
+        codec = JSONCodec(
+            "pretty", lambda obj: json.dumps(obj, indent=2).encode(), json.loads
+        )
+        template = PreparedChatRequest(FEW_SHOT)
+        payload, body = template.render(USER, codec)
+        assert json.loads(body) == payload
+
+    def test_fixed_parts_validated_once(self):
+        """Test invalid fixed parts fail when the template is built."""
+        with pytest.raises(ValidationError):
+            PreparedChatRequest(max_tokens=0)
+        with pytest.raises(ValidationError):
+            PreparedChatRequest([{"role": "robot", "content": "x"}])
+
+    def test_variable_messages_validated(self):
+        """Test invalid variable messages fail on every call."""
+        template = PreparedChatRequest()
+        with pytest.raises(ValidationError):
+            template.render([{"role": "user"}], PYDANTIC_CODEC)
+
+
+class TestPreparedClients:
+    """Test sending prepared requests."""
+
+    def test_chat_completion_prepared(self):
+        """Test the sync client sends the rendered body."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=CHAT_RESPONSE)
+
+        template = PreparedChatRequest(FEW_SHOT, system="Answer briefly.")
+        with MercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(handler)
+        ) as client:
+            response = client.chat_completion_prepared(template, USER)
+
+        assert response.choices[0].message.content == "Hello!"
+        sent = json.loads(requests[0].content)
+        assert sent == template.payload(USER)
+        assert sent["stream"] is False
+
+    def test_chat_completion_stream_prepared(self):
+        """Test the sync client streams a prepared request."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, text=STREAM_BODY)
+
+        template = PreparedChatRequest(FEW_SHOT)
+        with MercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(handler)
+        ) as client:
+            chunks = list(client.chat_completion_stream_prepared(template, USER))
+
+        assert [c.choices[0].delta.content for c in chunks] == ["Hi", " there"]
+        assert json.loads(requests[0].content)["stream"] is True
+
+    async def test_async_prepared(self):
+        """Test the async client sends prepared requests."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if json.loads(request.content)["stream"]:
+                return httpx.Response(200, text=STREAM_BODY)
+            return httpx.Response(200, json=CHAT_RESPONSE)
+
+        template = PreparedChatRequest(system="Answer briefly.")
+        async with AsyncMercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(handler)
+        ) as client:
+            response = await client.chat_completion_prepared(template, USER)
+            chunks = [
+                chunk
+                async for chunk in client.chat_completion_stream_prepared(
+                    template, USER
+                )
+            ]
+
+        assert response.choices[0].message.content == "Hello!"
+        assert len(chunks) == 2
+        assert json.loads(requests[0].content) == template.payload(USER)
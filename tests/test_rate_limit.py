@@ -0,0 +1,116 @@
+"""Tests for the client-side rate limiter."""
+
+import threading
+
+import httpx
+import pytest
+
+from mercury_client import AsyncMercuryClient, MercuryClient, RateLimiter
+from mercury_client.utils.rate_limit import estimate_tokens
+from tests.helpers import CHAT_RESPONSE
+
+
+class TestEstimateTokens:
+    """Test token estimation."""
+
+    def test_chat_payload(self):
+        """Test prompt characters and max_tokens are both counted."""
+        payload = {
+            "messages": [{"role": "user", "content": "x" * 400}],
+            "max_tokens": 50,
+        }
+        assert estimate_tokens(payload) == 151
+
+    def test_fim_payload(self):
+        """Test FIM prompt and suffix are counted."""
+        assert estimate_tokens({"prompt": "a" * 8, "suffix": "b" * 8}) == 5
+
+
+class TestRateLimiter:
+    """Test token bucket pacing."""
+
+    def test_request_burst_then_paced(self):
+        """Test requests beyond the burst wait for the bucket to refill."""
+        limiter = RateLimiter(requests_per_second=10, burst_requests=2)
+        assert limiter.reserve() == 0.0
+        assert limiter.reserve() == 0.0
+        assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+        assert limiter.reserve() == pytest.approx(0.2, abs=0.01)
+
+        stats = limiter.stats()
+        assert stats.requests == 4
+        assert stats.throttled == 2
+
+    def test_tokens_per_minute(self):
+        """Test token reservations are paced by the per-minute rate."""
+        limiter = RateLimiter(tokens_per_minute=600)
+        assert limiter.reserve(600) == 0.0
+        assert limiter.reserve(60) == pytest.approx(6.0, abs=0.01)
+        assert limiter.stats().tokens == 660
+
+    def test_unlimited(self):
+        """Test a limiter without limits never waits."""
+        limiter = RateLimiter()
+        assert all(limiter.reserve(10_000) == 0.0 for _ in range(100))
+
+    def test_reservations_are_serialized_across_threads(self):
+        """Test concurrent reservations each get a distinct slot."""
+        limiter = RateLimiter(requests_per_second=100, burst_requests=1)
+        delays = []
+        lock = threading.Lock()
+
+        def reserve():
+            delay = limiter.reserve()
+            with lock:
+                delays.append(delay)
+
+        threads = [threading.Thread(target=reserve) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        delays.sort()
+        assert delays[0] == 0.0
+        assert delays[-1] == pytest.approx(0.19, abs=0.02)
+        assert all(b - a > 0.005 for a, b in zip(delays, delays[1:]))
+
+
+class TestClientRateLimiting:
+    """Test clients consult the limiter before sending."""
+
+    def test_sync_client_acquires(self):
+        """Test the sync client reserves one request with estimated tokens."""
+        limiter = RateLimiter(requests_per_second=1000, tokens_per_minute=10**9)
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, json=CHAT_RESPONSE)
+        )
+        with MercuryClient(
+            api_key="test-key", transport=transport, rate_limiter=limiter
+        ) as client:
+            client.chat_completion(
+                messages=[{"role": "user", "content": "Hi"}], max_tokens=10
+            )
+
+        stats = limiter.stats()
+        assert stats.requests == 1
+        assert stats.tokens == 11
+
+    async def test_async_client_acquires(self):
+        """Test the async client waits for the limiter without blocking."""
+        limiter = RateLimiter(requests_per_second=20, burst_requests=1)
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, json=CHAT_RESPONSE)
+        )
+        async with AsyncMercuryClient(
+            api_key="test-key", transport=transport, rate_limiter=limiter
+        ) as client:
+            for _ in range(3):
+                await client.chat_completion(
+                    messages=[{"role": "user", "content": "Hi"}]
+                )
+
+        stats = limiter.stats()
+        assert stats.requests == 3
+        assert stats.throttled == 2
+        assert stats.total_wait_time == pytest.approx(0.1, abs=0.02)
@@ -1,12 +1,20 @@
 """Tests for retry logic and error handling."""
 
+import asyncio
 import time
 import pytest
 import httpx
 from unittest.mock import patch
 
-from mercury_client import MercuryClient
-from mercury_client.utils.retry import RetryConfig, calculate_delay
+from mercury_client import AsyncMercuryClient, MercuryClient, StreamConfig
+from mercury_client.utils.retry import (
+    RetryBudget,
+    RetryConfig,
+    calculate_delay,
+    retry_async,
+    retry_delay,
+    retry_sync,
+)
 from mercury_client.exceptions import (
     AuthenticationError,
     RateLimitError,
@@ -260,4 +268,219 @@ class TestRetryLogic:
         )
         
         assert response.choices[0].message.content == "Success after timeout!"
-        assert len(httpx_mock.get_requests()) == 2 
\ No newline at end of file
+        assert len(httpx_mock.get_requests()) == 2
+
+class TestRetryBudget:
+    """Test the shared retry budget."""
+
+    def test_minimum_allowance(self):
+        """Test a quiet client may still spend its minimum retries."""
+        budget = RetryBudget(ratio=0.1, min_retries=2)
+        assert budget.try_spend()
+        assert budget.try_spend()
+        assert not budget.try_spend()
+        assert budget.stats().exhausted == 1
+
+    def test_ratio_of_first_attempts(self):
+        """Test each first attempt deposits a fraction of a retry."""
+        budget = RetryBudget(ratio=0.1, min_retries=0)
+        for _ in range(30):
+            budget.record_request()
+        assert budget.available == 3
+        assert all(budget.try_spend() for _ in range(3))
+        assert not budget.try_spend()
+
+        stats = budget.stats()
+        assert stats.requests == 30
+        assert stats.retries == 3
+        assert stats.available == 0
+
+    def test_window_expiry(self):
+        """Test spent retries are forgotten once they leave the window."""
+        budget = RetryBudget(min_retries=1, window=0.05, buckets=5)
+        assert budget.try_spend()
+        assert not budget.try_spend()
+        time.sleep(0.06)
+        assert budget.try_spend()
+
+    def test_exhausted_budget_surfaces_error(self):
+        """Test the client stops retrying once the budget is spent."""
+        budget = RetryBudget(min_retries=1)
+        client = MercuryClient(
+            api_key="test-key",
+            retry_config=RetryConfig(max_retries=3, initial_delay=0.0, jitter=False),
+            retry_budget=budget,
+        )
+        mock_response = httpx.Response(500, json={"error": {"message": "down"}})
+
+        with patch.object(client._client, "request", return_value=mock_response) as request:
+            with pytest.raises(ServerError):
+                client.chat_completion(messages=[{"role": "user", "content": "Hi"}])
+            assert request.call_count == 2
+
+            with pytest.raises(ServerError):
+                client.chat_completion(messages=[{"role": "user", "content": "Hi"}])
+            assert request.call_count == 3
+
+        assert budget.stats().exhausted == 2
+
+    def test_decorator_budget(self):
+        """Test retry_sync draws from a shared budget."""
+        budget = RetryBudget(min_retries=0)
+        calls = []
+
+        @retry_sync(RetryConfig(max_retries=3, initial_delay=0.0), budget=budget)
+        def flaky():
+            calls.append(1)
+            raise ServerError()
+
+        with pytest.raises(ServerError):
+            flaky()
+        assert len(calls) == 1
+
+
+class TestTransportRetriesAndDeadline:
+    """Test transport error retries and the per-call deadline."""
+
+    CHAT_RESPONSE = {
+        "id": "chatcmpl-123",
+        "object": "chat.completion",
+        "created": 1677649420,
+        "model": "mercury-coder-small",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": "ok"},
+            "finish_reason": "stop"
+        }],
+    }
+
+    def test_stale_connection_is_retried(self):
+        """Test a dropped keep-alive connection is retried transparently."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.RemoteProtocolError("Server disconnected", request=request)
+            return httpx.Response(200, json=self.CHAT_RESPONSE)
+
+        client = MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(initial_delay=0.0, jitter=False),
+        )
+        response = client.chat_completion(messages=[{"role": "user", "content": "Hi"}])
+        assert response.choices[0].message.content == "ok"
+        assert len(calls) == 2
+
+    async def test_async_connect_error_is_retried(self):
+        """Test the async client retries connection failures."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) < 3:
+                raise httpx.ConnectError("Connection refused", request=request)
+            return httpx.Response(200, json=self.CHAT_RESPONSE)
+
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(initial_delay=0.0, jitter=False),
+        ) as client:
+            await client.chat_completion(messages=[{"role": "user", "content": "Hi"}])
+        assert len(calls) == 3
+
+    def test_retry_delay_respects_deadline(self):
+        """Test no sleep is scheduled past the deadline."""
+        config = RetryConfig(initial_delay=1.0, jitter=False, deadline=5.0)
+        deadline = time.monotonic() + 1.5
+        assert retry_delay(0, config, ServerError(), deadline) == 1.0
+        assert retry_delay(1, config, ServerError(), deadline) is None
+        assert retry_delay(0, config, RateLimitError(retry_after=60), deadline) is None
+        assert retry_delay(3, config, ServerError()) is None
+
+    def test_deadline_bounds_call(self):
+        """Test the client stops retrying once the deadline is near."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.extensions["timeout"])
+            return httpx.Response(500, json={"error": {"message": "down"}})
+
+        client = MercuryClient(
+            api_key="test-key",
+            timeout=30.0,
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(
+                max_retries=10, initial_delay=0.05, jitter=False, deadline=0.2
+            ),
+        )
+        started = time.monotonic()
+        with pytest.raises(ServerError):
+            client.chat_completion(messages=[{"role": "user", "content": "Hi"}])
+
+        assert time.monotonic() - started < 0.2
+        assert 1 < len(calls) < 10
+        assert all(timeout["read"] <= 0.2 for timeout in calls)
+
+    def test_deadline_bounds_stream_attempts(self):
+        """Test each stream attempt is bounded by the time left."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.extensions["timeout"])
+            return httpx.Response(500, json={"error": {"message": "down"}})
+
+        client = MercuryClient(
+            api_key="test-key",
+            timeout=30.0,
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(
+                max_retries=10, initial_delay=0.05, jitter=False, deadline=0.2
+            ),
+            stream_config=StreamConfig(idle_timeout=10.0),
+        )
+        with pytest.raises(ServerError):
+            list(client.chat_completion_stream(messages=[{"role": "user", "content": "Hi"}]))
+
+        assert 1 < len(calls) < 10
+        assert all(max(timeout.values()) <= 0.2 for timeout in calls)
+
+    async def test_async_deadline_bounds_stream_attempts(self):
+        """Test the async client bounds stream attempts by the time left."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.extensions["timeout"])
+            return httpx.Response(500, json={"error": {"message": "down"}})
+
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            timeout=30.0,
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(
+                max_retries=10, initial_delay=0.05, jitter=False, deadline=0.2
+            ),
+        ) as client:
+            with pytest.raises(ServerError):
+                async for _ in client.chat_completion_stream(
+                    messages=[{"role": "user", "content": "Hi"}]
+                ):
+                    pass
+
+        assert 1 < len(calls) < 10
+        assert all(max(timeout.values()) <= 0.2 for timeout in calls)
+
+    def test_decorator_deadline(self):
+        """Test retry_async gives up at the deadline."""
+        calls = []
+
+        @retry_async(RetryConfig(max_retries=10, initial_delay=0.05, jitter=False, deadline=0.1))
+        async def flaky():
+            calls.append(1)
+            raise httpx.ReadTimeout("timed out")
+
+        with pytest.raises(httpx.ReadTimeout):
+            asyncio.run(flaky())
+        assert len(calls) == 2
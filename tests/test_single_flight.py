@@ -0,0 +1,203 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from mercury_client import AsyncMercuryClient, MercuryClient
+from mercury_client.utils.keys import request_key
+from mercury_client.utils.singleflight import AsyncSingleFlight, SingleFlight
+from tests.helpers import CHAT_RESPONSE
+
+STREAM_BODY = "\n\n".join(
+    [
+        'data: {"id": "c1", "object": "chat.completion.chunk", "created": 1, "model": "mercury-coder-small", "choices": [{"index": 0, "delta": {"content": "Hello"}}]}',
+        'data: {"id": "c1", "object": "chat.completion.chunk", "created": 1, "model": "mercury-coder-small", "choices": [{"index": 0, "delta": {"content": " world"}}]}',
+        "data: [DONE]",
+    ]
+)
+
+
+class TestRequestKey:
+    """Test canonical request keys."""
+
+    def test_key_ignores_dict_order(self):
+        """Test keys are independent of key order."""
+        assert request_key("/a", {"x": 1, "y": [1, 2]}) == request_key(
+            "/a", {"y": [1, 2], "x": 1}
+        )
+
+    def test_key_depends_on_endpoint_and_payload(self):
+        """Test keys differ by endpoint and payload."""
+        assert request_key("/a", {"x": 1}) != request_key("/b", {"x": 1})
+        assert request_key("/a", {"x": 1}) != request_key("/a", {"x": 2})
+
+
+class TestSingleFlight:
+    """Test the synchronous single-flight group."""
+
+    def test_concurrent_calls_share_result(self):
+        """Test duplicates wait for the leader's result."""
+        group = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            release.wait(5)
+            return "result"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(group.do("k", work)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while not calls:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == ["result"] * 5
+
+    def test_errors_are_shared_and_not_cached(self):
+        """Test a failed call propagates and a later call runs again."""
+        group = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            group.do("k", fail)
+        assert group.do("k", lambda: 42) == 42
+
+    def test_stream_broadcast(self):
+        """Test streamed chunks are replayed to every subscriber."""
+        group = SingleFlight()
+        created = []
+
+        def source():
+            created.append(1)
+            yield from ["a", "b", "c"]
+
+        first = group.stream("k", source)
+        assert next(first) == "a"
+        second = group.stream("k", source)
+        assert list(second) == ["a", "b", "c"]
+        assert list(first) == ["b", "c"]
+        assert len(created) == 1
+
+    def test_client_coalesces_requests(self):
+        """Test concurrent identical chat completions send one request."""
+        release = threading.Event()
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            release.wait(5)
+            return httpx.Response(200, json=CHAT_RESPONSE)
+
+        client = MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            single_flight=True,
+        )
+        results = []
+
+        def call():
+            results.append(
+                client.chat_completion(messages=[{"role": "user", "content": "Hi"}])
+            )
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while not requests:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(requests) == 1
+        assert [r.choices[0].message.content for r in results] == ["Hello!"] * 4
+
+
+class TestAsyncSingleFlight:
+    """Test the asynchronous single-flight group."""
+
+    async def test_client_coalesces_requests(self):
+        """Test concurrent identical async completions send one request."""
+        requests = []
+
+        async def handler(request):
+            requests.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=CHAT_RESPONSE)
+
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            single_flight=True,
+        ) as client:
+            results = await asyncio.gather(
+                *[
+                    client.chat_completion(messages=[{"role": "user", "content": "Hi"}])
+                    for _ in range(5)
+                ]
+            )
+            other = await client.chat_completion(
+                messages=[{"role": "user", "content": "Other"}]
+            )
+
+        assert len(requests) == 2
+        assert all(r.choices[0].message.content == "Hello!" for r in results)
+        assert other.id == "chatcmpl-123"
+
+    async def test_cancelled_waiter_does_not_cancel_call(self):
+        """Test cancelling one waiter leaves the shared call running."""
+        group = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(group.do("k", work))
+        second = asyncio.ensure_future(group.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "done"
+
+    async def test_stream_broadcast(self):
+        """Test one upstream stream is broadcast to every consumer."""
+        requests = []
+
+        async def handler(request):
+            requests.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(
+                200, text=STREAM_BODY, headers={"content-type": "text/event-stream"}
+            )
+
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            single_flight=True,
+        ) as client:
+
+            async def consume():
+                return [
+                    chunk.choices[0].delta.content
+                    async for chunk in client.chat_completion_stream(
+                        messages=[{"role": "user", "content": "Hi"}]
+                    )
+                ]
+
+            results = await asyncio.gather(consume(), consume(), consume())
+
+        assert len(requests) == 1
+        assert results == [["Hello", " world"]] * 3
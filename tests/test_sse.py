@@ -0,0 +1,133 @@
+"""Tests for the server-sent event decoder."""
+
+import httpx
+import pytest
+
+from mercury_client import MercuryAPIError, MercuryClient, StreamDecodeError
+from mercury_client.utils.sse import ServerSentEvent, SSEDecoder
+from mercury_client.utils.streaming import parse_chunk
+
+CHUNK = (
+    'data: {"id": "c1", "object": "chat.completion.chunk", "created": 1, '
+    '"model": "mercury-coder-small", "choices": [{"index": 0, "delta": '
+    '{"content": "Hi"}}]}\n\n'
+)
+MESSAGES = [{"role": "user", "content": "Hi"}]
+
+
+def decode(*chunks):
+    decoder = SSEDecoder()
+    return list(decoder.iter_events(chunks))
+
+
+class TestSSEDecoder:
+    """Test the event stream grammar."""
+
+    def test_data_events(self):
+        """Test events are split on blank lines."""
+        assert decode(b"data: a\n\ndata: b\n\n") == [
+            ServerSentEvent(b"a"),
+            ServerSentEvent(b"b"),
+        ]
+
+    def test_multiline_data(self):
+        """Test data lines of one event are joined with newlines."""
+        assert decode(b"data: a\ndata:b\ndata\n\n") == [ServerSentEvent(b"a\nb\n")]
+
+    def test_single_newline_framing_is_one_event(self):
+        """Test data lines without blank lines between them form one event.
+
+        The line-based parser used before dispatched every ``data:`` line on
+        its own; servers must end events with a blank line.
+        """
+        assert decode(b"data: a\ndata: b\n") == [ServerSentEvent(b"a\nb")]
+
+    @pytest.mark.parametrize("newline", [b"\n", b"\r", b"\r\n"])
+    def test_line_endings(self, newline):
+        """Test LF, CR and CRLF terminate lines."""
+        body = newline.join([b"event: delta", b"data: x", b"", b"data: y", b"", b""])
+        assert decode(body) == [
+            ServerSentEvent(b"x", event="delta"),
+            ServerSentEvent(b"y"),
+        ]
+
+    def test_split_anywhere(self):
+        """Test chunk boundaries do not change the decoded events."""
+        body = (
+            b"\xef\xbb\xbfid: 7\r\nretry: 100\r\ndata: hello\r\n\r\n"
+            b": ping\r\ndata: bye\r\n\r\n"
+        )
+        expected = decode(body)
+        assert expected == [
+            ServerSentEvent(b"hello", id="7", retry=100),
+            ServerSentEvent(b"bye", id="7"),
+        ]
+        for size in (1, 2, 3, 5):
+            chunks = [body[i : i + size] for i in range(0, len(body), size)]
+            assert decode(*chunks) == expected
+
+    def test_comments_and_unknown_fields(self):
+        """Test comments and unknown fields are ignored."""
+        assert decode(b": keep-alive\nfoo: bar\ndata: x\n\n") == [ServerSentEvent(b"x")]
+
+    def test_empty_events_are_not_dispatched(self):
+        """Test an event without data resets its type and is dropped."""
+        assert decode(b"event: a\n\ndata: x\n\n") == [ServerSentEvent(b"x")]
+
+    def test_invalid_id_and_retry_ignored(self):
+        """Test ids containing NUL and non-numeric retries are ignored."""
+        assert decode(b"id: 1\nid: a\x00b\nretry: 1s\ndata: x\n\n") == [
+            ServerSentEvent(b"x", id="1")
+        ]
+
+    def test_flush_unterminated_event(self):
+        """Test an event missing its final blank line is still dispatched."""
+        assert decode(b"data: a\n\ndata: [DONE]") == [
+            ServerSentEvent(b"a"),
+            ServerSentEvent(b"[DONE]"),
+        ]
+
+
+class TestParseChunk:
+    """Test decoding of chat completion events."""
+
+    def test_done(self):
+        """Test the end-of-stream sentinel."""
+        assert parse_chunk(ServerSentEvent(b"[DONE]")) is None
+
+    def test_malformed_json(self):
+        """Test malformed data raises instead of being dropped."""
+        with pytest.raises(StreamDecodeError) as exc_info:
+            parse_chunk(ServerSentEvent(b'{"id": '))
+        assert exc_info.value.data == b'{"id": '
+
+    def test_error_event(self):
+        """Test an error event raises with the server's message."""
+        event = ServerSentEvent(b'{"error": {"message": "boom"}}', event="error")
+        with pytest.raises(MercuryAPIError, match="boom"):
+            parse_chunk(event)
+
+    def test_single_newline_stream_raises(self):
+        """Test a stream without blank lines between events fails loudly."""
+        body = CHUNK.rstrip("\n") + "\n" + CHUNK.rstrip("\n") + "\ndata: [DONE]\n"
+        with MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, text=body)
+            ),
+        ) as client, pytest.raises(StreamDecodeError):
+            list(client.chat_completion_stream(messages=MESSAGES))
+
+    def test_malformed_stream_surfaces_error(self):
+        """Test the client raises on a malformed event mid-stream."""
+        body = CHUNK + "data: {not json}\n\n"
+        with MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, text=body)
+            ),
+        ) as client:
+            stream = client.chat_completion_stream(messages=MESSAGES)
+            assert next(stream).choices[0].delta.content == "Hi"
+            with pytest.raises(StreamDecodeError):
+                next(stream)
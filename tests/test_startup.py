@@ -0,0 +1,108 @@
+"""Tests for import time and deferred client setup."""
+
+import json
+import subprocess
+import sys
+
+import httpx
+import pytest
+
+import mercury_client
+from mercury_client import AsyncMercuryClient, MercuryClient
+from tests.helpers import CHAT_RESPONSE
+
+HEAVY_MODULES = ["httpx", "pydantic", "dotenv", "mercury_client.client"]
+
+
+def import_profile(statement):
+    """Run ``statement`` in a fresh interpreter with ``-X importtime``."""
+    code = (
+        f"import sys; {statement}; import json; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return json.loads(result.stdout), times
+
+
+class TestLazyImport:
+    """Test that importing the package is cheap."""
+
+    def test_import_loads_no_dependencies(self):
+        """Test ``import mercury_client`` defers every heavy import."""
+        loaded, times = import_profile("import mercury_client")
+        assert loaded == []
+        assert "mercury_client" in times
+        assert not any(name.startswith("mercury_client.") for name in times)
+
+    def test_client_import_skips_unused_utilities(self):
+        """Test importing a client does not import unrelated utilities."""
+        loaded, times = import_profile("from mercury_client import MercuryClient")
+        assert "mercury_client.client" in loaded
+        assert "dotenv" not in loaded
+        assert "mercury_client.utils.disk_cache" not in times
+
+    def test_attributes_resolve_lazily(self):
+        """Test public names resolve and unknown names raise."""
+        for name in mercury_client.__all__:
+            assert getattr(mercury_client, name) is not None
+        assert "MercuryClient" in dir(mercury_client)
+        with pytest.raises(AttributeError):
+            _ = mercury_client.NotAThing
+
+
+class TestDeferredSetup:
+    """Test deferred HTTP client creation and opt-in dotenv loading."""
+
+    def test_http_client_created_on_first_request(self):
+        """Test constructing a client creates no httpx client."""
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, json=CHAT_RESPONSE)
+        )
+        with MercuryClient(api_key="test-key", transport=transport) as client:
+            assert len(client._clients) == 0
+            client.chat_completion(messages=[{"role": "user", "content": "Hi"}])
+            assert list(client._clients) == [client.base_url]
+            assert client._client is client._clients[client.base_url]
+
+    async def test_async_http_client_created_on_first_request(self):
+        """Test the async client also defers its httpx client."""
+        async with AsyncMercuryClient(api_key="test-key") as client:
+            assert len(client._clients) == 0
+
+    def test_dotenv_is_opt_in(self, tmp_path, monkeypatch):
+        """Test a .env file is only read with ``load_env``."""
+        monkeypatch.delenv("MERCURY_API_KEY", raising=False)
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / ".env").write_text("MERCURY_API_KEY=from-dotenv\n")
+
+        with pytest.raises(ValueError, match="API key"):
+            MercuryClient()
+        try:
+            client = MercuryClient(load_env=True)
+            assert client.api_key == "from-dotenv"
+            client.close()
+        finally:
+            monkeypatch.delenv("MERCURY_API_KEY", raising=False)
+
+    def test_dotenv_path(self, tmp_path, monkeypatch):
+        """Test ``load_env`` accepts the path of the file."""
+        monkeypatch.delenv("MERCURY_API_KEY", raising=False)
+        env_file = tmp_path / "settings.env"
+        env_file.write_text("MERCURY_API_KEY=from-path\n")
+        try:
+            client = AsyncMercuryClient(load_env=str(env_file))
+            assert client.api_key == "from-path"
+        finally:
+            monkeypatch.delenv("MERCURY_API_KEY", raising=False)
@@ -0,0 +1,398 @@
+"""Tests for stream retries, resumption and stall detection."""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from mercury_client import (
+    AsyncMercuryClient,
+    MercuryClient,
+    RetryConfig,
+    StreamConfig,
+    StreamDecodeError,
+    StreamInterruptedError,
+)
+from mercury_client.exceptions import EngineOverloadedError, ServerError
+from mercury_client.models.chat import ChatCompletionResponse
+from mercury_client.models.stream import FastChunk
+from mercury_client.utils.sse import ServerSentEvent
+from mercury_client.utils.streaming import StreamProgress, parse_chunk
+from mercury_client.utils.text_stream import AsyncTextStream, TextStream
+from tests.helpers import installed_codecs
+
+
+def sse(*deltas, finish=True):
+    """Encode content deltas as the lines of a chat completion stream."""
+    lines = []
+    for i, content in enumerate(deltas):
+        delta = {"content": content}
+        if i == 0:
+            delta["role"] = "assistant"
+        lines.append(chunk_line(delta))
+    if finish:
+        lines.append(chunk_line({}, finish_reason="stop"))
+        lines.append("data: [DONE]\n\n")
+    return lines
+
+
+def chunk_line(delta, finish_reason=None):
+    chunk = {
+        "id": "chatcmpl-123",
+        "object": "chat.completion.chunk",
+        "created": 1677649420,
+        "model": "mercury-coder-small",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+class BrokenStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Response body that fails after sending some lines."""
+
+    def __init__(self, lines, error):
+        self.lines = lines
+        self.error = error
+
+    def __iter__(self):
+        for line in self.lines:
+            yield line.encode()
+        raise self.error
+
+    async def __aiter__(self):
+        for line in self.lines:
+            yield line.encode()
+        raise self.error
+
+
+def responder(*responses):
+    """Build a handler returning ``responses`` in turn, recording requests."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        response = responses[len(requests) - 1]
+        if isinstance(response, BrokenStream):
+            return httpx.Response(200, stream=response)
+        if isinstance(response, list):
+            return httpx.Response(
+                200,
+                text="".join(response),
+                headers={"content-type": "text/event-stream"},
+            )
+        return response
+
+    handler.requests = requests
+    return handler
+
+
+def content(chunks):
+    return "".join(c.choices[0].delta.content or "" for c in chunks if c.choices)
+
+
+RETRY = RetryConfig(initial_delay=0.0, jitter=False)
+MESSAGES = [{"role": "user", "content": "Hi"}]
+
+
+class TestStreamRetries:
+    """Test streams are retried and resumed."""
+
+    def test_retries_before_first_chunk(self):
+        """Test a 503 before any output is retried transparently."""
+        handler = responder(
+            httpx.Response(503, json={"error": {"message": "overloaded"}}),
+            sse("Hello", " world!"),
+        )
+        with MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RETRY,
+        ) as client:
+            chunks = list(client.chat_completion_stream(messages=MESSAGES))
+
+        assert content(chunks) == "Hello world!"
+        assert len(handler.requests) == 2
+
+    def test_interruption_raises_partial_result(self):
+        """Test a drop after output raises with the partial content."""
+        handler = responder(
+            BrokenStream(sse("Hello", " wor", finish=False), httpx.ReadError("reset")),
+        )
+        received = []
+        with MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RETRY,
+        ) as client:
+            stream = client.chat_completion_stream(messages=MESSAGES)
+            with pytest.raises(StreamInterruptedError) as exc_info:
+                received.extend(stream)
+
+        assert content(received) == "Hello wor"
+        assert exc_info.value.partial_content == "Hello wor"
+        assert exc_info.value.chunks_received == 2
+        assert isinstance(exc_info.value.__cause__, httpx.ReadError)
+        assert len(handler.requests) == 1
+
+    def test_resume_skips_emitted_text(self):
+        """Test a restarted stream continues where the caller left off."""
+        handler = responder(
+            BrokenStream(sse("Hello", " wor", finish=False), httpx.ReadError("reset")),
+            sse("Hello", " world", "!"),
+        )
+        with MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RETRY,
+            stream_config=StreamConfig(resume=True),
+        ) as client:
+            chunks = list(client.chat_completion_stream(messages=MESSAGES))
+
+        assert [c.choices[0].delta.content for c in chunks] == [
+            "Hello",
+            " wor",
+            "ld",
+            "!",
+            None,
+        ]
+        assert [c.choices[0].delta.role for c in chunks].count("assistant") == 1
+        assert chunks[-1].choices[0].finish_reason == "stop"
+        assert len(handler.requests) == 2
+
+    async def test_async_resume_after_stall(self):
+        """Test the async client resumes a stream that stalled."""
+        handler = responder(
+            BrokenStream(sse("Hello", finish=False), httpx.ReadTimeout("stalled")),
+            sse("Hel", "lo world!"),
+        )
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RETRY,
+            stream_config=StreamConfig(idle_timeout=2.0, resume=True),
+        ) as client:
+            chunks = [
+                chunk
+                async for chunk in client.chat_completion_stream(messages=MESSAGES)
+            ]
+
+        assert content(chunks) == "Hello world!"
+        assert handler.requests[0].extensions["timeout"]["read"] == 2.0
+        assert handler.requests[0].extensions["timeout"]["connect"] == 30.0
+
+    async def test_async_gives_up_after_retries(self):
+        """Test errors before output surface once retries are used up."""
+        handler = responder(
+            *[httpx.Response(503, json={"error": {"message": "overloaded"}})] * 2
+        )
+        async with AsyncMercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(max_retries=1, initial_delay=0.0),
+        ) as client:
+            with pytest.raises(EngineOverloadedError):
+                async for _ in client.chat_completion_stream(messages=MESSAGES):
+                    pass
+        assert len(handler.requests) == 2
+
+
+class TestStreamProgress:
+    """Test resumability rules."""
+
+    def test_diffusing_streams_are_not_resumable(self):
+        """Test diffusing streams cannot be aligned after a restart."""
+        progress = StreamProgress()
+        config = StreamConfig(resume=True)
+        assert progress.can_retry(config, {"diffusing": True})
+
+        chunk = ChatCompletionResponse.model_validate_json(sse("Hi")[0][6:])
+        progress.advance(chunk)
+        assert progress.can_retry(config, {})
+        assert not progress.can_retry(config, {"diffusing": True})
+        assert not progress.can_retry(StreamConfig(), {})
+
+
+class TestFastChunks:
+    """Test the unvalidated chunk objects."""
+
+    def test_same_attributes_as_models(self):
+        """Test fast chunks expose the fields of the validated models."""
+        handler = responder(sse("Hello", " world!"), sse("Hello", " world!"))
+        transport = httpx.MockTransport(handler)
+        with MercuryClient(api_key="test-key", transport=transport) as client:
+            models = list(client.chat_completion_stream(messages=MESSAGES))
+        with MercuryClient(
+            api_key="test-key",
+            transport=transport,
+            stream_config=StreamConfig(fast_chunks=True),
+        ) as client:
+            fast = list(client.chat_completion_stream(messages=MESSAGES))
+
+        assert all(isinstance(chunk, FastChunk) for chunk in fast)
+        assert [chunk.validate() for chunk in fast] == models
+        assert fast[0].choices[0].delta.role == "assistant"
+        assert fast[-1].choices[0].finish_reason == "stop"
+
+    def test_resume_with_fast_chunks(self):
+        """Test resumed streams trim fast chunks like models."""
+        handler = responder(
+            BrokenStream(sse("Hello", " wor", finish=False), httpx.ReadError("reset")),
+            sse("Hello", " world", "!"),
+        )
+        with MercuryClient(
+            api_key="test-key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RETRY,
+            stream_config=StreamConfig(resume=True, fast_chunks=True),
+        ) as client:
+            chunks = list(client.chat_completion_stream(messages=MESSAGES))
+
+        assert content(chunks) == "Hello world!"
+        assert [c.choices[0].delta.role for c in chunks].count("assistant") == 1
+
+    def test_tool_call_fragments(self):
+        """Test tool call fragments without ids are kept as-is."""
+        event = ServerSentEvent(
+            chunk_line(
+                {"tool_calls": [{"index": 0, "function": {"arguments": '{"a": '}}]}
+            )[6:-2].encode()
+        )
+        call = parse_chunk(event, fast=True).choices[0].delta.tool_calls[0]
+        assert (call.index, call.id, call.function.arguments) == (0, None, '{"a": ')
+
+    def test_malformed_event(self):
+        """Test malformed data raises in fast mode too."""
+        with pytest.raises(StreamDecodeError):
+            parse_chunk(ServerSentEvent(b"[1, 2]"), fast=True)
+
+    @pytest.mark.parametrize("codec", installed_codecs(), ids=lambda c: c.name)
+    @pytest.mark.parametrize("data", [b'{"choices": [', b"not json"])
+    def test_malformed_json_with_each_codec(self, codec, data):
+        """Test invalid JSON raises StreamDecodeError whatever the codec."""
+        with pytest.raises(StreamDecodeError):
+            parse_chunk(ServerSentEvent(data), fast=True, loads=codec.loads)
+        with pytest.raises(StreamDecodeError):
+            parse_chunk(ServerSentEvent(data), loads=codec.loads)
+
+
+def event_chunk(delta, finish_reason=None):
+    line = chunk_line(delta, finish_reason)
+    return parse_chunk(ServerSentEvent(line[len("data: ") :].strip().encode()))
+
+
+class FakeChunks:
+    """Iterator of chunks for delta contents, sleeping where given a float."""
+
+    def __init__(self, *items):
+        self.items = items
+
+    def _chunks(self):
+        for item in self.items:
+            if isinstance(item, float):
+                yield item
+                continue
+            yield event_chunk({"content": item})
+        yield event_chunk({}, "stop")
+
+    def __iter__(self):
+        for chunk in self._chunks():
+            if isinstance(chunk, float):
+                time.sleep(chunk)
+            else:
+                yield chunk
+
+    async def __aiter__(self):
+        for chunk in self._chunks():
+            if isinstance(chunk, float):
+                await asyncio.sleep(chunk)
+            else:
+                yield chunk
+
+
+class TestTextStream:
+    """Test text-only streams and delta coalescing."""
+
+    def test_yields_text_and_finish_reason(self):
+        """Test deltas are yielded as strings and metadata kept afterwards."""
+        body = sse("Hello", " world!")
+        body.insert(
+            -1,
+            "data: "
+            + json.dumps(
+                {
+                    "id": "c",
+                    "object": "chat.completion.chunk",
+                    "created": 1,
+                    "model": "m",
+                    "choices": [],
+                    "usage": {
+                        "prompt_tokens": 1,
+                        "completion_tokens": 2,
+                        "total_tokens": 3,
+                    },
+                }
+            )
+            + "\n\n",
+        )
+        handler = responder(body)
+        with MercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(handler)
+        ) as client:
+            stream = client.chat_completion_stream_text(messages=MESSAGES)
+            assert list(stream) == ["Hello", " world!"]
+
+        assert stream.finish_reason == "stop"
+        assert stream.usage.total_tokens == 3
+        assert json.loads(handler.requests[0].content)["stream_options"] == {
+            "include_usage": True
+        }
+
+    def test_max_chars(self):
+        """Test deltas are merged up to a character count."""
+        stream = TextStream(iter(FakeChunks("a", "b", "cd", "e")), max_chars=2)
+        assert list(stream) == ["ab", "cd", "e"]
+
+    def test_coalesce_window(self):
+        """Test deltas arriving within the window are merged."""
+        chunks = FakeChunks("a", "b", "c", 0.05, "d", "e")
+        assert list(TextStream(iter(chunks), coalesce_ms=20)) == ["abcd", "e"]
+
+    async def test_async_flushes_on_time(self):
+        """Test the async stream yields buffered text during a pause."""
+        stream = AsyncTextStream(
+            FakeChunks("a", "b", 0.2, "c").__aiter__(), coalesce_ms=20
+        )
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        assert await stream.__anext__() == "ab"
+        assert loop.time() - started < 0.15
+        assert [text async for text in stream] == ["c"]
+        assert stream.finish_reason == "stop"
+
+    async def test_async_client_text_stream(self):
+        """Test AsyncMercuryClient.chat_completion_stream_text."""
+        handler = responder(sse("Hel", "lo"))
+        async with AsyncMercuryClient(
+            api_key="test-key", transport=httpx.MockTransport(handler)
+        ) as client:
+            stream = client.chat_completion_stream_text(
+                messages=MESSAGES, coalesce_ms=1000
+            )
+            assert [text async for text in stream] == ["Hello"]
+        assert stream.finish_reason == "stop"
+
+    async def test_async_error_after_text(self):
+        """Test buffered text is yielded before a stream error is raised."""
+
+        async def chunks():
+            async for chunk in FakeChunks("a").__aiter__():
+                if chunk.choices[0].finish_reason:
+                    raise ServerError()
+                yield chunk
+
+        stream = AsyncTextStream(chunks(), coalesce_ms=1000)
+        assert await stream.__anext__() == "a"
+        with pytest.raises(ServerError):
+            await stream.__anext__()